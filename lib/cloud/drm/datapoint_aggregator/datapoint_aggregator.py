@@ -0,0 +1,364 @@
+# Copyright (c) 2026, Digi International, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Windowed aggregation of data stream values before uploading them to Digi
+Remote Manager.
+
+Instead of uploading every value, the minimum, maximum, average, sum and/or
+count of the values of each stream over a time window are uploaded to
+streams with the corresponding suffix (for example `temperature/avg`).
+"""
+
+import logging
+import math
+import time
+from array import array
+from datetime import datetime
+from threading import Event, Lock, Thread
+
+from digidevice import datapoint
+from digidevice.datapoint import DataPoint, DataType
+
+log = logging.getLogger(__name__)
+
+STAT_MIN = "min"
+STAT_MAX = "max"
+STAT_AVG = "avg"
+STAT_SUM = "sum"
+STAT_COUNT = "count"
+
+DEFAULT_STATISTICS = (STAT_MIN, STAT_MAX, STAT_AVG, STAT_COUNT)
+
+_ALL_STATISTICS = (STAT_MIN, STAT_MAX, STAT_AVG, STAT_SUM, STAT_COUNT)
+
+
+class _StreamWindows:
+    """
+    Ring of panes of a stream. A pane accumulates the values of one slide
+    interval, and a window is the combination of consecutive panes.
+    """
+
+    # Fields of every pane in the array.
+    _START, _COUNT, _SUM, _MIN, _MAX = range(5)
+    _FIELDS = 5
+
+    __slots__ = ("panes", "next_end", "closed_end", "newest")
+
+    def __init__(self, num_panes):
+        self.panes = array("d", [-1.0, 0.0, 0.0, 0.0, 0.0] * num_panes)
+        self.next_end = None
+        # End of the last closed window, values of earlier windows are late.
+        self.closed_end = -math.inf
+        self.newest = -1.0
+
+    def pane_start(self, slot):
+        """
+        Returns the start time of the pane stored in a slot, -1 if empty.
+        """
+        return self.panes[slot * self._FIELDS + self._START]
+
+    def add(self, slot, pane_start, value):
+        """
+        Adds a value to a pane, resetting the pane if it holds older values.
+
+        Returns:
+            Boolean: `True` if the value was added, `False` if the pane slot
+                holds a newer pane.
+        """
+        base = slot * self._FIELDS
+        panes = self.panes
+        start = panes[base + self._START]
+        if start > pane_start:
+            return False
+        if start < pane_start:
+            panes[base + self._START] = pane_start
+            panes[base + self._COUNT] = 1
+            panes[base + self._SUM] = value
+            panes[base + self._MIN] = value
+            panes[base + self._MAX] = value
+        else:
+            panes[base + self._COUNT] += 1
+            panes[base + self._SUM] += value
+            if value < panes[base + self._MIN]:
+                panes[base + self._MIN] = value
+            if value > panes[base + self._MAX]:
+                panes[base + self._MAX] = value
+        if pane_start > self.newest:
+            self.newest = pane_start
+        return True
+
+    def combine(self, window_start, window_end):
+        """
+        Combines the panes that start within the given interval.
+
+        Returns:
+            Tuple (Integer, Float, Float, Float): Count, sum, minimum and
+                maximum of the values in the window.
+        """
+        count = 0
+        total = 0.0
+        minimum = math.inf
+        maximum = -math.inf
+        panes = self.panes
+        for base in range(0, len(panes), self._FIELDS):
+            start = panes[base + self._START]
+            if window_start <= start < window_end:
+                count += int(panes[base + self._COUNT])
+                total += panes[base + self._SUM]
+                minimum = min(minimum, panes[base + self._MIN])
+                maximum = max(maximum, panes[base + self._MAX])
+        return count, total, minimum, maximum
+
+
+class DataPointAggregator:
+    """
+    Class that aggregates the values of data streams over tumbling or sliding
+    time windows and uploads the results.
+
+    Windows are aligned to multiples of the slide interval. Adding a value is
+    an O(1) update of the pane it belongs to, and the statistics of a window
+    are computed from its panes when the window closes.
+    """
+
+    def __init__(self, window=60, slide=None, statistics=DEFAULT_STATISTICS,
+                 delay=0, data_type=DataType.DOUBLE, upload_timeout=None,
+                 upload_function=None):
+        """
+        Class constructor. Instantiates a new :class:`.DataPointAggregator`.
+
+        Args:
+            window (Float, optional, default=60): Length of the windows in
+                seconds.
+            slide (Float, optional, default=`None`): Seconds between the start
+                of consecutive windows. It must divide the window length.
+                `None` for tumbling windows (slide equal to window).
+            statistics (Tuple, optional): Statistics to upload for every
+                window: `min`, `max`, `avg`, `sum` and/or `count`.
+            delay (Float, optional, default=0): Seconds to wait after a window
+                ends before closing it, to accept late values.
+            data_type (:class:`digidevice.datapoint.DataType`, optional,
+                default=`DOUBLE`): Data type of the aggregated streams, except
+                `count` that is always `INT`.
+            upload_timeout (Float, optional, default=`None`): Timeout in
+                seconds of each upload request.
+            upload_function (Function, optional, default=`None`): Function
+                that receives a list of data points and a `timeout` keyword
+                argument and uploads them. Defaults to
+                `datapoint.upload_multiple`.
+
+        Raises:
+            ValueError: If the window settings or the statistics are invalid.
+        """
+        slide = window if slide is None else slide
+        if window <= 0 or slide <= 0 or delay < 0:
+            raise ValueError("Window and slide must be positive and delay not negative")
+        num_panes = window / slide
+        if abs(num_panes - round(num_panes)) > 1e-9:
+            raise ValueError("Slide must divide the window length")
+        for stat in statistics:
+            if stat not in _ALL_STATISTICS:
+                raise ValueError("Invalid statistic '%s'" % stat)
+        if not statistics:
+            raise ValueError("At least one statistic is required")
+
+        self._window = window
+        self._slide = slide
+        self._num_panes = int(round(num_panes))
+        # Extra panes keep the values of the windows waiting to be closed.
+        self._ring_size = self._num_panes + 1 + int(math.ceil(delay / slide))
+        self._statistics = tuple(statistics)
+        self._delay = delay
+        self._data_type = data_type
+        self._upload_timeout = upload_timeout
+        self._upload_function = upload_function or datapoint.upload_multiple
+
+        self._streams = {}
+        self._closed = []
+        self._lock = Lock()
+        self._stop_event = Event()
+        self._thread = None
+        self._late = 0
+
+    @property
+    def late_values(self):
+        """
+        Returns the number of values discarded because their windows were
+        already closed.
+
+        Returns:
+            Integer: Number of discarded values.
+        """
+        return self._late
+
+    def start(self):
+        """
+        Starts the background thread that closes the windows and uploads
+        their statistics.
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = Thread(target=self._run, name="DataPointAggregator", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """
+        Stops the background thread. Windows not closed yet are discarded.
+
+        Args:
+            timeout (Float, optional, default=`None`): Maximum seconds to wait
+                for the thread to finish.
+        """
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def add(self, stream_id, value, timestamp=None):
+        """
+        Adds a value to the windows of a stream.
+
+        Args:
+            stream_id (String): Stream of the value. Aggregated values are
+                uploaded to this stream ID followed by the statistic suffix.
+            value (Integer, Float or String): Numeric value to aggregate.
+            timestamp (Float or datetime, optional, default=`None`): Time of
+                the value. Current time if not provided.
+
+        Returns:
+            Boolean: `True` if the value was aggregated, `False` if it was
+                discarded because its windows are already closed.
+
+        Raises:
+            ValueError: If the value is not a number.
+        """
+        value = float(value)
+        if timestamp is None:
+            timestamp = time.time()
+        elif isinstance(timestamp, datetime):
+            timestamp = timestamp.timestamp()
+
+        pane_index = int(math.floor(timestamp / self._slide))
+        pane_start = pane_index * self._slide
+        slot = pane_index % self._ring_size
+
+        with self._lock:
+            windows = self._streams.get(stream_id)
+            if windows is None:
+                windows = _StreamWindows(self._ring_size)
+                self._streams[stream_id] = windows
+            # Close the windows of the pane to replace if they are still open,
+            # they are returned by the next call to collect().
+            old_start = windows.pane_start(slot)
+            if 0 <= old_start < pane_start and windows.next_end is not None \
+                    and old_start + self._window >= windows.next_end:
+                self._close(stream_id, windows, old_start + self._window, self._closed)
+            # The value is late if every window containing it was closed.
+            if pane_start + self._window <= windows.closed_end \
+                    or not windows.add(slot, pane_start, value):
+                self._late += 1
+                return False
+            if windows.next_end is None:
+                windows.next_end = max(pane_start + self._slide,
+                                       windows.closed_end + self._slide)
+            return True
+
+    def collect(self, now=None):
+        """
+        Closes the windows that ended before the given time and returns their
+        statistics as data points.
+
+        Args:
+            now (Float, optional, default=`None`): Current time. Current system
+                time minus the configured delay if not provided.
+
+        Returns:
+            List: The :class:`digidevice.datapoint.DataPoint` objects with the
+                statistics of the closed windows.
+        """
+        if now is None:
+            now = time.time() - self._delay
+
+        with self._lock:
+            data_points = self._closed
+            self._closed = []
+            for stream_id, windows in self._streams.items():
+                self._close(stream_id, windows, now, data_points)
+        return data_points
+
+    def _close(self, stream_id, windows, until, data_points):
+        """
+        Closes the windows of a stream that end at or before the given time.
+        Must be called with the lock held.
+
+        Args:
+            stream_id (String): Stream of the windows.
+            windows (:class:`._StreamWindows`): Panes of the stream.
+            until (Float): Time up to which windows are closed.
+            data_points (List): List to add the resulting data points to.
+        """
+        while windows.next_end is not None and windows.next_end <= until:
+            end = windows.next_end
+            start = end - self._window
+            count, total, minimum, maximum = windows.combine(start, end)
+            if count:
+                data_points.extend(
+                    self._build(stream_id, end, count, total, minimum, maximum))
+            windows.closed_end = end
+            if windows.newest < start + self._slide:
+                # No more values in the following windows.
+                windows.next_end = None
+            else:
+                windows.next_end = end + self._slide
+
+    def _run(self):
+        """
+        Main loop of the aggregation thread.
+        """
+        while not self._stop_event.is_set():
+            now = time.time()
+            next_end = (math.floor(now / self._slide) + 1) * self._slide
+            if self._stop_event.wait(next_end + self._delay - now):
+                return
+
+            data_points = self.collect()
+            if not data_points:
+                continue
+            try:
+                self._upload_function(data_points, timeout=self._upload_timeout)
+            except Exception as exc:
+                log.error("Could not upload %d aggregated data points: %s", len(data_points), exc)
+
+    def _build(self, stream_id, end, count, total, minimum, maximum):
+        """
+        Returns the data points with the statistics of a window.
+
+        Returns:
+            List: The :class:`digidevice.datapoint.DataPoint` objects.
+        """
+        values = {STAT_MIN: minimum, STAT_MAX: maximum, STAT_AVG: total / count,
+                  STAT_SUM: total, STAT_COUNT: count}
+        data_points = []
+        for stat in self._statistics:
+            data_type = DataType.INT if stat == STAT_COUNT else self._data_type
+            data_points.append(DataPoint("{}/{}".format(stream_id, stat), values[stat],
+                                         timestamp=end, data_type=data_type))
+        return data_points
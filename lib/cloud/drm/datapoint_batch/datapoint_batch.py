@@ -0,0 +1,380 @@
+# Copyright (c) 2026, Digi International, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Memory-compact columnar container for large amounts of data points.
+
+Data points are stored as rows of typed arrays instead of one Python object
+per data point. Stream IDs, units and descriptions are interned, so buffering
+many data points of a few streams costs a few bytes per data point.
+"""
+
+import base64
+import csv
+import io
+import time
+from array import array
+from datetime import datetime
+
+from digidevice import datapoint
+from digidevice.datapoint import DataPoint, DataType
+
+
+class DataPointBatch:
+    """
+    Class that stores data points in columns of typed arrays.
+
+    Rows are appended without creating a
+    :class:`digidevice.datapoint.DataPoint` object. Data point objects are only
+    built, a chunk at a time, when the batch is uploaded.
+    """
+
+    # Kinds of values of the value column.
+    _KIND_FLOAT = 0
+    _KIND_INT = 1
+    _KIND_BOOL = 2
+    _KIND_OBJECT = 3
+
+    # Sentinels for unset fields.
+    _NO_QUALITY = -2 ** 31
+    _NO_INDEX = -1
+
+    # Columns of the CSV representation, in the order declared in its header.
+    CSV_COLUMNS = ("TIMESTAMP", "DATA", "DATATYPE", "UNITS", "QUALITY",
+                   "DESCRIPTION", "LOCATION", "STREAMID")
+
+    def __init__(self):
+        """
+        Class constructor. Instantiates a new empty :class:`.DataPointBatch`.
+        """
+        self._strings = []
+        self._string_index = {}
+        self._objects = []
+        self._data_types = list(DataType)
+        self._geo_locations = {}
+
+        self._stream = array("i")
+        self._kind = array("b")
+        self._value = array("d")
+        self._timestamp = array("d")
+        self._quality = array("i")
+        self._data_type = array("b")
+        self._units = array("i")
+        self._description = array("i")
+
+    def __len__(self):
+        return len(self._stream)
+
+    def __iter__(self):
+        return self.to_datapoints()
+
+    @property
+    def nbytes(self):
+        """
+        Returns the approximate memory used by the columns of the batch,
+        excluding the interned strings and non-numeric values.
+
+        Returns:
+            Integer: Size in bytes.
+        """
+        return sum(column.itemsize * len(column) for column in
+                   (self._stream, self._kind, self._value, self._timestamp,
+                    self._quality, self._data_type, self._units,
+                    self._description))
+
+    def append(self, stream_id, data, *, description=None, timestamp=None,
+               units=None, geo_location=None, quality=None, data_type=None):
+        """
+        Appends a data point. The parameters are the same as in
+        :class:`digidevice.datapoint.DataPoint`.
+
+        If no timestamp is provided, the current time is stored so the data
+        point keeps the time it was generated and not the time it is uploaded.
+
+        Args:
+            stream_id (String): Name of the data stream.
+            data: Value of the data point.
+            description (String, optional): Description of the data point.
+            timestamp (Float or datetime, optional): Time of the data point.
+            units (String, optional): Units of the data point.
+            geo_location (Tuple, optional): Latitude, longitude and elevation.
+            quality (Integer, optional): Quality of the data point.
+            data_type (:class:`digidevice.datapoint.DataType`, optional): Type
+                of the data stream.
+
+        Raises:
+            ValueError: If the stream ID is empty or the data is `None`.
+        """
+        if not stream_id or data is None:
+            raise ValueError("Stream ID and data are required")
+
+        if timestamp is None:
+            timestamp = time.time()
+        elif isinstance(timestamp, datetime):
+            timestamp = timestamp.timestamp()
+
+        if isinstance(data, bool):
+            kind, value = self._KIND_BOOL, float(data)
+        elif isinstance(data, int) and abs(data) < 2 ** 53:
+            kind, value = self._KIND_INT, float(data)
+        elif isinstance(data, float):
+            kind, value = self._KIND_FLOAT, data
+        else:
+            kind, value = self._KIND_OBJECT, float(len(self._objects))
+            self._objects.append(data)
+
+        if geo_location is not None:
+            self._geo_locations[len(self._stream)] = tuple(geo_location)
+
+        self._stream.append(self._intern(stream_id))
+        self._kind.append(kind)
+        self._value.append(value)
+        self._timestamp.append(timestamp)
+        self._quality.append(self._NO_QUALITY if quality is None else quality)
+        self._data_type.append(self._NO_INDEX if data_type is None
+                               else self._data_types.index(data_type))
+        self._units.append(self._NO_INDEX if units is None else self._intern(units))
+        self._description.append(self._NO_INDEX if description is None
+                                 else self._intern(description))
+
+    def extend(self, data_points):
+        """
+        Appends several :class:`digidevice.datapoint.DataPoint` objects.
+
+        Args:
+            data_points (Iterable): The data points to append.
+        """
+        for data_point in data_points:
+            self.append(data_point.stream_id, data_point.data,
+                        description=getattr(data_point, "description", None),
+                        timestamp=getattr(data_point, "timestamp", None),
+                        units=getattr(data_point, "units", None),
+                        geo_location=getattr(data_point, "geo_location", None),
+                        quality=getattr(data_point, "quality", None),
+                        data_type=getattr(data_point, "data_type", None))
+
+    def row(self, index):
+        """
+        Returns the fields of a row.
+
+        Args:
+            index (Integer): Index of the row.
+
+        Returns:
+            Dictionary: The `stream_id`, `data`, `timestamp`, `units`,
+                `quality`, `data_type`, `description` and `geo_location` of
+                the row, as accepted by :class:`digidevice.datapoint.DataPoint`.
+
+        Raises:
+            IndexError: If the index is out of range.
+        """
+        if index < 0:
+            index += len(self)
+        quality = self._quality[index]
+        data_type = self._data_type[index]
+        return {
+            "stream_id": self._strings[self._stream[index]],
+            "data": self._get_value(index),
+            "timestamp": self._timestamp[index],
+            "units": self._get_string(self._units[index]),
+            "quality": None if quality == self._NO_QUALITY else quality,
+            "data_type": None if data_type == self._NO_INDEX else self._data_types[data_type],
+            "description": self._get_string(self._description[index]),
+            "geo_location": self._geo_locations.get(index),
+        }
+
+    def to_datapoints(self, start=0, end=None):
+        """
+        Returns a generator of the :class:`digidevice.datapoint.DataPoint`
+        objects of a range of rows.
+
+        Args:
+            start (Integer, optional, default=0): First row.
+            end (Integer, optional, default=`None`): Row after the last one.
+                `None` for the end of the batch.
+
+        Returns:
+            Generator: The data points.
+        """
+        end = len(self) if end is None else min(end, len(self))
+        for index in range(start, end):
+            fields = self.row(index)
+            stream_id = fields.pop("stream_id")
+            data = fields.pop("data")
+            yield DataPoint(stream_id, data, **fields)
+
+    def to_csv(self, start=0, end=None, header=True):
+        """
+        Serializes a range of rows to the CSV format used to upload data
+        points to Digi Remote Manager, without building data point objects.
+
+        Timestamps are written in milliseconds since the epoch and locations
+        as space-separated latitude, longitude and elevation.
+
+        Args:
+            start (Integer, optional, default=0): First row.
+            end (Integer, optional, default=`None`): Row after the last one.
+                `None` for the end of the batch.
+            header (Boolean, optional, default=`True`): `True` to start with a
+                header line declaring the columns.
+
+        Returns:
+            String: The CSV content.
+        """
+        end = len(self) if end is None else min(end, len(self))
+        output = io.StringIO()
+        if header:
+            output.write("#" + ",".join(self.CSV_COLUMNS) + "\r\n")
+        writer = csv.writer(output)
+        strings = self._strings
+        for index in range(start, end):
+            quality = self._quality[index]
+            data_type = self._data_type[index]
+            location = self._geo_locations.get(index)
+            writer.writerow((
+                int(self._timestamp[index] * 1000),
+                self._format_value(index),
+                "" if data_type == self._NO_INDEX else str(self._data_types[data_type]),
+                self._get_string(self._units[index]) or "",
+                "" if quality == self._NO_QUALITY else quality,
+                self._get_string(self._description[index]) or "",
+                " ".join(str(coord) for coord in location) if location else "",
+                strings[self._stream[index]],
+            ))
+        return output.getvalue()
+
+    def upload(self, chunk_size=250, timeout=None):
+        """
+        Uploads the data points of the batch in chunks with
+        `datapoint.upload_multiple()`. Uploaded rows are removed from the
+        batch, so after a failure calling this method again resumes the
+        upload.
+
+        Args:
+            chunk_size (Integer, optional, default=250): Maximum number of
+                data points per upload request.
+            timeout (Float, optional, default=`None`): Timeout in seconds of
+                each upload request.
+
+        Returns:
+            Integer: Number of data points uploaded.
+
+        Raises:
+            DataPointException: If there are any server or transport problems.
+            TimeoutError: If an upload request times out.
+        """
+        uploaded = 0
+        try:
+            while uploaded < len(self):
+                chunk = list(self.to_datapoints(uploaded, uploaded + chunk_size))
+                datapoint.upload_multiple(chunk, timeout=timeout)
+                uploaded += len(chunk)
+        finally:
+            self.discard(uploaded)
+        return uploaded
+
+    def discard(self, count=None):
+        """
+        Removes the first rows of the batch.
+
+        Args:
+            count (Integer, optional, default=`None`): Number of rows to
+                remove. `None` to remove all of them.
+        """
+        if count is None or count >= len(self):
+            self.clear()
+            return
+        if count <= 0:
+            return
+
+        first_object = None
+        for index in range(count, len(self)):
+            if self._kind[index] == self._KIND_OBJECT:
+                first_object = int(self._value[index])
+                break
+        for column in (self._stream, self._kind, self._value, self._timestamp,
+                       self._quality, self._data_type, self._units,
+                       self._description):
+            del column[:count]
+
+        # Keep only the objects of the remaining rows.
+        if first_object is None:
+            self._objects = []
+        elif first_object:
+            del self._objects[:first_object]
+            for index in range(len(self)):
+                if self._kind[index] == self._KIND_OBJECT:
+                    self._value[index] -= first_object
+        self._geo_locations = {index - count: location
+                               for index, location in self._geo_locations.items()
+                               if index >= count}
+
+    def clear(self):
+        """
+        Removes all the rows of the batch. Interned strings are kept.
+        """
+        for column in (self._stream, self._kind, self._value, self._timestamp,
+                       self._quality, self._data_type, self._units,
+                       self._description):
+            del column[:]
+        self._objects = []
+        self._geo_locations = {}
+
+    def _intern(self, string):
+        """
+        Returns the index of a string in the strings table, adding it if
+        needed.
+        """
+        index = self._string_index.get(string)
+        if index is None:
+            index = len(self._strings)
+            self._strings.append(string)
+            self._string_index[string] = index
+        return index
+
+    def _get_string(self, index):
+        """
+        Returns the interned string of an index, `None` for no string.
+        """
+        return None if index == self._NO_INDEX else self._strings[index]
+
+    def _get_value(self, index):
+        """
+        Returns the value of a row with its original type.
+        """
+        kind = self._kind[index]
+        value = self._value[index]
+        if kind == self._KIND_FLOAT:
+            return value
+        if kind == self._KIND_INT:
+            return int(value)
+        if kind == self._KIND_BOOL:
+            return bool(value)
+        return self._objects[int(value)]
+
+    def _format_value(self, index):
+        """
+        Returns the string uploaded for the value of a row. Binary values are
+        encoded in Base64.
+        """
+        value = self._get_value(index)
+        if isinstance(value, (bytes, bytearray)):
+            return base64.b64encode(bytes(value)).decode()
+        return str(value)
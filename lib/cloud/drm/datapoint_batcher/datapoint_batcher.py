@@ -0,0 +1,316 @@
+# Copyright (c) 2026, Digi International, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Adaptive batching of Digi Remote Manager data point uploads.
+
+Data points added from any number of threads are grouped and uploaded with a
+single ``datapoint.upload_multiple()`` call when a batch reaches its maximum
+number of data points, its maximum size in bytes or its maximum age.
+"""
+
+import logging
+import time
+from collections import deque
+from threading import Condition, Thread
+
+from digidevice import datapoint
+
+log = logging.getLogger(__name__)
+
+
+class DataPointBatcher:
+    """
+    Class that collects data points from several producers and uploads them in
+    batches from a background thread.
+
+    The number of data points per batch is adjusted after every upload: it
+    grows while uploads finish within the target latency and it is halved when
+    they take longer.
+    """
+
+    # Approximate size of the CSV fields added to every data point.
+    _DATA_POINT_OVERHEAD = 40
+
+    def __init__(self, max_count=500, max_bytes=64 * 1024, max_age=1.0,
+                 min_count=10, target_latency=2.0, max_pending=10000,
+                 upload_timeout=None, upload_function=None, error_callback=None):
+        """
+        Class constructor. Instantiates a new :class:`.DataPointBatcher`.
+
+        Args:
+            max_count (Integer, optional, default=500): Maximum number of data
+                points per batch.
+            max_bytes (Integer, optional, default=64 KB): Maximum estimated
+                size in bytes of a batch.
+            max_age (Float, optional, default=1.0): Maximum seconds a data
+                point waits before its batch is uploaded.
+            min_count (Integer, optional, default=10): Minimum batch size the
+                auto-tuning can reduce the batch to.
+            target_latency (Float, optional, default=2.0): Upload duration in
+                seconds the batch size is tuned for.
+            max_pending (Integer, optional, default=10000): Maximum number of
+                data points waiting to be uploaded. New data points are
+                discarded while this limit is reached.
+            upload_timeout (Float, optional, default=`None`): Timeout in
+                seconds of each upload request.
+            upload_function (Function, optional, default=`None`): Function
+                that receives a list of data points and a `timeout` keyword
+                argument and uploads them. Defaults to
+                `datapoint.upload_multiple`.
+            error_callback (Function, optional, default=`None`): Function
+                called with the list of data points and the exception when an
+                upload fails.
+
+        Raises:
+            ValueError: If the limits are not consistent.
+        """
+        if min_count <= 0 or max_count < min_count:
+            raise ValueError("Batch sizes must be positive and max_count >= min_count")
+        if max_bytes <= 0 or max_age <= 0 or max_pending <= 0:
+            raise ValueError("Batch bytes, age and pending limits must be positive")
+
+        self._max_count = max_count
+        self._max_bytes = max_bytes
+        self._max_age = max_age
+        self._min_count = min_count
+        self._target_latency = target_latency
+        self._max_pending = max_pending
+        self._upload_timeout = upload_timeout
+        self._upload_function = upload_function or datapoint.upload_multiple
+        self._error_callback = error_callback
+
+        self._batch_limit = min_count
+        self._pending = deque()
+        self._pending_bytes = 0
+        self._oldest = None
+        self._condition = Condition()
+        self._thread = None
+        self._stop = False
+
+        self._uploaded = 0
+        self._dropped = 0
+        self._failed = 0
+        self._last_latency = None
+
+    @property
+    def batch_limit(self):
+        """
+        Returns the current number of data points that triggers an upload.
+
+        Returns:
+            Integer: The tuned batch size.
+        """
+        return self._batch_limit
+
+    @property
+    def stats(self):
+        """
+        Returns the counters of the batcher.
+
+        Returns:
+            Dictionary: Number of `uploaded`, `failed`, `dropped` and `pending`
+                data points, current `batch_limit` and `last_latency` of the
+                last upload in seconds.
+        """
+        with self._condition:
+            return {"uploaded": self._uploaded, "failed": self._failed,
+                    "dropped": self._dropped, "pending": len(self._pending),
+                    "batch_limit": self._batch_limit,
+                    "last_latency": self._last_latency}
+
+    def start(self):
+        """
+        Starts the background upload thread.
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop = False
+        self._thread = Thread(target=self._run, name="DataPointBatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, flush=True, timeout=None):
+        """
+        Stops the background upload thread.
+
+        Args:
+            flush (Boolean, optional, default=`True`): `True` to upload the
+                pending data points before stopping, `False` to discard them.
+            timeout (Float, optional, default=`None`): Maximum seconds to wait
+                for the thread to finish.
+        """
+        with self._condition:
+            self._stop = True
+            if not flush:
+                self._dropped += len(self._pending)
+                self._pending.clear()
+                self._pending_bytes = 0
+            self._condition.notify_all()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def add(self, data_point):
+        """
+        Adds a data point to the next batch.
+
+        Args:
+            data_point (:class:`digidevice.datapoint.DataPoint`): Data point
+                to upload.
+
+        Returns:
+            Boolean: `True` if the data point was queued, `False` if it was
+                discarded because the pending limit was reached.
+        """
+        return self.add_all((data_point,)) == 1
+
+    def add_all(self, data_points):
+        """
+        Adds several data points to the next batches.
+
+        Args:
+            data_points (Iterable): :class:`digidevice.datapoint.DataPoint`
+                objects to upload.
+
+        Returns:
+            Integer: Number of data points queued.
+        """
+        added = 0
+        now = time.monotonic()
+        with self._condition:
+            for data_point in data_points:
+                if len(self._pending) >= self._max_pending:
+                    self._dropped += 1
+                    continue
+                size = self._estimate_size(data_point)
+                self._pending.append((data_point, size, now))
+                self._pending_bytes += size
+                added += 1
+            if added:
+                if self._oldest is None:
+                    self._oldest = now
+                if self._is_ready():
+                    self._condition.notify()
+        return added
+
+    def _run(self):
+        """
+        Main loop of the upload thread.
+        """
+        while True:
+            with self._condition:
+                while not self._stop and not self._is_ready():
+                    timeout = None
+                    if self._oldest is not None:
+                        timeout = max(0, self._oldest + self._max_age - time.monotonic())
+                    self._condition.wait(timeout)
+                if self._stop and not self._pending:
+                    return
+                batch = self._take_batch()
+
+            self._upload(batch)
+
+    def _is_ready(self):
+        """
+        Returns whether a batch must be uploaded. Must be called with the
+        condition lock held.
+
+        Returns:
+            Boolean: `True` if any of the batch limits was reached.
+        """
+        if not self._pending:
+            return False
+        return (len(self._pending) >= self._batch_limit
+                or self._pending_bytes >= self._max_bytes
+                or time.monotonic() - self._oldest >= self._max_age)
+
+    def _take_batch(self):
+        """
+        Removes the next batch from the pending data points. Must be called
+        with the condition lock held.
+
+        Returns:
+            List: The data points of the batch.
+        """
+        batch = []
+        batch_bytes = 0
+        while self._pending and len(batch) < self._batch_limit:
+            size = self._pending[0][1]
+            if batch and batch_bytes + size > self._max_bytes:
+                break
+            batch.append(self._pending.popleft()[0])
+            batch_bytes += size
+        self._pending_bytes -= batch_bytes
+        # Remaining data points keep the time they were added.
+        self._oldest = self._pending[0][2] if self._pending else None
+        return batch
+
+    def _upload(self, batch):
+        """
+        Uploads a batch and tunes the batch size from the upload latency.
+
+        Args:
+            batch (List): Data points to upload.
+        """
+        start = time.monotonic()
+        try:
+            self._upload_function(batch, timeout=self._upload_timeout)
+        except Exception as exc:
+            with self._condition:
+                self._failed += len(batch)
+                self._batch_limit = max(self._min_count, self._batch_limit // 2)
+            log.error("Could not upload %d data points: %s", len(batch), exc)
+            if self._error_callback:
+                try:
+                    self._error_callback(batch, exc)
+                except Exception as callback_exc:
+                    log.error("Error in upload error callback: %s", callback_exc)
+            return
+        latency = time.monotonic() - start
+
+        with self._condition:
+            self._uploaded += len(batch)
+            self._last_latency = latency
+            # Additive increase while under the target latency, multiplicative
+            # decrease when over it.
+            if latency > self._target_latency:
+                self._batch_limit = max(self._min_count, self._batch_limit // 2)
+            elif len(batch) >= self._batch_limit:
+                self._batch_limit = min(self._max_count,
+                                        self._batch_limit + max(1, self._batch_limit // 4))
+
+    @classmethod
+    def _estimate_size(cls, data_point):
+        """
+        Returns the approximate size in bytes of a data point once uploaded.
+
+        Args:
+            data_point (:class:`digidevice.datapoint.DataPoint`): The data
+                point.
+
+        Returns:
+            Integer: Estimated size in bytes.
+        """
+        size = cls._DATA_POINT_OVERHEAD + len(data_point.stream_id) + len(str(data_point.data))
+        for field in ("description", "units"):
+            value = getattr(data_point, field, None)
+            if value:
+                size += len(value)
+        return size
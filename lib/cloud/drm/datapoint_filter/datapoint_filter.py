@@ -0,0 +1,471 @@
+# Copyright (c) 2026, Digi International, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Change-detection filters for Digi Remote Manager data streams.
+
+Values are only uploaded when they differ enough from the last uploaded value
+(absolute or percent deadband), when the swinging-door compression cannot
+represent them, or when the stream has not been uploaded for a maximum
+interval (heartbeat).
+"""
+
+import copy
+import math
+import time
+from array import array
+from datetime import datetime
+from enum import Enum
+from threading import Lock
+
+from digidevice import datapoint
+from digidevice.datapoint import DataPoint
+
+
+class FilterMode(Enum):
+    """
+    This class lists the available filter modes.
+    """
+    ABSOLUTE = (0, "Absolute deadband")
+    PERCENT = (1, "Percent deadband")
+    SWINGING_DOOR = (2, "Swinging-door compression")
+
+    def __init__(self, code, desc):
+        self._code = code
+        self._desc = desc
+
+    @property
+    def code(self):
+        """
+        Returns the code of the `FilterMode` element.
+
+        Returns:
+            Integer: Code of the `FilterMode` element.
+        """
+        return self._code
+
+    @property
+    def desc(self):
+        """
+        Returns the description of the `FilterMode` element.
+
+        Returns:
+            String: Description of the `FilterMode` element.
+        """
+        return self._desc
+
+    @classmethod
+    def get(cls, code):
+        """
+        Returns the filter mode for the given code.
+
+        Args:
+            code (Integer): Code of the filter mode to get.
+
+        Returns:
+            :class:`.FilterMode`: Filter mode with the given code, `None` if
+                not found.
+        """
+        for mode in cls:
+            if code == mode.code:
+                return mode
+        return None
+
+
+class DataPointFilter:
+    """
+    Class that decides which values of each data stream must be uploaded.
+
+    The state of every stream is stored in a row of a table made of typed
+    arrays, so the memory used per stream is constant and small.
+    """
+
+    # Flags of the stream state.
+    _FLAG_EMITTED = 0x01
+    _FLAG_HELD = 0x02
+    _FLAG_NUMERIC = 0x04
+
+    def __init__(self, mode=FilterMode.ABSOLUTE, deadband=0.0, max_interval=0):
+        """
+        Class constructor. Instantiates a new :class:`.DataPointFilter`.
+
+        Args:
+            mode (:class:`.FilterMode`, optional, default=`ABSOLUTE`): Default
+                filter mode of the streams.
+            deadband (Float, optional, default=0.0): Default deadband of the
+                streams. It is an absolute value for `ABSOLUTE` and
+                `SWINGING_DOOR` modes and a percentage of the last uploaded
+                value for `PERCENT` mode.
+            max_interval (Float, optional, default=0): Default maximum seconds
+                between uploads of a stream. 0 to disable the heartbeat.
+
+        Raises:
+            ValueError: If the deadband or the interval are negative.
+        """
+        self._check_config(mode, deadband, max_interval)
+        self._default = (mode, deadband, max_interval)
+        self._lock = Lock()
+        self._index = {}
+        self._stream_ids = []
+
+        # Configuration columns.
+        self._mode = array("b")
+        self._deadband = array("d")
+        self._max_interval = array("d")
+        # State columns.
+        self._flags = array("b")
+        self._last_time = array("d")
+        self._last_value = array("d")
+        # Last uploaded non-numeric value of every stream.
+        self._last_other = []
+        self._held_time = array("d")
+        self._held_value = array("d")
+        self._slope_upper = array("d")
+        self._slope_lower = array("d")
+
+    def __len__(self):
+        return len(self._stream_ids)
+
+    def configure(self, stream_id, mode=None, deadband=None, max_interval=None):
+        """
+        Sets the filter settings of a stream. Settings not provided keep their
+        current value or the default one.
+
+        Args:
+            stream_id (String): Stream to configure.
+            mode (:class:`.FilterMode`, optional): Filter mode of the stream.
+            deadband (Float, optional): Deadband of the stream.
+            max_interval (Float, optional): Maximum seconds between uploads.
+
+        Raises:
+            ValueError: If the deadband or the interval are negative.
+        """
+        with self._lock:
+            row = self._get_row(stream_id)
+            mode = mode if mode is not None else FilterMode.get(self._mode[row])
+            deadband = deadband if deadband is not None else self._deadband[row]
+            max_interval = max_interval if max_interval is not None else self._max_interval[row]
+            self._check_config(mode, deadband, max_interval)
+            self._mode[row] = mode.code
+            self._deadband[row] = deadband
+            self._max_interval[row] = max_interval
+            self._flags[row] = 0
+
+    def reset(self, stream_id=None):
+        """
+        Forgets the last uploaded value of a stream, or of all streams, so the
+        next value is always uploaded.
+
+        Args:
+            stream_id (String, optional, default=`None`): Stream to reset.
+                `None` to reset all of them.
+        """
+        with self._lock:
+            if stream_id is None:
+                for row in range(len(self._flags)):
+                    self._flags[row] = 0
+            elif stream_id in self._index:
+                self._flags[self._index[stream_id]] = 0
+
+    def check(self, stream_id, value, timestamp=None):
+        """
+        Processes a new value of a stream and returns the values that must be
+        uploaded.
+
+        In swinging-door mode, the value uploaded may be a previous one that
+        was held back, so the returned values include their timestamps.
+
+        Args:
+            stream_id (String): Stream of the value.
+            value: The new value. Values that are not numbers are uploaded
+                only when they change.
+            timestamp (Float or datetime, optional, default=`None`): Time of
+                the value. Current time if not provided.
+
+        Returns:
+            List: Tuples with the timestamp and the value to upload, empty if
+                the value is filtered out.
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        elif isinstance(timestamp, datetime):
+            timestamp = timestamp.timestamp()
+
+        with self._lock:
+            row = self._get_row(stream_id)
+            number = self._to_number(value)
+            if number is None:
+                return self._check_other(row, value, timestamp)
+            if self._mode[row] == FilterMode.SWINGING_DOOR.code:
+                return self._check_swinging_door(row, value, number, timestamp)
+            return self._check_deadband(row, value, number, timestamp)
+
+    def filter(self, data_points):
+        """
+        Returns the data points of the given list that must be uploaded.
+
+        Args:
+            data_points (List): :class:`digidevice.datapoint.DataPoint`
+                objects to filter.
+
+        Returns:
+            List: The :class:`digidevice.datapoint.DataPoint` objects to
+                upload.
+        """
+        result = []
+        for data_point in data_points:
+            timestamp = getattr(data_point, "timestamp", None)
+            if timestamp is None:
+                timestamp = time.time()
+            for emit_time, emit_value in self.check(data_point.stream_id, data_point.data, timestamp):
+                if emit_time == timestamp and emit_value is data_point.data:
+                    result.append(data_point)
+                else:
+                    result.append(self._copy(data_point, emit_value, emit_time))
+        return result
+
+    def flush(self):
+        """
+        Returns the values held back by the swinging-door compression that
+        have not been uploaded yet, and marks them as uploaded.
+
+        Returns:
+            List: Tuples with the stream ID, the timestamp and the value.
+        """
+        result = []
+        with self._lock:
+            for row, stream_id in enumerate(self._stream_ids):
+                if self._flags[row] & self._FLAG_HELD:
+                    result.append((stream_id, self._held_time[row], self._held_value[row]))
+                    self._archive(row, self._held_time[row], self._held_value[row])
+        return result
+
+    def upload(self, stream_id, data, **kwargs):
+        """
+        Uploads a value with `datapoint.upload()` if it passes the filter.
+        Keyword arguments are passed to :class:`digidevice.datapoint.DataPoint`
+        and to the upload function.
+
+        Args:
+            stream_id (String): Stream of the value.
+            data: The value.
+
+        Returns:
+            Boolean: `True` if any value was uploaded, `False` if it was
+                filtered out.
+
+        Raises:
+            DataPointException: If there are any server or transport problems.
+            TimeoutError: If the upload times out.
+        """
+        timeout = kwargs.pop("timeout", None)
+        values = self.check(stream_id, data, kwargs.pop("timestamp", None))
+        if len(values) == 1:
+            datapoint.upload(stream_id, values[0][1], timestamp=values[0][0],
+                             timeout=timeout, **kwargs)
+        elif values:
+            datapoint.upload_multiple(
+                [DataPoint(stream_id, value, timestamp=emit_time, **kwargs)
+                 for emit_time, value in values], timeout=timeout)
+        return bool(values)
+
+    def _check_deadband(self, row, value, number, timestamp):
+        """
+        Applies the absolute or percent deadband to a numeric value.
+
+        Returns:
+            List: Tuples with the timestamp and the value to upload.
+        """
+        flags = self._flags[row]
+        if flags & self._FLAG_EMITTED and flags & self._FLAG_NUMERIC \
+                and not self._heartbeat_expired(row, timestamp):
+            last = self._last_value[row]
+            limit = self._deadband[row]
+            if self._mode[row] == FilterMode.PERCENT.code:
+                limit = abs(last) * limit / 100.0
+            change = abs(number - last)
+            if change == 0 or change < limit:
+                return []
+        self._archive(row, timestamp, number)
+        return [(timestamp, value)]
+
+    def _check_swinging_door(self, row, value, number, timestamp):
+        """
+        Applies the swinging-door compression to a numeric value.
+
+        Returns:
+            List: Tuples with the timestamp and the value to upload.
+        """
+        flags = self._flags[row]
+        if not flags & self._FLAG_EMITTED or not flags & self._FLAG_NUMERIC \
+                or self._heartbeat_expired(row, timestamp):
+            result = []
+            if flags & self._FLAG_HELD:
+                result.append((self._held_time[row], self._held_value[row]))
+            self._archive(row, timestamp, number)
+            result.append((timestamp, value))
+            return result
+
+        elapsed = timestamp - self._last_time[row]
+        if elapsed <= 0:
+            return []
+        deviation = self._deadband[row]
+        upper = max(self._slope_upper[row],
+                    (number - self._last_value[row] - deviation) / elapsed)
+        lower = min(self._slope_lower[row],
+                    (number - self._last_value[row] + deviation) / elapsed)
+
+        if upper <= lower:
+            # The doors are still open: hold the value back.
+            self._slope_upper[row] = upper
+            self._slope_lower[row] = lower
+            self._held_time[row] = timestamp
+            self._held_value[row] = number
+            self._flags[row] |= self._FLAG_HELD
+            return []
+
+        # The doors closed: archive the previous value and restart from it.
+        result = []
+        if flags & self._FLAG_HELD:
+            held_time = self._held_time[row]
+            held_value = self._held_value[row]
+            result.append((held_time, held_value))
+            self._archive(row, held_time, held_value)
+            elapsed = timestamp - held_time
+            if elapsed > 0:
+                self._slope_upper[row] = (number - held_value - deviation) / elapsed
+                self._slope_lower[row] = (number - held_value + deviation) / elapsed
+                self._held_time[row] = timestamp
+                self._held_value[row] = number
+                self._flags[row] |= self._FLAG_HELD
+                return result
+        self._archive(row, timestamp, number)
+        result.append((timestamp, value))
+        return result
+
+    def _check_other(self, row, value, timestamp):
+        """
+        Filters a value that is not a number: it is uploaded only when it
+        changes or the heartbeat expires.
+
+        Returns:
+            List: Tuples with the timestamp and the value to upload.
+        """
+        flags = self._flags[row]
+        if flags & self._FLAG_EMITTED and not flags & self._FLAG_NUMERIC \
+                and self._last_other[row] == value \
+                and not self._heartbeat_expired(row, timestamp):
+            return []
+        self._flags[row] = self._FLAG_EMITTED
+        self._last_time[row] = timestamp
+        # Copy containers so later changes of the caller's object are seen.
+        self._last_other[row] = copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+        return [(timestamp, value)]
+
+    def _archive(self, row, timestamp, number):
+        """
+        Records a numeric value as the last uploaded one of a stream.
+        """
+        self._flags[row] = self._FLAG_EMITTED | self._FLAG_NUMERIC
+        self._last_time[row] = timestamp
+        self._last_value[row] = number
+        self._slope_upper[row] = -math.inf
+        self._slope_lower[row] = math.inf
+
+    def _heartbeat_expired(self, row, timestamp):
+        """
+        Returns whether the maximum interval between uploads has elapsed.
+        """
+        max_interval = self._max_interval[row]
+        return max_interval > 0 and timestamp - self._last_time[row] >= max_interval
+
+    def _get_row(self, stream_id):
+        """
+        Returns the table row of a stream, adding it if it does not exist.
+        Must be called with the lock held.
+
+        Args:
+            stream_id (String): The stream ID.
+
+        Returns:
+            Integer: Row of the stream.
+        """
+        row = self._index.get(stream_id)
+        if row is not None:
+            return row
+
+        row = len(self._stream_ids)
+        mode, deadband, max_interval = self._default
+        self._index[stream_id] = row
+        self._stream_ids.append(stream_id)
+        self._mode.append(mode.code)
+        self._deadband.append(deadband)
+        self._max_interval.append(max_interval)
+        self._flags.append(0)
+        for column in (self._last_time, self._last_value, self._held_time,
+                       self._held_value):
+            column.append(0.0)
+        self._last_other.append(None)
+        self._slope_upper.append(-math.inf)
+        self._slope_lower.append(math.inf)
+        return row
+
+    @staticmethod
+    def _check_config(mode, deadband, max_interval):
+        """
+        Validates filter settings.
+
+        Raises:
+            ValueError: If any setting is invalid.
+        """
+        if not isinstance(mode, FilterMode):
+            raise ValueError("Mode must be a FilterMode")
+        if deadband < 0 or max_interval < 0:
+            raise ValueError("Deadband and maximum interval cannot be negative")
+
+    @staticmethod
+    def _to_number(value):
+        """
+        Returns the value as a float, `None` if it is not a number.
+        """
+        if isinstance(value, bool):
+            return float(value)
+        if isinstance(value, (int, float)):
+            return float(value) if math.isfinite(value) else None
+        if isinstance(value, str):
+            try:
+                number = float(value)
+            except ValueError:
+                return None
+            return number if math.isfinite(number) else None
+        return None
+
+    @staticmethod
+    def _copy(data_point, value, timestamp):
+        """
+        Returns a new data point with the attributes of the given one and a
+        different value and timestamp.
+        """
+        return DataPoint(data_point.stream_id, value, timestamp=timestamp,
+                         description=getattr(data_point, "description", None),
+                         units=getattr(data_point, "units", None),
+                         geo_location=getattr(data_point, "geo_location", None),
+                         quality=getattr(data_point, "quality", None),
+                         data_type=getattr(data_point, "data_type", None))
@@ -0,0 +1,517 @@
+# Copyright (c) 2026, Digi International, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Store-and-forward uploader for Digi Remote Manager data points.
+
+Data points are appended to a persistent queue made of append-only segment
+files and uploaded in batches by a background thread using
+``datapoint.upload_multiple()``. Data points survive connection losses and
+application restarts.
+"""
+
+import base64
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from threading import Event, Lock, Thread
+
+from digidevice import datapoint
+from digidevice.datapoint import DataPoint, DataPointException, DataType
+
+log = logging.getLogger(__name__)
+
+
+class DataPointQueue:
+    """
+    Class that stores data points on disk and uploads them to Digi Remote
+    Manager in batches from a background thread.
+
+    Data points are written to append-only segment files inside the queue
+    directory. A cursor file records the position of the next data point to
+    upload, so data points are not lost or uploaded twice after a restart.
+    """
+
+    _SEGMENT_EXTENSION = ".seg"
+    _SEGMENT_FORMAT = "{:010d}" + _SEGMENT_EXTENSION
+    _CURSOR_FILE = "cursor"
+
+    _BINARY_MARK = "b64"
+
+    def __init__(self, path, batch_size=250, segment_size=256 * 1024,
+                 max_segments=64, flush_interval=5, sync_interval=1,
+                 upload_timeout=None, max_backoff=300,
+                 connection_check=None):
+        """
+        Class constructor. Instantiates a new :class:`.DataPointQueue`.
+
+        Args:
+            path (String): Directory where the queue files are stored. It is
+                created if it does not exist.
+            batch_size (Integer, optional, default=250): Maximum number of
+                data points uploaded in a single request.
+            segment_size (Integer, optional, default=256 KB): Size in bytes
+                after which a new segment file is started.
+            max_segments (Integer, optional, default=64): Maximum number of
+                segment files kept on disk. When exceeded, the oldest segment
+                is discarded.
+            flush_interval (Float, optional, default=5): Seconds between
+                upload attempts when the queue has not reached `batch_size`.
+            sync_interval (Float, optional, default=1): Seconds between
+                synchronizations of the active segment to disk.
+            upload_timeout (Float, optional, default=`None`): Timeout in
+                seconds of each upload request.
+            max_backoff (Float, optional, default=300): Maximum seconds to
+                wait between upload retries after a failure.
+            connection_check (Function, optional, default=`None`): Function
+                without arguments that returns `True` if Digi Remote Manager
+                is reachable. Uploads are skipped while it returns `False`.
+
+        Raises:
+            ValueError: If any of the sizes is not a positive number.
+        """
+        if batch_size <= 0 or segment_size <= 0 or max_segments <= 0:
+            raise ValueError("Batch size, segment size and maximum segments must be positive")
+
+        self._path = path
+        self._batch_size = batch_size
+        self._segment_size = segment_size
+        self._max_segments = max_segments
+        self._flush_interval = flush_interval
+        self._sync_interval = sync_interval
+        self._upload_timeout = upload_timeout
+        self._max_backoff = max_backoff
+        self._connection_check = connection_check
+
+        self._lock = Lock()
+        self._wake_event = Event()
+        self._stop_event = Event()
+        self._thread = None
+
+        self._segments = []
+        self._writer = None
+        self._writer_size = 0
+        self._read_offset = 0
+        self._pending = 0
+        self._dirty = False
+        self._flush_requested = False
+
+        os.makedirs(self._path, exist_ok=True)
+        self._load()
+
+    @property
+    def pending(self):
+        """
+        Returns the number of data points waiting to be uploaded.
+
+        Returns:
+            Integer: Number of queued data points.
+        """
+        return self._pending
+
+    def start(self):
+        """
+        Starts the background thread that uploads the queued data points.
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = Thread(target=self._run, name="DataPointQueue", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """
+        Stops the upload thread and closes the active segment file. Queued
+        data points remain on disk and are uploaded the next time the queue
+        is started.
+
+        Args:
+            timeout (Float, optional, default=`None`): Maximum seconds to wait
+                for the upload thread to finish.
+        """
+        self._stop_event.set()
+        self._wake_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        with self._lock:
+            self._close_writer()
+
+    def flush(self):
+        """
+        Wakes up the upload thread to send the queued data points as soon as
+        possible, even if it is waiting to retry a failed upload.
+        """
+        self._flush_requested = True
+        self._wake_event.set()
+
+    def put(self, stream_id, data, *, description=None, timestamp=None,
+            units=None, geo_location=None, quality=None, data_type=None):
+        """
+        Queues a data point for upload. The parameters are the same as in
+        :class:`digidevice.datapoint.DataPoint`.
+
+        The data point is appended to the active segment and the method
+        returns without waiting for the upload. If no timestamp is provided,
+        the current time is used so the data point keeps the time it was
+        generated and not the time it is uploaded.
+
+        Args:
+            stream_id (String): Name of the data stream.
+            data: Value of the data point.
+            description (String, optional): Description of the data point.
+            timestamp (Float or datetime, optional): Time of the data point.
+            units (String, optional): Units of the data point.
+            geo_location (Tuple, optional): Latitude, longitude and elevation.
+            quality (Integer, optional): Quality of the data point.
+            data_type (:class:`digidevice.datapoint.DataType`, optional): Type
+                of the data stream.
+
+        Raises:
+            ValueError: If the stream ID is empty or the data is `None`.
+        """
+        if not stream_id or data is None:
+            raise ValueError("Stream ID and data are required")
+
+        if timestamp is None:
+            timestamp = time.time()
+        elif isinstance(timestamp, datetime):
+            timestamp = timestamp.timestamp()
+
+        record = [stream_id, self._encode_data(data), timestamp,
+                  data_type.name if data_type is not None else None,
+                  units, quality, description,
+                  list(geo_location) if geo_location is not None else None]
+        line = (json.dumps(record, separators=(",", ":")) + "\n").encode()
+
+        with self._lock:
+            if self._writer is None or self._writer_size >= self._segment_size:
+                self._roll_segment()
+            self._writer.write(line)
+            self._writer_size += len(line)
+            self._pending += 1
+            self._dirty = True
+            wake = self._pending >= self._batch_size
+
+        if wake:
+            self._wake_event.set()
+
+    def put_datapoint(self, data_point):
+        """
+        Queues an existing :class:`digidevice.datapoint.DataPoint`.
+
+        Args:
+            data_point (:class:`digidevice.datapoint.DataPoint`): Data point
+                to queue.
+        """
+        self.put(data_point.stream_id, data_point.data,
+                 description=getattr(data_point, "description", None),
+                 timestamp=getattr(data_point, "timestamp", None),
+                 units=getattr(data_point, "units", None),
+                 geo_location=getattr(data_point, "geo_location", None),
+                 quality=getattr(data_point, "quality", None),
+                 data_type=getattr(data_point, "data_type", None))
+
+    def _run(self):
+        """
+        Main loop of the upload thread.
+        """
+        backoff = 0
+        next_upload = 0
+        last_sync = time.monotonic()
+
+        while not self._stop_event.is_set():
+            self._wake_event.wait(self._sync_interval)
+            self._wake_event.clear()
+
+            now = time.monotonic()
+            if now - last_sync >= self._sync_interval:
+                self._sync()
+                last_sync = now
+
+            # Upload when the interval expires, when a full batch is waiting
+            # (unless backing off) or when a flush was requested.
+            due = (now >= next_upload or self._flush_requested
+                   or (not backoff and self._pending >= self._batch_size))
+            if self._stop_event.is_set() or not due:
+                continue
+            self._flush_requested = False
+
+            if self._connection_check is not None and not self._connection_check():
+                backoff = min(max(backoff * 2, self._flush_interval), self._max_backoff)
+                next_upload = now + backoff
+                continue
+
+            try:
+                self._drain()
+                backoff = 0
+            except (DataPointException, TimeoutError) as exc:
+                backoff = min(max(backoff * 2, self._flush_interval), self._max_backoff)
+                log.warning("Could not upload data points, retrying in %s s: %s", backoff, exc)
+            next_upload = time.monotonic() + (backoff or self._flush_interval)
+
+    def _drain(self):
+        """
+        Uploads batches of queued data points until the queue is empty or the
+        queue is stopped.
+
+        Raises:
+            DataPointException: If there is a server or transport problem.
+            TimeoutError: If an upload times out.
+        """
+        while not self._stop_event.is_set():
+            segment, batch, consumed, next_offset, segment_done = self._read_batch()
+            if batch:
+                try:
+                    datapoint.upload_multiple(batch, timeout=self._upload_timeout)
+                except ValueError as exc:
+                    log.error("Discarding %d invalid data points: %s", len(batch), exc)
+            with self._lock:
+                self._advance(segment, consumed, next_offset, segment_done)
+            if not batch and not segment_done:
+                return
+
+    def _read_batch(self):
+        """
+        Reads the next batch of data points from the oldest segment.
+
+        Returns:
+            Tuple (Integer, List, Integer, Integer, Boolean): The segment read,
+                the data points read, the number of records consumed
+                (including the corrupted ones), the offset of the next unread
+                data point in the segment, and `True` if the segment was
+                completely read and it is not the active one.
+        """
+        with self._lock:
+            if not self._segments:
+                return None, [], 0, 0, False
+            segment = self._segments[0]
+            is_active = self._writer is not None and segment == self._segments[-1]
+            if is_active:
+                self._writer.flush()
+            offset = self._read_offset
+
+        batch = []
+        consumed = 0
+        seg_path = os.path.join(self._path, self._SEGMENT_FORMAT.format(segment))
+        try:
+            with open(seg_path, "rb") as seg_file:
+                seg_file.seek(offset)
+                while len(batch) < self._batch_size:
+                    line = seg_file.readline()
+                    if not line or not line.endswith(b"\n"):
+                        break
+                    offset += len(line)
+                    consumed += 1
+                    data_point = self._decode_record(line)
+                    if data_point is not None:
+                        batch.append(data_point)
+                at_end = not seg_file.read(1)
+        except FileNotFoundError:
+            return segment, [], 0, 0, True
+
+        return segment, batch, consumed, offset, at_end and not is_active
+
+    def _advance(self, segment, consumed, offset, segment_done):
+        """
+        Persists the new read position and removes the oldest segment if it
+        was completely uploaded. Must be called with the lock held.
+
+        Args:
+            segment (Integer): Segment the data points were read from.
+            consumed (Integer): Number of records read from the segment.
+            offset (Integer): Offset of the next unread data point.
+            segment_done (Boolean): `True` if the segment was completely
+                uploaded.
+        """
+        # The segment may have been discarded while uploading, and its
+        # records already subtracted from the pending ones.
+        if not self._segments or self._segments[0] != segment:
+            return
+        self._pending = max(0, self._pending - consumed)
+        if segment_done:
+            self._remove_segment(self._segments.pop(0))
+            self._read_offset = 0
+        elif offset != self._read_offset:
+            self._read_offset = offset
+        else:
+            # Nothing was read, avoid rewriting the cursor on flash.
+            return
+        self._save_cursor()
+
+    def _roll_segment(self):
+        """
+        Closes the active segment and starts a new one, discarding the oldest
+        segment if the maximum number of segments is exceeded. Must be called
+        with the lock held.
+        """
+        self._close_writer()
+        next_id = self._segments[-1] + 1 if self._segments else 0
+        self._segments.append(next_id)
+        self._writer = open(os.path.join(self._path, self._SEGMENT_FORMAT.format(next_id)), "ab")
+        self._writer_size = 0
+
+        while len(self._segments) > self._max_segments:
+            oldest = self._segments.pop(0)
+            lost = self._count_records(oldest, self._read_offset)
+            self._pending = max(0, self._pending - lost)
+            self._read_offset = 0
+            self._remove_segment(oldest)
+            self._save_cursor()
+            log.warning("Queue full, discarded %d data points of segment %d", lost, oldest)
+
+    def _close_writer(self):
+        """
+        Synchronizes and closes the active segment. Must be called with the
+        lock held.
+        """
+        if self._writer is None:
+            return
+        self._writer.flush()
+        os.fsync(self._writer.fileno())
+        self._writer.close()
+        self._writer = None
+        self._dirty = False
+
+    def _sync(self):
+        """
+        Writes the buffered data points of the active segment to disk.
+        """
+        with self._lock:
+            if self._writer is None or not self._dirty:
+                return
+            self._writer.flush()
+            os.fsync(self._writer.fileno())
+            self._dirty = False
+
+    def _load(self):
+        """
+        Loads the segments and the read position from the queue directory.
+        """
+        for name in os.listdir(self._path):
+            if name.endswith(self._SEGMENT_EXTENSION):
+                try:
+                    self._segments.append(int(name[:-len(self._SEGMENT_EXTENSION)]))
+                except ValueError:
+                    continue
+        self._segments.sort()
+
+        try:
+            with open(os.path.join(self._path, self._CURSOR_FILE)) as cursor_file:
+                segment, offset = json.load(cursor_file)
+        except (OSError, ValueError, TypeError):
+            segment, offset = None, 0
+
+        # Segments older than the cursor were already uploaded.
+        while self._segments and segment is not None and self._segments[0] < segment:
+            self._remove_segment(self._segments.pop(0))
+        if self._segments and self._segments[0] == segment:
+            self._read_offset = offset
+
+        for index, seg in enumerate(self._segments):
+            self._pending += self._count_records(seg, self._read_offset if index == 0 else 0)
+
+    def _save_cursor(self):
+        """
+        Atomically writes the read position to the cursor file.
+        """
+        segment = self._segments[0] if self._segments else None
+        cursor_path = os.path.join(self._path, self._CURSOR_FILE)
+        tmp_path = cursor_path + ".tmp"
+        with open(tmp_path, "w") as cursor_file:
+            json.dump([segment, self._read_offset], cursor_file)
+        os.replace(tmp_path, cursor_path)
+
+    def _remove_segment(self, segment):
+        """
+        Deletes the file of the given segment.
+
+        Args:
+            segment (Integer): Identifier of the segment to delete.
+        """
+        try:
+            os.remove(os.path.join(self._path, self._SEGMENT_FORMAT.format(segment)))
+        except FileNotFoundError:
+            pass
+
+    def _count_records(self, segment, offset=0):
+        """
+        Returns the number of complete records of a segment from an offset.
+
+        Args:
+            segment (Integer): Identifier of the segment.
+            offset (Integer, optional, default=0): Offset to start counting.
+
+        Returns:
+            Integer: Number of records.
+        """
+        if self._writer is not None and self._segments and segment == self._segments[-1]:
+            self._writer.flush()
+        try:
+            with open(os.path.join(self._path, self._SEGMENT_FORMAT.format(segment)), "rb") as seg_file:
+                seg_file.seek(offset)
+                return seg_file.read().count(b"\n")
+        except FileNotFoundError:
+            return 0
+
+    @classmethod
+    def _encode_data(cls, data):
+        """
+        Returns a JSON serializable representation of the data point value.
+
+        Args:
+            data: Value of the data point.
+
+        Returns:
+            The value to store in the segment.
+        """
+        if isinstance(data, (bytes, bytearray)):
+            return {cls._BINARY_MARK: base64.b64encode(bytes(data)).decode()}
+        if isinstance(data, (str, int, float, bool, dict, list)):
+            return data
+        return str(data)
+
+    @classmethod
+    def _decode_record(cls, line):
+        """
+        Builds a data point from a segment record.
+
+        Args:
+            line (Bytes): The record line.
+
+        Returns:
+            :class:`digidevice.datapoint.DataPoint`: The data point, `None`
+                if the record is corrupted.
+        """
+        try:
+            stream_id, data, timestamp, data_type, units, quality, description, geo = \
+                json.loads(line.decode())
+            if isinstance(data, dict) and cls._BINARY_MARK in data:
+                data = base64.b64decode(data[cls._BINARY_MARK])
+            return DataPoint(stream_id, data, description=description,
+                             timestamp=timestamp, units=units,
+                             geo_location=tuple(geo) if geo else None,
+                             quality=quality,
+                             data_type=DataType[data_type] if data_type else None)
+        except (ValueError, TypeError, KeyError) as exc:
+            log.error("Discarding corrupted data point record: %s", exc)
+            return None
@@ -0,0 +1,580 @@
+# Copyright (c) 2026, Digi International, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Local stand-in for Digi Remote Manager to benchmark applications that use
+the `digidevice.datapoint` and `digidevice.device_request` modules.
+
+The simulator provides replacements of both modules that record the uploaded
+data points and deliver SCI device requests to the registered callbacks,
+with configurable latency and failures. It runs on any Linux computer, no
+Digi device or Remote Manager account is required.
+"""
+
+import argparse
+import base64
+import csv
+import importlib.util
+import io
+import json
+import logging
+import random
+import runpy
+import sys
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from enum import Enum
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from threading import Lock, Thread
+from urllib.parse import unquote
+
+log = logging.getLogger(__name__)
+
+CSV_COLUMNS = ("TIMESTAMP", "DATA", "DATATYPE", "UNITS", "QUALITY",
+               "DESCRIPTION", "LOCATION", "STREAMID")
+
+
+class DataType(Enum):
+    """
+    Replacement of `digidevice.datapoint.DataType`.
+    """
+    INT = "INTEGER"
+    LONG = "LONG"
+    FLOAT = "FLOAT"
+    DOUBLE = "DOUBLE"
+    STRING = "STRING"
+    BINARY = "BINARY"
+    JSON = "JSON"
+    GEOJSON = "GEOJSON"
+
+    def __str__(self):
+        return self.value
+
+
+class DataPointException(RuntimeError):
+    """
+    Replacement of `digidevice.datapoint.DataPointException`.
+    """
+
+
+class DeviceRequestException(RuntimeError):
+    """
+    Replacement of `digidevice.device_request.DeviceRequestException`.
+    """
+
+
+class DataPoint:
+    """
+    Replacement of `digidevice.datapoint.DataPoint`.
+    """
+
+    def __init__(self, stream_id, data, *, description=None, timestamp=None,
+                 units=None, geo_location=None, quality=None, data_type=None):
+        if not stream_id or data is None:
+            raise ValueError("Stream ID and data are required")
+        if data_type is not None and not isinstance(data_type, DataType):
+            raise TypeError("data_type must be a DataType")
+        self.stream_id = stream_id
+        self.data = data
+        self.description = description
+        self.timestamp = timestamp
+        self.units = units
+        self.geo_location = geo_location
+        self.quality = quality
+        self.data_type = data_type
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class DRMSimulator:
+    """
+    Class that simulates the Digi Remote Manager side of the data point and
+    device request services.
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, failure_rate=0.0, seed=None):
+        """
+        Class constructor. Instantiates a new :class:`.DRMSimulator`.
+
+        Args:
+            latency (Float, optional, default=0.0): Seconds every data point
+                upload takes.
+            jitter (Float, optional, default=0.0): Maximum random seconds added
+                to the latency of every upload.
+            failure_rate (Float, optional, default=0.0): Probability (0 to 1)
+                of an upload failing with a `DataPointException`.
+            seed (Integer, optional, default=`None`): Seed of the random
+                generator, to repeat the same failures.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self._lock = Lock()
+        self._rows = []
+        self._targets = {}
+        self._saved_modules = None
+        self._server = None
+        self._stats = {"uploads": 0, "datapoints": 0, "bytes": 0,
+                       "failures": 0, "timeouts": 0, "requests": 0,
+                       "request_errors": 0}
+
+    @property
+    def stats(self):
+        """
+        Returns the counters of the simulator.
+
+        Returns:
+            Dictionary: Number of `uploads` requests, `datapoints` and
+                `bytes` received, `failures` and `timeouts` injected,
+                `requests` delivered and `request_errors` raised by callbacks.
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    @property
+    def targets(self):
+        """
+        Returns the registered device request targets.
+
+        Returns:
+            List: The target names.
+        """
+        with self._lock:
+            return list(self._targets)
+
+    def get_csv(self, header=True):
+        """
+        Returns the data points received so far in CSV format.
+
+        Args:
+            header (Boolean, optional, default=`True`): `True` to start with a
+                header line declaring the columns.
+
+        Returns:
+            String: The CSV content.
+        """
+        with self._lock:
+            rows = "".join(self._rows)
+        if header:
+            return "#" + ",".join(CSV_COLUMNS) + "\r\n" + rows
+        return rows
+
+    def reset(self):
+        """
+        Discards the received data points and resets the counters.
+        """
+        with self._lock:
+            self._rows = []
+            for key in self._stats:
+                self._stats[key] = 0
+
+    def install(self):
+        """
+        Installs the simulated `digidevice.datapoint` and
+        `digidevice.device_request` modules, so applications importing them
+        use this simulator. Must be called before the application imports
+        them.
+        """
+        if self._saved_modules is not None:
+            return
+        names = ("digidevice", "digidevice.datapoint", "digidevice.device_request")
+        self._saved_modules = {name: sys.modules.get(name) for name in names}
+
+        # Keep the other modules of an installed digidevice package available.
+        package = types.ModuleType("digidevice")
+        spec = importlib.util.find_spec("digidevice")
+        package.__path__ = list(spec.submodule_search_locations or []) if spec else []
+        package.datapoint = self._build_datapoint_module()
+        package.device_request = self._build_device_request_module()
+        sys.modules["digidevice"] = package
+        sys.modules["digidevice.datapoint"] = package.datapoint
+        sys.modules["digidevice.device_request"] = package.device_request
+
+    def uninstall(self):
+        """
+        Restores the modules replaced by :meth:`.install`.
+        """
+        if self._saved_modules is None:
+            return
+        for name, module in self._saved_modules.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+        self._saved_modules = None
+
+    def upload(self, data_points, timeout=None):
+        """
+        Simulates the upload of data points, applying the configured latency
+        and failures, and records them.
+
+        Args:
+            data_points (List): The :class:`.DataPoint` objects to upload.
+            timeout (Float, optional, default=`None`): Timeout in seconds of
+                the request.
+
+        Raises:
+            DataPointException: If a failure is injected.
+            TimeoutError: If the simulated latency exceeds the timeout.
+            ValueError: If the list does not contain data points.
+        """
+        for data_point in data_points:
+            if not isinstance(data_point, DataPoint):
+                raise ValueError("The list must contain DataPoint objects")
+
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+        if timeout is not None and delay > timeout:
+            time.sleep(timeout)
+            with self._lock:
+                self._stats["timeouts"] += 1
+            raise TimeoutError("Simulated upload timeout")
+        if delay:
+            time.sleep(delay)
+        if self.failure_rate and self._random.random() < self.failure_rate:
+            with self._lock:
+                self._stats["failures"] += 1
+            raise DataPointException("Simulated upload failure")
+
+        content = self._to_csv(data_points)
+        with self._lock:
+            self._rows.append(content)
+            self._stats["uploads"] += 1
+            self._stats["datapoints"] += len(data_points)
+            self._stats["bytes"] += len(content)
+
+    def send_request(self, target, payload):
+        """
+        Delivers a SCI device request to the callback registered for the
+        target, as Digi Remote Manager does.
+
+        Args:
+            target (String): Target of the device request.
+            payload (String or Bytes): Content of the device request.
+
+        Returns:
+            String: The response of the callback.
+
+        Raises:
+            DeviceRequestException: If no callback is registered for the
+                target.
+        """
+        with self._lock:
+            registration = self._targets.get(target)
+            self._stats["requests"] += 1
+        if registration is None:
+            raise DeviceRequestException("Target '%s' not registered" % target)
+        response_callback, status_callback, encoding = registration
+
+        raw = payload.encode(encoding or "utf-8") if isinstance(payload, str) else bytes(payload)
+        request = raw
+        if encoding is not None:
+            try:
+                request = raw.decode(encoding)
+            except UnicodeDecodeError:
+                request = raw
+
+        try:
+            response = response_callback(target, request)
+        except Exception as exc:
+            with self._lock:
+                self._stats["request_errors"] += 1
+            if status_callback:
+                status_callback(1, "Callback error: %s" % exc)
+            return ""
+
+        response = "" if response is None else str(response)
+        if encoding is not None:
+            response = response.encode(encoding, errors="replace").decode(encoding)
+        if status_callback:
+            status_callback(0, "Success")
+        return response
+
+    def inject_requests(self, target, payload, rate=10.0, count=100, concurrency=4):
+        """
+        Sends device requests to a target at a constant rate and measures the
+        response time of the callback.
+
+        Latencies are measured from the time each request is scheduled, so
+        they include the time waiting for a free worker when the target
+        cannot keep up with the rate.
+
+        Args:
+            target (String): Target of the device requests.
+            payload (String, Bytes or Function): Content of the requests, or
+                function that receives the request number and returns it.
+            rate (Float, optional, default=10.0): Requests per second.
+            count (Integer, optional, default=100): Number of requests.
+            concurrency (Integer, optional, default=4): Maximum requests in
+                progress at the same time.
+
+        Returns:
+            Dictionary: `count` of requests, `errors`, `duration` in seconds
+                and `min`, `avg`, `p50`, `p95`, `p99` and `max` latencies in
+                seconds.
+        """
+        latencies = []
+        errors = [0]
+        lock = Lock()
+
+        def run(number, scheduled):
+            data = payload(number) if callable(payload) else payload
+            try:
+                self.send_request(target, data)
+            except DeviceRequestException:
+                with lock:
+                    errors[0] += 1
+                return
+            with lock:
+                latencies.append(time.monotonic() - scheduled)
+
+        interval = 1.0 / rate if rate > 0 else 0
+        begin = time.monotonic()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for number in range(count):
+                scheduled = begin + number * interval
+                delay = scheduled - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                executor.submit(run, number, scheduled)
+        duration = time.monotonic() - begin
+
+        result = {"count": count, "errors": errors[0], "duration": duration}
+        result.update(self._percentiles(latencies))
+        return result
+
+    def serve(self, host="127.0.0.1", port=8080):
+        """
+        Starts an HTTP server in a background thread to inspect and drive the
+        simulator from other processes:
+
+        * `GET /datapoints`: received data points in CSV format.
+        * `GET /stats`: counters of the simulator in JSON format.
+        * `POST /request/<target>`: sends the body as a device request to the
+          target and returns the response.
+        * `POST /inject/<target>?rate=<r>&count=<n>`: injects requests with the
+          body as payload and returns the latency statistics in JSON format.
+        * `DELETE /datapoints`: resets the received data points.
+
+        Args:
+            host (String, optional, default="127.0.0.1"): Address to listen on.
+            port (Integer, optional, default=8080): Port to listen on.
+
+        Returns:
+            Tuple (String, Integer): Address and port the server listens on.
+        """
+        simulator = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                if self.path == "/datapoints":
+                    self._reply(200, simulator.get_csv(), "text/csv")
+                elif self.path == "/stats":
+                    self._reply(200, json.dumps(simulator.stats), "application/json")
+                else:
+                    self._reply(404, "Not found")
+
+            def do_DELETE(self):
+                if self.path == "/datapoints":
+                    simulator.reset()
+                    self._reply(200, "")
+                else:
+                    self._reply(404, "Not found")
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                path, _, query = self.path.partition("?")
+                params = dict(item.split("=", 1) for item in query.split("&") if "=" in item)
+                try:
+                    if path.startswith("/request/"):
+                        response = simulator.send_request(unquote(path[9:]), body)
+                        self._reply(200, response)
+                    elif path.startswith("/inject/"):
+                        result = simulator.inject_requests(
+                            unquote(path[8:]), body, rate=float(params.get("rate", 10)),
+                            count=int(params.get("count", 100)),
+                            concurrency=int(params.get("concurrency", 4)))
+                        self._reply(200, json.dumps(result), "application/json")
+                    else:
+                        self._reply(404, "Not found")
+                except (DeviceRequestException, ValueError) as exc:
+                    self._reply(400, str(exc))
+
+            def _reply(self, code, content, content_type="text/plain"):
+                data = content.encode()
+                self.send_response(code)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, fmt, *args):
+                log.debug(fmt, *args)
+
+        self._server = _ThreadingHTTPServer((host, port), Handler)
+        Thread(target=self._server.serve_forever, name="DRMSimulator", daemon=True).start()
+        return self._server.server_address
+
+    def shutdown(self):
+        """
+        Stops the HTTP server started with :meth:`.serve`.
+        """
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def _register(self, target, response_callback, status_callback=None,
+                  xml_encoding="UTF-8"):
+        """
+        Simulated `digidevice.device_request.register()`.
+        """
+        if not isinstance(target, str) or not callable(response_callback) \
+                or (status_callback is not None and not callable(status_callback)):
+            raise TypeError("Invalid target or callback")
+        with self._lock:
+            self._targets[target] = (response_callback, status_callback, xml_encoding)
+
+    def _unregister(self, target):
+        """
+        Simulated `digidevice.device_request.unregister()`.
+        """
+        if not isinstance(target, str):
+            raise TypeError("Target must be a string")
+        with self._lock:
+            return self._targets.pop(target, None) is not None
+
+    def _build_datapoint_module(self):
+        """
+        Returns the simulated `digidevice.datapoint` module.
+        """
+        module = types.ModuleType("digidevice.datapoint")
+        module.DataType = DataType
+        module.DataPoint = DataPoint
+        module.DataPointException = DataPointException
+
+        def upload(stream_id, data, *, timeout=None, **kwargs):
+            self.upload([DataPoint(stream_id, data, **kwargs)], timeout=timeout)
+
+        module.upload = upload
+        module.upload_multiple = self.upload
+        return module
+
+    def _build_device_request_module(self):
+        """
+        Returns the simulated `digidevice.device_request` module.
+        """
+        module = types.ModuleType("digidevice.device_request")
+        module.DeviceRequestException = DeviceRequestException
+        module.register = self._register
+        module.unregister = self._unregister
+        return module
+
+    @staticmethod
+    def _to_csv(data_points):
+        """
+        Serializes data points to CSV rows.
+        """
+        output = io.StringIO()
+        writer = csv.writer(output)
+        now = time.time()
+        for data_point in data_points:
+            timestamp = data_point.timestamp
+            if timestamp is None:
+                timestamp = now
+            elif isinstance(timestamp, datetime):
+                timestamp = timestamp.timestamp()
+            data = data_point.data
+            if isinstance(data, (bytes, bytearray)):
+                data = base64.b64encode(bytes(data)).decode()
+            elif data_point.data_type == DataType.GEOJSON and not isinstance(data, str):
+                data = json.dumps(data)
+            writer.writerow((
+                int(timestamp * 1000), data,
+                str(data_point.data_type) if data_point.data_type else "",
+                data_point.units or "",
+                "" if data_point.quality is None else data_point.quality,
+                data_point.description or "",
+                " ".join(str(c) for c in data_point.geo_location) if data_point.geo_location else "",
+                data_point.stream_id))
+        return output.getvalue()
+
+    @staticmethod
+    def _percentiles(latencies):
+        """
+        Returns statistics of a list of latencies.
+        """
+        if not latencies:
+            return {"min": None, "avg": None, "p50": None, "p95": None,
+                    "p99": None, "max": None}
+        latencies = sorted(latencies)
+
+        def percentile(pct):
+            return latencies[min(len(latencies) - 1, int(len(latencies) * pct / 100.0))]
+
+        return {"min": latencies[0], "avg": sum(latencies) / len(latencies),
+                "p50": percentile(50), "p95": percentile(95),
+                "p99": percentile(99), "max": latencies[-1]}
+
+
+def main():
+    """
+    Runs a Python application with the simulated modules installed.
+    """
+    parser = argparse.ArgumentParser(
+        description="Run an application against a local Digi Remote Manager simulator",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Seconds every data point upload takes")
+    parser.add_argument("--jitter", type=float, default=0.0,
+                        help="Maximum random seconds added to every upload")
+    parser.add_argument("--failure-rate", type=float, default=0.0,
+                        help="Probability (0 to 1) of an upload failing")
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="Address of the HTTP control interface")
+    parser.add_argument("--port", type=int, default=8080,
+                        help="Port of the HTTP control interface")
+    parser.add_argument("script", help="Python application to run")
+    parser.add_argument("args", nargs=argparse.REMAINDER,
+                        help="Arguments of the application")
+    args = parser.parse_args()
+
+    simulator = DRMSimulator(latency=args.latency, jitter=args.jitter,
+                             failure_rate=args.failure_rate)
+    simulator.install()
+    host, port = simulator.serve(args.host, args.port)
+    print("DRM simulator listening on http://%s:%d" % (host, port), file=sys.stderr)
+
+    sys.argv = [args.script] + args.args
+    try:
+        runpy.run_path(args.script, run_name="__main__")
+    finally:
+        simulator.shutdown()
+        print(json.dumps(simulator.stats), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
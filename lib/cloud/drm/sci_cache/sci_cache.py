@@ -0,0 +1,263 @@
+# Copyright (c) 2026, Digi International, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Response cache of Digi Remote Manager SCI device request handlers.
+
+Responses of read-only targets are reused for identical requests received
+within a time to live, and identical requests received while the handler is
+running wait for that execution instead of running the handler again.
+Write targets invalidate the cached responses of the read targets they
+affect.
+"""
+
+import functools
+import logging
+import time
+from collections import OrderedDict
+from threading import Event, Lock
+
+from digidevice import device_request
+
+log = logging.getLogger(__name__)
+
+
+class _Flight:
+    """
+    Execution of a handler that other identical requests wait for.
+    """
+
+    __slots__ = ("done", "response", "error")
+
+    def __init__(self):
+        self.done = Event()
+        self.response = None
+        self.error = None
+
+
+class SCICache:
+    """
+    Class that caches the responses of SCI device request handlers.
+
+    Handlers are wrapped keeping the `device_request` callback signature,
+    so wrapped handlers can be registered directly or through other
+    libraries such as the SCI Dispatcher.
+    """
+
+    def __init__(self, default_ttl=5.0, max_entries=256, register_function=None):
+        """
+        Class constructor. Instantiates a new :class:`.SCICache`.
+
+        Args:
+            default_ttl (Float, optional, default=5.0): Seconds a response is
+                reused.
+            max_entries (Integer, optional, default=256): Maximum number of
+                cached responses. The least recently used ones are removed
+                first.
+            register_function (Function, optional, default=`None`): Function
+                used by :meth:`.register_read` and :meth:`.register_write` to
+                register the targets. Defaults to `device_request.register`.
+        """
+        self._default_ttl = default_ttl
+        self._max_entries = max_entries
+        self._register_function = register_function or device_request.register
+        self._entries = OrderedDict()
+        self._flights = {}
+        self._generations = {}
+        self._epoch = 0
+        self._lock = Lock()
+        self._stats = {"hits": 0, "misses": 0, "coalesced": 0, "invalidations": 0}
+
+    @property
+    def stats(self):
+        """
+        Returns the counters of the cache.
+
+        Returns:
+            Dictionary: Number of cache `hits` and `misses`, of requests that
+                waited for an identical one in progress (`coalesced`) and of
+                `invalidations`.
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def read(self, handler, ttl=None):
+        """
+        Returns a handler that caches the responses of a read-only handler by
+        target and request.
+
+        Args:
+            handler (Function): Function that receives the target and the
+                request and returns the response.
+            ttl (Float, optional, default=`None`): Seconds a response is
+                reused. `None` for the default of the cache.
+
+        Returns:
+            Function: The caching handler.
+        """
+        ttl = self._default_ttl if ttl is None else ttl
+
+        @functools.wraps(handler)
+        def cached_handler(target, request):
+            return self._get(handler, ttl, target, request)
+        return cached_handler
+
+    def write(self, handler, invalidates=()):
+        """
+        Returns a handler that invalidates the cached responses of the given
+        targets every time a write handler is executed.
+
+        Args:
+            handler (Function): Function that receives the target and the
+                request and returns the response.
+            invalidates (Iterable): Read targets whose responses are
+                invalidated.
+
+        Returns:
+            Function: The invalidating handler.
+        """
+        invalidates = tuple(invalidates)
+
+        @functools.wraps(handler)
+        def invalidating_handler(target, request):
+            try:
+                return handler(target, request)
+            finally:
+                for read_target in invalidates:
+                    self.invalidate(read_target)
+        return invalidating_handler
+
+    def register_read(self, target, handler, ttl=None, **kwargs):
+        """
+        Registers a read-only target with a caching handler.
+
+        Args:
+            target (String): The target.
+            handler (Function): Function that receives the target and the
+                request and returns the response.
+            ttl (Float, optional, default=`None`): Seconds a response is
+                reused. `None` for the default of the cache.
+            **kwargs: Other arguments of the register function.
+
+        Raises:
+            DeviceRequestException: If the target cannot be registered.
+        """
+        self._register_function(target, self.read(handler, ttl), **kwargs)
+
+    def register_write(self, target, handler, invalidates=(), **kwargs):
+        """
+        Registers a write target with a handler that invalidates the cached
+        responses of the given read targets.
+
+        Args:
+            target (String): The target.
+            handler (Function): Function that receives the target and the
+                request and returns the response.
+            invalidates (Iterable): Read targets whose responses are
+                invalidated.
+            **kwargs: Other arguments of the register function.
+
+        Raises:
+            DeviceRequestException: If the target cannot be registered.
+        """
+        self._register_function(target, self.write(handler, invalidates), **kwargs)
+
+    def invalidate(self, target=None):
+        """
+        Removes the cached responses of a target. Responses of requests in
+        progress are not cached, and new requests do not wait for them.
+
+        Args:
+            target (String, optional, default=`None`): The target. `None` for
+                all the targets.
+        """
+        with self._lock:
+            self._stats["invalidations"] += 1
+            if target is None:
+                self._entries.clear()
+                self._flights.clear()
+                self._epoch += 1
+                return
+            self._generations[target] = self._generations.get(target, 0) + 1
+            for key in [key for key in self._entries if key[0] == target]:
+                del self._entries[key]
+            for key in [key for key in self._flights if key[0] == target]:
+                del self._flights[key]
+
+    def _get(self, handler, ttl, target, request):
+        """
+        Returns the cached response of a request, or executes the handler
+        once for all the identical requests in progress.
+        """
+        key = (target, self._normalize(request))
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[1] < ttl:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry[0]
+            flight = self._flights.get(key)
+            if flight is not None:
+                self._stats["coalesced"] += 1
+                leader = False
+            else:
+                flight = _Flight()
+                self._flights[key] = flight
+                self._stats["misses"] += 1
+                leader = True
+            generation = (self._epoch, self._generations.get(target, 0))
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.response
+
+        try:
+            flight.response = handler(target, request)
+        except Exception as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                # The flight may have been replaced after an invalidation.
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                # Do not cache responses computed before an invalidation.
+                if flight.error is None \
+                        and (self._epoch, self._generations.get(target, 0)) == generation:
+                    self._entries[key] = (flight.response, time.monotonic())
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self._max_entries:
+                        self._entries.popitem(last=False)
+            flight.done.set()
+        return flight.response
+
+    @staticmethod
+    def _normalize(request):
+        """
+        Returns the cache key of a request.
+        """
+        if isinstance(request, str):
+            return request.strip()
+        if isinstance(request, bytearray):
+            return bytes(request)
+        return request
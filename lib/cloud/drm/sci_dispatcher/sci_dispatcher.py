@@ -0,0 +1,347 @@
+# Copyright (c) 2026, Digi International, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Execution of Digi Remote Manager SCI device request handlers in a pool of
+worker threads.
+
+Every target is registered with a callback that queues the request and waits
+for a worker to run its handler, so a slow handler only delays requests of
+its own target. The number of requests running and queued per target is
+limited, and requests over the limits are answered immediately with a busy
+response.
+"""
+
+import logging
+from collections import deque
+from threading import Condition, Event, Thread
+
+from digidevice import device_request
+
+log = logging.getLogger(__name__)
+
+RESPONSE_BUSY = "ERROR: busy"
+RESPONSE_TIMEOUT = "ERROR: timeout"
+RESPONSE_ERROR = "ERROR: {}"
+
+
+class _Task:
+    """
+    Request waiting for or being processed by a worker.
+    """
+
+    __slots__ = ("target", "request", "done", "started", "cancelled", "result")
+
+    def __init__(self, target, request):
+        self.target = target
+        self.request = request
+        self.done = Event()
+        self.started = False
+        self.cancelled = False
+        self.result = None
+
+
+class _Target:
+    """
+    Registration and queue of a target.
+    """
+
+    __slots__ = ("name", "handler", "max_concurrency", "max_queue", "response_timeout",
+                 "queue", "running")
+
+    def __init__(self, name, handler, max_concurrency, max_queue, response_timeout):
+        self.name = name
+        self.handler = handler
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.response_timeout = response_timeout
+        self.queue = deque()
+        self.running = 0
+
+
+class SCIDispatcher:
+    """
+    Class that dispatches SCI device requests to handlers running in a pool of
+    worker threads.
+
+    Handlers have the same signature as `device_request` callbacks: they
+    receive the target and the request and return the response. The response
+    is sent back to Digi Remote Manager if the handler finishes within the
+    response timeout of its target. Otherwise the timeout response is sent and
+    the handler keeps running; requests still waiting in the queue when their
+    timeout elapses are discarded.
+    """
+
+    def __init__(self, workers=4, max_queue=64, response_timeout=30,
+                 busy_response=RESPONSE_BUSY, timeout_response=RESPONSE_TIMEOUT,
+                 error_response=RESPONSE_ERROR, register_function=None,
+                 unregister_function=None):
+        """
+        Class constructor. Instantiates a new :class:`.SCIDispatcher`.
+
+        Args:
+            workers (Integer, optional, default=4): Number of worker threads.
+            max_queue (Integer, optional, default=64): Maximum number of
+                requests waiting for a worker among all the targets.
+            response_timeout (Float, optional, default=30): Default seconds to
+                wait for a handler before answering with the timeout response.
+            busy_response (String, optional): Response sent when a request is
+                rejected because the queue is full.
+            timeout_response (String, optional): Response sent when the
+                handler does not finish in time.
+            error_response (String, optional): Format of the response sent
+                when the handler raises an exception, `{}` is replaced with
+                the exception message.
+            register_function (Function, optional, default=`None`): Function
+                used to register the targets. Defaults to
+                `device_request.register`.
+            unregister_function (Function, optional, default=`None`): Function
+                used to unregister the targets. Defaults to
+                `device_request.unregister`.
+
+        Raises:
+            ValueError: If the number of workers is not positive.
+        """
+        if workers < 1:
+            raise ValueError("At least one worker is required")
+        self._num_workers = workers
+        self._max_queue = max_queue
+        self._response_timeout = response_timeout
+        self._busy_response = busy_response
+        self._timeout_response = timeout_response
+        self._error_response = error_response
+        self._register_function = register_function or device_request.register
+        self._unregister_function = unregister_function or device_request.unregister
+
+        self._targets = {}
+        self._ready = deque()
+        self._queued = 0
+        self._cond = Condition()
+        self._workers = []
+        self._running = False
+        self._stats = {"processed": 0, "rejected": 0, "timeouts": 0, "errors": 0}
+
+    @property
+    def queued(self):
+        """
+        Returns the number of requests waiting for a worker.
+
+        Returns:
+            Integer: Number of queued requests.
+        """
+        with self._cond:
+            return self._queued
+
+    @property
+    def stats(self):
+        """
+        Returns the counters of the dispatcher.
+
+        Returns:
+            Dictionary: Number of requests `processed`, `rejected` because of
+                full queues, answered with the timeout response (`timeouts`)
+                and whose handler failed (`errors`).
+        """
+        with self._cond:
+            return dict(self._stats)
+
+    def register(self, target, handler, max_concurrency=1, max_queue=None,
+                 response_timeout=None, **kwargs):
+        """
+        Registers a handler for an SCI device request target.
+
+        Args:
+            target (String): The target.
+            handler (Function): Function that receives the target and the
+                request and returns the response.
+            max_concurrency (Integer, optional, default=1): Maximum number of
+                requests of the target processed at the same time.
+            max_queue (Integer, optional, default=`None`): Maximum number of
+                requests of the target waiting for a worker. `None` for no
+                limit other than the global one.
+            response_timeout (Float, optional, default=`None`): Seconds to wait
+                for the handler. `None` for the default of the dispatcher.
+            **kwargs: Other arguments of `device_request.register`, such as
+                `status_callback` or `xml_encoding`.
+
+        Raises:
+            DeviceRequestException: If the target cannot be registered.
+            ValueError: If the concurrency limit is not positive.
+        """
+        if max_concurrency < 1:
+            raise ValueError("Concurrency limit must be positive")
+        entry = _Target(target, handler, max_concurrency, max_queue,
+                        self._response_timeout if response_timeout is None else response_timeout)
+        with self._cond:
+            self._targets[target] = entry
+        self.start()
+        self._register_function(target, self._dispatch, **kwargs)
+
+    def unregister(self, target):
+        """
+        Unregisters a target. Requests already queued are still processed.
+
+        Args:
+            target (String): The target.
+
+        Returns:
+            Boolean: `True` if the target was unregistered, `False` otherwise.
+        """
+        with self._cond:
+            if self._targets.pop(target, None) is None:
+                return False
+        return self._unregister_function(target)
+
+    def start(self):
+        """
+        Starts the worker threads. It is called automatically when the first
+        target is registered.
+        """
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+            self._workers = [Thread(target=self._work, name="SCIDispatcher-%d" % index,
+                                    daemon=True)
+                             for index in range(self._num_workers)]
+        for worker in self._workers:
+            worker.start()
+
+    def stop(self, timeout=None):
+        """
+        Unregisters all the targets and stops the worker threads. Queued
+        requests are answered with the busy response.
+
+        Args:
+            timeout (Float, optional, default=`None`): Maximum seconds to wait
+                for every worker to finish.
+        """
+        with self._cond:
+            self._running = False
+            self._reject_pending()
+            self._cond.notify_all()
+            workers = self._workers
+            self._workers = []
+        for target in list(self._targets):
+            try:
+                self.unregister(target)
+            except Exception as exc:
+                log.error("Could not unregister target '%s': %s", target, exc)
+        for worker in workers:
+            worker.join(timeout)
+
+    def _dispatch(self, target, request):
+        """
+        Callback registered for every target. Queues the request and waits
+        for its response.
+        """
+        task = _Task(target, request)
+        with self._cond:
+            entry = self._targets.get(target)
+            if entry is None or not self._running:
+                return self._busy_response
+            if self._queued >= self._max_queue or entry.max_queue is not None \
+                    and len(entry.queue) >= entry.max_queue:
+                self._stats["rejected"] += 1
+                log.warning("Request for target '%s' rejected, queue full", target)
+                return self._busy_response
+            entry.queue.append(task)
+            self._queued += 1
+            self._schedule(entry)
+            timeout = entry.response_timeout
+
+        if task.done.wait(timeout):
+            return task.result
+
+        with self._cond:
+            if not task.started:
+                task.cancelled = True
+                if task in entry.queue:
+                    entry.queue.remove(task)
+                    self._queued -= 1
+                # Otherwise it is in the ready queue and skipped by the workers.
+            self._stats["timeouts"] += 1
+        log.warning("Request for target '%s' timed out", target)
+        return self._timeout_response
+
+    def _schedule(self, entry):
+        """
+        Moves the queued requests of a target to the ready queue while the
+        target has free concurrency. Must be called with the lock held.
+        """
+        while entry.queue and entry.running < entry.max_concurrency:
+            task = entry.queue.popleft()
+            entry.running += 1
+            self._ready.append((entry, task))
+            self._cond.notify()
+
+    def _work(self):
+        """
+        Main loop of the worker threads.
+        """
+        while True:
+            with self._cond:
+                while self._running and not self._ready:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                entry, task = self._ready.popleft()
+                self._queued -= 1
+                if task.cancelled:
+                    entry.running -= 1
+                    self._schedule(entry)
+                    continue
+                task.started = True
+
+            failed = False
+            try:
+                result = entry.handler(task.target, task.request)
+            except Exception as exc:
+                log.error("Error processing request for target '%s': %s", task.target, exc)
+                result = self._error_response.format(exc)
+                failed = True
+            task.result = result
+            task.done.set()
+
+            with self._cond:
+                entry.running -= 1
+                self._stats["processed"] += 1
+                if failed:
+                    self._stats["errors"] += 1
+                self._schedule(entry)
+
+    def _reject_pending(self):
+        """
+        Answers all the queued requests with the busy response. Must be
+        called with the lock held.
+        """
+        pending = []
+        for entry, task in self._ready:
+            # Ready tasks hold a concurrency slot of their target.
+            entry.running -= 1
+            pending.append(task)
+        self._ready.clear()
+        for entry in self._targets.values():
+            pending.extend(entry.queue)
+            entry.queue.clear()
+        for task in pending:
+            task.result = self._busy_response
+            task.done.set()
+        self._queued = 0
@@ -0,0 +1,410 @@
+# Copyright (c) 2026, Digi International, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Instrumentation of Digi Remote Manager SCI device request handlers.
+
+Handlers are wrapped to record per target the number of requests, the
+handler errors, a latency histogram, the request and response sizes and the
+error codes reported by the `status_callback`. The metrics are uploaded
+periodically as data points.
+"""
+
+import bisect
+import functools
+import logging
+import time
+from array import array
+from threading import Event, Lock, Thread
+
+from digidevice import datapoint, device_request
+from digidevice.datapoint import DataPoint, DataType
+
+log = logging.getLogger(__name__)
+
+# Upper bounds of the latency histogram buckets, in milliseconds.
+DEFAULT_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+class _TargetMetrics:
+    """
+    Metrics of a target since the last export.
+    """
+
+    __slots__ = ("requests", "errors", "status_errors", "status_codes", "latency_counts",
+                 "latency_sum", "latency_max", "request_bytes", "response_bytes")
+
+    def __init__(self, num_buckets):
+        self.requests = 0
+        self.errors = 0
+        self.status_errors = 0
+        self.status_codes = {}
+        # One extra bucket for the latencies over the last bound.
+        self.latency_counts = array("L", [0] * (num_buckets + 1))
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.request_bytes = 0
+        self.response_bytes = 0
+
+    def copy(self):
+        metrics = _TargetMetrics(len(self.latency_counts) - 1)
+        for name in self.__slots__:
+            setattr(metrics, name, getattr(self, name))
+        metrics.status_codes = dict(self.status_codes)
+        metrics.latency_counts = array("L", self.latency_counts)
+        return metrics
+
+    def subtract(self, other):
+        """
+        Removes the values of an earlier copy of these metrics.
+        """
+        self.requests -= other.requests
+        self.errors -= other.errors
+        self.status_errors -= other.status_errors
+        for code, count in other.status_codes.items():
+            remaining = self.status_codes.get(code, 0) - count
+            if remaining > 0:
+                self.status_codes[code] = remaining
+            else:
+                self.status_codes.pop(code, None)
+        for index, count in enumerate(other.latency_counts):
+            self.latency_counts[index] -= count
+        self.latency_sum -= other.latency_sum
+        # The maximum cannot be subtracted: it is kept while there are newer
+        # requests, which makes it an upper bound of their maximum.
+        if not self.requests:
+            self.latency_sum = 0.0
+            self.latency_max = 0.0
+        self.request_bytes -= other.request_bytes
+        self.response_bytes -= other.response_bytes
+
+    def is_empty(self):
+        return not self.requests and not self.status_codes
+
+
+class SCIMetrics:
+    """
+    Class that records metrics of SCI device request handlers and uploads
+    them periodically.
+
+    For every target, the following streams are uploaded with the values of
+    every export interval (`<prefix>/<target>/<metric>`): `requests`,
+    `errors` (handler exceptions), `status_errors` (non-zero codes of the
+    status callback), `latency_avg`, `latency_p95` and `latency_max` (in
+    milliseconds), `request_bytes` and `response_bytes`.
+    """
+
+    def __init__(self, export_interval=60, stream_prefix="sci", buckets=DEFAULT_BUCKETS,
+                 upload_timeout=None, upload_function=None, register_function=None):
+        """
+        Class constructor. Instantiates a new :class:`.SCIMetrics`.
+
+        Args:
+            export_interval (Float, optional, default=60): Seconds between
+                uploads of the metrics.
+            stream_prefix (String, optional, default="sci"): Prefix of the
+                data stream IDs.
+            buckets (Tuple, optional): Ascending upper bounds in milliseconds
+                of the latency histogram buckets.
+            upload_timeout (Float, optional, default=`None`): Timeout in
+                seconds of each upload request.
+            upload_function (Function, optional, default=`None`): Function
+                that receives a list of data points and a `timeout` keyword
+                argument and uploads them. Defaults to
+                `datapoint.upload_multiple`.
+            register_function (Function, optional, default=`None`): Function
+                used by :meth:`.register` to register the targets. Defaults
+                to `device_request.register`.
+
+        Raises:
+            ValueError: If the buckets are not in ascending order.
+        """
+        if list(buckets) != sorted(buckets) or not buckets:
+            raise ValueError("Buckets must be in ascending order")
+        self._export_interval = export_interval
+        self._stream_prefix = stream_prefix
+        self._buckets = tuple(buckets)
+        self._upload_timeout = upload_timeout
+        self._upload_function = upload_function or datapoint.upload_multiple
+        self._register_function = register_function or device_request.register
+        self._metrics = {}
+        self._lock = Lock()
+        self._stop_event = Event()
+        self._thread = None
+
+    def wrap(self, handler, target=None):
+        """
+        Returns a handler that records the metrics of another one.
+
+        Args:
+            handler (Function): Function that receives the target and the
+                request and returns the response.
+            target (String, optional, default=`None`): Target to record the
+                metrics under. `None` to use the target of every request.
+
+        Returns:
+            Function: The instrumented handler.
+        """
+        @functools.wraps(handler)
+        def instrumented_handler(request_target, request):
+            start = time.monotonic()
+            failed = False
+            response = None
+            try:
+                response = handler(request_target, request)
+                return response
+            except Exception:
+                failed = True
+                raise
+            finally:
+                self.record(target or request_target, (time.monotonic() - start) * 1000,
+                            _size(request), _size(response), failed)
+        return instrumented_handler
+
+    def wrap_status(self, target, status_callback=None):
+        """
+        Returns a status callback that records the error codes of the
+        responses of a target.
+
+        Args:
+            target (String): The target.
+            status_callback (Function, optional, default=`None`): Status
+                callback to call after recording the code.
+
+        Returns:
+            Function: The instrumented status callback.
+        """
+        def instrumented_status(code, hint):
+            self.record_status(target, code)
+            if status_callback is not None:
+                status_callback(code, hint)
+        return instrumented_status
+
+    def register(self, target, handler, status_callback=None, **kwargs):
+        """
+        Registers a target with an instrumented handler and status callback.
+
+        Args:
+            target (String): The target.
+            handler (Function): Function that receives the target and the
+                request and returns the response.
+            status_callback (Function, optional, default=`None`): Status
+                callback of the target.
+            **kwargs: Other arguments of the register function.
+
+        Raises:
+            DeviceRequestException: If the target cannot be registered.
+        """
+        self._register_function(target, self.wrap(handler, target),
+                                status_callback=self.wrap_status(target, status_callback),
+                                **kwargs)
+
+    def record(self, target, latency, request_size=0, response_size=0, failed=False):
+        """
+        Records a request.
+
+        Args:
+            target (String): Target of the request.
+            latency (Float): Milliseconds the handler took.
+            request_size (Integer, optional, default=0): Size of the request.
+            response_size (Integer, optional, default=0): Size of the response.
+            failed (Boolean, optional, default=`False`): `True` if the handler
+                raised an exception.
+        """
+        bucket = bisect.bisect_left(self._buckets, latency)
+        with self._lock:
+            metrics = self._get_metrics(target)
+            metrics.requests += 1
+            if failed:
+                metrics.errors += 1
+            metrics.latency_counts[bucket] += 1
+            metrics.latency_sum += latency
+            if latency > metrics.latency_max:
+                metrics.latency_max = latency
+            metrics.request_bytes += request_size
+            metrics.response_bytes += response_size
+
+    def record_status(self, target, code):
+        """
+        Records the status code of a response.
+
+        Args:
+            target (String): Target of the response.
+            code (Integer): Status code, 0 for success.
+        """
+        with self._lock:
+            metrics = self._get_metrics(target)
+            metrics.status_codes[code] = metrics.status_codes.get(code, 0) + 1
+            if code != 0:
+                metrics.status_errors += 1
+
+    def snapshot(self, reset=False):
+        """
+        Returns the metrics recorded since the last reset.
+
+        Args:
+            reset (Boolean, optional, default=`False`): `True` to reset the
+                metrics.
+
+        Returns:
+            Dictionary: Target as key and a dictionary with its metrics as
+                value: `requests`, `errors`, `status_errors`, `status_codes`,
+                `latency_avg`, `latency_p95`, `latency_max`, `latency_buckets`
+                (upper bound and count of every bucket, `None` as bound of
+                the last one), `request_bytes` and `response_bytes`.
+        """
+        with self._lock:
+            metrics = self._metrics
+            if reset:
+                self._metrics = {}
+            return {target: self._summarize(values) for target, values in metrics.items()}
+
+    def export(self):
+        """
+        Uploads the metrics recorded since the last export. The uploaded
+        values are removed from the metrics only if the upload succeeds, so
+        they are uploaded again in the next export otherwise.
+
+        Returns:
+            Integer: Number of data points uploaded.
+
+        Raises:
+            DataPointException: If there are any server or transport problems.
+            TimeoutError: If the upload times out.
+        """
+        now = time.time()
+        with self._lock:
+            exported = {target: (values, values.copy())
+                        for target, values in self._metrics.items()}
+        data_points = []
+        for target, (_, metrics) in exported.items():
+            values = self._summarize(metrics)
+            prefix = "%s/%s/" % (self._stream_prefix, target)
+            for name in ("requests", "errors", "status_errors", "request_bytes",
+                         "response_bytes"):
+                data_points.append(DataPoint(prefix + name, values[name], timestamp=now,
+                                             data_type=DataType.INT))
+            if values["requests"]:
+                for name in ("latency_avg", "latency_p95", "latency_max"):
+                    data_points.append(DataPoint(prefix + name, round(values[name], 3),
+                                                 timestamp=now, units="ms",
+                                                 data_type=DataType.DOUBLE))
+        if data_points:
+            self._upload_function(data_points, timeout=self._upload_timeout)
+        with self._lock:
+            for target, (values, metrics) in exported.items():
+                # Skip the metrics reset by a snapshot during the upload.
+                if self._metrics.get(target) is not values:
+                    continue
+                values.subtract(metrics)
+                if values.is_empty():
+                    del self._metrics[target]
+        return len(data_points)
+
+    def start(self):
+        """
+        Starts the background thread that uploads the metrics periodically.
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = Thread(target=self._run, name="SCIMetrics", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """
+        Stops the background thread.
+
+        Args:
+            timeout (Float, optional, default=`None`): Maximum seconds to wait
+                for the thread to finish.
+        """
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _get_metrics(self, target):
+        """
+        Returns the metrics of a target, creating them if needed. Must be
+        called with the lock held.
+        """
+        metrics = self._metrics.get(target)
+        if metrics is None:
+            metrics = _TargetMetrics(len(self._buckets))
+            self._metrics[target] = metrics
+        return metrics
+
+    def _summarize(self, values):
+        """
+        Returns the dictionary of metrics of a target.
+        """
+        counts = list(values.latency_counts)
+        return {
+            "requests": values.requests,
+            "errors": values.errors,
+            "status_errors": values.status_errors,
+            "status_codes": dict(values.status_codes),
+            "latency_avg": values.latency_sum / values.requests if values.requests else 0.0,
+            "latency_p95": self._percentile(counts, 0.95, values.latency_max),
+            "latency_max": values.latency_max,
+            "latency_buckets": list(zip(self._buckets + (None,), counts)),
+            "request_bytes": values.request_bytes,
+            "response_bytes": values.response_bytes,
+        }
+
+    def _percentile(self, counts, fraction, maximum):
+        """
+        Returns the approximate latency under which the given fraction of the
+        requests fall, as the upper bound of the bucket that contains it.
+        """
+        total = sum(counts)
+        if not total:
+            return 0.0
+        threshold = fraction * total
+        accumulated = 0
+        for index, count in enumerate(counts):
+            accumulated += count
+            if accumulated >= threshold:
+                if index < len(self._buckets):
+                    return float(min(self._buckets[index], maximum))
+                return maximum
+        return maximum
+
+    def _run(self):
+        """
+        Main loop of the export thread.
+        """
+        while not self._stop_event.wait(self._export_interval):
+            try:
+                self.export()
+            except Exception as exc:
+                log.error("Could not upload SCI metrics: %s", exc)
+
+
+def _size(value):
+    """
+    Returns the size of a request or response.
+    """
+    if value is None:
+        return 0
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    return len(str(value).encode())
@@ -0,0 +1,358 @@
+# Copyright (c) 2026, Digi International, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Declarative routing of Digi Remote Manager SCI device requests.
+
+Handlers are registered per target with a decorator and a payload codec.
+Requests are dispatched with a single dictionary lookup, and the payload is
+decoded and the response encoded by the codec chosen when the target was
+registered.
+"""
+
+import base64
+import json
+import logging
+
+from digidevice import device_request
+
+log = logging.getLogger(__name__)
+
+RESPONSE_ERROR = "ERROR: {}"
+RESPONSE_INVALID = "ERROR: invalid request"
+
+
+class Codec:
+    """
+    Base class of the payload codecs. The base codec passes the request and
+    the response through, converting the response to a string.
+    """
+
+    # Encoding used to register the target, `None` for raw bytes.
+    xml_encoding = "UTF-8"
+
+    def decode(self, request):
+        """
+        Returns the payload of a request.
+
+        Args:
+            request (String or Bytearray): The request.
+
+        Returns:
+            The decoded payload.
+
+        Raises:
+            ValueError: If the request is not valid.
+        """
+        return request
+
+    def encode(self, response):
+        """
+        Returns the response to send to Digi Remote Manager.
+
+        Args:
+            response: Value returned by the handler.
+
+        Returns:
+            String: The response, `None` for no response.
+        """
+        return None if response is None else str(response)
+
+
+class TextCodec(Codec):
+    """
+    Codec of text payloads, with the surrounding whitespace removed.
+    """
+
+    def decode(self, request):
+        return request.strip()
+
+
+class JSONCodec(Codec):
+    """
+    Codec of JSON payloads. Responses that are not strings are serialized to
+    JSON.
+    """
+
+    def decode(self, request):
+        try:
+            return json.loads(request)
+        except ValueError as exc:
+            raise ValueError("Invalid JSON request: %s" % exc) from None
+
+    def encode(self, response):
+        if response is None or isinstance(response, str):
+            return response
+        return json.dumps(response, separators=(",", ":"))
+
+
+class DelimitedCodec(Codec):
+    """
+    Codec of payloads made of fields separated by a delimiter, for example
+    `1@@0013A20012345678`.
+    """
+
+    def __init__(self, separator="@@", fields=None):
+        """
+        Class constructor. Instantiates a new :class:`.DelimitedCodec`.
+
+        Args:
+            separator (String, optional, default="@@"): Separator of the
+                fields.
+            fields (Tuple, optional, default=`None`): Names of the fields. If
+                provided, the payload is decoded to a dictionary, missing
+                fields are `None` and the last field keeps any remaining
+                separators. Otherwise the payload is decoded to a list.
+        """
+        self._separator = separator
+        self._fields = tuple(fields) if fields else None
+
+    def decode(self, request):
+        request = request.strip()
+        if self._fields is None:
+            return request.split(self._separator)
+        values = request.split(self._separator, len(self._fields) - 1)
+        values.extend([None] * (len(self._fields) - len(values)))
+        return dict(zip(self._fields, values))
+
+    def encode(self, response):
+        if isinstance(response, (list, tuple)):
+            return self._separator.join(str(value) for value in response)
+        return super().encode(response)
+
+
+class RawCodec(Codec):
+    """
+    Codec of binary payloads. The target is registered without encoding, so
+    the handler receives the raw bytes. Binary responses are encoded in
+    Base64.
+    """
+
+    xml_encoding = None
+
+    def decode(self, request):
+        if isinstance(request, str):
+            return request.encode()
+        return bytes(request)
+
+    def encode(self, response):
+        if isinstance(response, (bytes, bytearray)):
+            return base64.b64encode(bytes(response)).decode()
+        return super().encode(response)
+
+
+CODEC_TEXT = "text"
+CODEC_JSON = "json"
+CODEC_DELIMITED = "delimited"
+CODEC_RAW = "raw"
+
+_CODECS = {
+    CODEC_TEXT: TextCodec,
+    CODEC_JSON: JSONCodec,
+    CODEC_DELIMITED: DelimitedCodec,
+    CODEC_RAW: RawCodec,
+}
+
+
+def get_codec(codec, **kwargs):
+    """
+    Returns a codec instance.
+
+    Args:
+        codec (String or :class:`.Codec`): Name of the codec (`text`, `json`,
+            `delimited` or `raw`) or codec instance.
+        **kwargs: Arguments of the codec constructor, such as the `separator`
+            and `fields` of the delimited codec.
+
+    Returns:
+        :class:`.Codec`: The codec.
+
+    Raises:
+        ValueError: If the codec name is unknown.
+    """
+    if isinstance(codec, Codec):
+        return codec
+    codec_class = _CODECS.get(codec)
+    if codec_class is None:
+        raise ValueError("Unknown codec '%s'" % codec)
+    return codec_class(**kwargs)
+
+
+class SCIRouter:
+    """
+    Class that routes SCI device requests to handlers registered per target.
+
+    Handlers receive the decoded payload and return the response, which is
+    encoded by the codec of the target::
+
+        router = SCIRouter()
+
+        @router.route("set_valve", codec="delimited", fields=("value", "address"))
+        def set_valve(payload):
+            ...
+            return "OK"
+
+        router.start()
+    """
+
+    def __init__(self, register_function=None, unregister_function=None,
+                 error_response=RESPONSE_ERROR, invalid_response=RESPONSE_INVALID):
+        """
+        Class constructor. Instantiates a new :class:`.SCIRouter`.
+
+        Args:
+            register_function (Function, optional, default=`None`): Function
+                used to register the targets, for example the `register`
+                method of an `SCIDispatcher`. Defaults to
+                `device_request.register`.
+            unregister_function (Function, optional, default=`None`): Function
+                used to unregister the targets. Defaults to
+                `device_request.unregister`.
+            error_response (String, optional): Format of the response sent
+                when a handler raises an exception, `{}` is replaced with the
+                exception message.
+            invalid_response (String, optional): Response sent when a payload
+                cannot be decoded.
+        """
+        self._register_function = register_function or device_request.register
+        self._unregister_function = unregister_function or device_request.unregister
+        self._error_response = error_response
+        self._invalid_response = invalid_response
+        self._routes = {}
+        self._options = {}
+        self._registered = set()
+        self._started = False
+
+    @property
+    def targets(self):
+        """
+        Returns the routed targets.
+
+        Returns:
+            List: The targets.
+        """
+        return list(self._routes)
+
+    def route(self, target, codec=CODEC_TEXT, register_options=None, **codec_options):
+        """
+        Returns a decorator that routes a target to the decorated function.
+
+        Args:
+            target (String): The target.
+            codec (String or :class:`.Codec`, optional, default="text"): Codec
+                of the payload.
+            register_options (Dictionary, optional, default=`None`): Other
+                arguments to register the target, such as `status_callback`.
+            **codec_options: Arguments of the codec constructor.
+
+        Returns:
+            Function: The decorator.
+        """
+        def decorator(handler):
+            self.add_route(target, handler, codec, register_options, **codec_options)
+            return handler
+        return decorator
+
+    def add_route(self, target, handler, codec=CODEC_TEXT, register_options=None,
+                  **codec_options):
+        """
+        Routes a target to a handler. If the router is started, the target is
+        registered immediately.
+
+        Args:
+            target (String): The target.
+            handler (Function): Function that receives the decoded payload and
+                returns the response.
+            codec (String or :class:`.Codec`, optional, default="text"): Codec
+                of the payload.
+            register_options (Dictionary, optional, default=`None`): Other
+                arguments to register the target, such as `status_callback`.
+            **codec_options: Arguments of the codec constructor.
+
+        Raises:
+            ValueError: If the codec is unknown.
+            DeviceRequestException: If the target cannot be registered.
+        """
+        codec = get_codec(codec, **codec_options)
+        options = dict(register_options or {})
+        options["xml_encoding"] = codec.xml_encoding
+        self._routes[target] = (handler, codec.decode, codec.encode)
+        self._options[target] = options
+        if self._started:
+            self._register(target)
+
+    def start(self):
+        """
+        Registers all the routed targets.
+
+        Raises:
+            DeviceRequestException: If a target cannot be registered.
+        """
+        self._started = True
+        for target in list(self._routes):
+            if target not in self._registered:
+                self._register(target)
+
+    def stop(self):
+        """
+        Unregisters all the routed targets.
+        """
+        self._started = False
+        for target in list(self._registered):
+            try:
+                self._unregister_function(target)
+            except Exception as exc:
+                log.error("Could not unregister target '%s': %s", target, exc)
+            self._registered.discard(target)
+
+    def handle(self, target, request):
+        """
+        Processes a request. This is the callback registered for every
+        target.
+
+        Args:
+            target (String): The target.
+            request (String or Bytearray): The request.
+
+        Returns:
+            String: The response.
+        """
+        route = self._routes.get(target)
+        if route is None:
+            log.warning("Request for unknown target '%s'", target)
+            return self._invalid_response
+        handler, decode, encode = route
+        try:
+            payload = decode(request)
+        except (ValueError, TypeError, UnicodeError) as exc:
+            log.warning("Invalid request for target '%s': %s", target, exc)
+            return self._invalid_response
+        try:
+            return encode(handler(payload))
+        except Exception as exc:
+            log.error("Error processing request for target '%s': %s", target, exc)
+            return self._error_response.format(exc)
+
+    def _register(self, target):
+        """
+        Registers a target.
+        """
+        self._register_function(target, self.handle, **self._options[target])
+        self._registered.add(target)
@@ -0,0 +1,396 @@
+# Copyright (c) 2026, Digi International, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Transfer of large payloads to Digi Remote Manager in chunks through SCI
+device requests.
+
+A transfer is opened with a request that returns its identifier, size,
+number of chunks and checksum, and the chunks are then fetched by number, in
+any order and as many times as needed to resume an interrupted transfer.
+Contents are served from memory-mapped files, so they are never loaded
+whole in memory.
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import mmap
+import os
+import tempfile
+import time
+import uuid
+import zlib
+from threading import Lock
+
+from digidevice import device_request
+
+log = logging.getLogger(__name__)
+
+OP_OPEN = "open"
+OP_GET = "get"
+OP_STATUS = "status"
+OP_CLOSE = "close"
+
+# Size of the blocks read to compute checksums and write spooled contents.
+_BLOCK_SIZE = 64 * 1024
+
+
+class TransferError(Exception):
+    """
+    Exception raised when a transfer request cannot be processed.
+    """
+
+
+class _Transfer:
+    """
+    Content of an open transfer.
+    """
+
+    def __init__(self, transfer_id, name, path, temporary, chunk_size):
+        self.id = transfer_id
+        self.name = name
+        self.path = path
+        self.temporary = temporary
+        self.chunk_size = chunk_size
+        self.file = open(path, "rb")
+        self.size = os.fstat(self.file.fileno()).st_size
+        # Empty files cannot be memory-mapped.
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) \
+            if self.size else b""
+        self.chunks = max(1, -(-self.size // chunk_size))
+        self.sha256 = self._checksum()
+        self.fetched = set()
+        self.last_access = time.monotonic()
+
+    def _checksum(self):
+        digest = hashlib.sha256()
+        for offset in range(0, self.size, _BLOCK_SIZE):
+            digest.update(self.map[offset:offset + _BLOCK_SIZE])
+        return digest.hexdigest()
+
+    def chunk(self, index):
+        start = index * self.chunk_size
+        return self.map[start:start + self.chunk_size]
+
+    def close(self):
+        if self.size:
+            self.map.close()
+        self.file.close()
+        if self.temporary:
+            try:
+                os.remove(self.path)
+            except OSError as exc:
+                log.warning("Could not remove spool file '%s': %s", self.path, exc)
+
+
+class SCITransfer:
+    """
+    Class that serves contents in chunks through an SCI device request target.
+
+    Requests are JSON objects with an `op` field:
+
+    * `{"op": "open", "name": <source>, "args": {...}}` opens a transfer of a
+      registered source and returns its `id`, `size`, `chunk_size`, number of
+      `chunks` and `sha256` checksum.
+    * `{"op": "get", "id": <id>, "chunk": <n>}` returns chunk `n` (starting at
+      0) as Base64 `data`, with its `crc32`.
+    * `{"op": "status", "id": <id>}` returns the transfer information and the
+      chunks not fetched yet, to resume a transfer.
+    * `{"op": "close", "id": <id>}` ends the transfer.
+
+    Errors are returned as `{"error": <message>}`.
+    """
+
+    def __init__(self, target="transfer", chunk_size=32 * 1024, idle_timeout=300,
+                 max_transfers=8, spool_dir=None, register_function=None,
+                 unregister_function=None):
+        """
+        Class constructor. Instantiates a new :class:`.SCITransfer`.
+
+        Args:
+            target (String, optional, default="transfer"): SCI device request
+                target of the transfers.
+            chunk_size (Integer, optional, default=32768): Bytes per chunk
+                before the Base64 encoding.
+            idle_timeout (Float, optional, default=300): Seconds without
+                requests after which a transfer is closed.
+            max_transfers (Integer, optional, default=8): Maximum number of
+                open transfers.
+            spool_dir (String, optional, default=`None`): Directory of the
+                temporary files where generated contents are written.
+                `None` for the system temporary directory.
+            register_function (Function, optional, default=`None`): Function
+                used to register the target. Defaults to
+                `device_request.register`.
+            unregister_function (Function, optional, default=`None`): Function
+                used to unregister the target. Defaults to
+                `device_request.unregister`.
+        """
+        self._target = target
+        self._chunk_size = chunk_size
+        self._idle_timeout = idle_timeout
+        self._max_transfers = max_transfers
+        self._spool_dir = spool_dir
+        self._register_function = register_function or device_request.register
+        self._unregister_function = unregister_function or device_request.unregister
+        self._sources = {}
+        self._transfers = {}
+        self._opening = 0
+        self._lock = Lock()
+
+    def add_source(self, name, provider):
+        """
+        Registers a content that can be transferred.
+
+        Args:
+            name (String): Name of the content in the open requests.
+            provider (Function): Function that receives the `args` of the
+                open request as keyword arguments and returns the content: the
+                path of a file (String), the bytes, or an iterable of bytes
+                chunks (for example a generator), which is written to a
+                temporary file as it is generated.
+        """
+        self._sources[name] = provider
+
+    def register(self, **kwargs):
+        """
+        Registers the transfers target.
+
+        Args:
+            **kwargs: Other arguments of the register function.
+
+        Raises:
+            DeviceRequestException: If the target cannot be registered.
+        """
+        self._register_function(self._target, self.handle, **kwargs)
+
+    def unregister(self):
+        """
+        Unregisters the transfers target and closes all the transfers.
+
+        Returns:
+            Boolean: `True` if the target was unregistered, `False` otherwise.
+        """
+        with self._lock:
+            transfers = list(self._transfers.values())
+            self._transfers.clear()
+        for transfer in transfers:
+            transfer.close()
+        return self._unregister_function(self._target)
+
+    def handle(self, target, request):
+        """
+        Processes a transfer request. This is the callback registered for the
+        target.
+
+        Args:
+            target (String): The target.
+            request (String): The JSON request.
+
+        Returns:
+            String: The JSON response.
+        """
+        try:
+            try:
+                message = json.loads(request)
+            except ValueError:
+                raise TransferError("Invalid request") from None
+            if not isinstance(message, dict):
+                raise TransferError("Invalid request")
+            operation = message.get("op")
+            if operation == OP_OPEN:
+                response = self.open(message.get("name"), **(message.get("args") or {}))
+            elif operation == OP_GET:
+                response = self.get_chunk(message.get("id"), message.get("chunk"))
+            elif operation == OP_STATUS:
+                response = self.status(message.get("id"))
+            elif operation == OP_CLOSE:
+                response = {"id": message.get("id"), "closed": self.close(message.get("id"))}
+            else:
+                raise TransferError("Unknown operation '%s'" % operation)
+        except TransferError as exc:
+            response = {"error": str(exc)}
+        except Exception as exc:
+            log.error("Error processing transfer request: %s", exc)
+            response = {"error": str(exc)}
+        return json.dumps(response, separators=(",", ":"))
+
+    def open(self, name, **kwargs):
+        """
+        Opens a transfer of a registered source.
+
+        Args:
+            name (String): Name of the source.
+            **kwargs: Arguments of the source provider.
+
+        Returns:
+            Dictionary: The `id`, `size`, `chunk_size`, `chunks` and `sha256`
+                of the transfer.
+
+        Raises:
+            TransferError: If the source does not exist or there are too many
+                open transfers.
+        """
+        self._expire()
+        provider = self._sources.get(name)
+        if provider is None:
+            raise TransferError("Unknown source '%s'" % name)
+        with self._lock:
+            # Transfers being opened hold a slot, so concurrent opens cannot
+            # exceed the limit while their contents are materialized.
+            if len(self._transfers) + self._opening >= self._max_transfers:
+                raise TransferError("Too many open transfers")
+            self._opening += 1
+
+        transfer = None
+        try:
+            path, temporary = self._materialize(provider(**kwargs))
+            try:
+                transfer = _Transfer(uuid.uuid4().hex, name, path, temporary, self._chunk_size)
+            except Exception:
+                if temporary:
+                    os.remove(path)
+                raise
+        finally:
+            with self._lock:
+                self._opening -= 1
+                if transfer is not None:
+                    self._transfers[transfer.id] = transfer
+        log.debug("Transfer %s of '%s' opened: %d bytes", transfer.id, name, transfer.size)
+        return self._info(transfer)
+
+    def get_chunk(self, transfer_id, index):
+        """
+        Returns a chunk of a transfer.
+
+        Args:
+            transfer_id (String): Identifier of the transfer.
+            index (Integer): Number of the chunk, starting at 0.
+
+        Returns:
+            Dictionary: The `id`, the `chunk` number, the Base64 `data` and its
+                `crc32`.
+
+        Raises:
+            TransferError: If the transfer or the chunk does not exist.
+        """
+        transfer = self._get_transfer(transfer_id)
+        if not isinstance(index, int) or not 0 <= index < transfer.chunks:
+            raise TransferError("Invalid chunk '%s'" % index)
+        data = transfer.chunk(index)
+        transfer.fetched.add(index)
+        return {"id": transfer.id, "chunk": index, "crc32": zlib.crc32(data),
+                "data": base64.b64encode(data).decode()}
+
+    def status(self, transfer_id):
+        """
+        Returns the information of a transfer and the chunks not fetched yet.
+
+        Args:
+            transfer_id (String): Identifier of the transfer.
+
+        Returns:
+            Dictionary: The transfer information and the `missing` chunks.
+
+        Raises:
+            TransferError: If the transfer does not exist.
+        """
+        transfer = self._get_transfer(transfer_id)
+        info = self._info(transfer)
+        info["missing"] = [index for index in range(transfer.chunks)
+                           if index not in transfer.fetched]
+        return info
+
+    def close(self, transfer_id):
+        """
+        Closes a transfer and releases its resources.
+
+        Args:
+            transfer_id (String): Identifier of the transfer.
+
+        Returns:
+            Boolean: `True` if the transfer was open, `False` otherwise.
+        """
+        self._expire()
+        with self._lock:
+            transfer = self._transfers.pop(transfer_id, None)
+        if transfer is None:
+            return False
+        transfer.close()
+        return True
+
+    def _get_transfer(self, transfer_id):
+        """
+        Returns an open transfer, updating its last access time. Idle
+        transfers are expired first.
+        """
+        self._expire()
+        with self._lock:
+            transfer = self._transfers.get(transfer_id)
+        if transfer is None:
+            raise TransferError("Unknown transfer '%s'" % transfer_id)
+        transfer.last_access = time.monotonic()
+        return transfer
+
+    def _expire(self):
+        """
+        Closes the transfers idle for longer than the timeout.
+        """
+        limit = time.monotonic() - self._idle_timeout
+        with self._lock:
+            expired = [transfer for transfer in self._transfers.values()
+                       if transfer.last_access < limit]
+            for transfer in expired:
+                del self._transfers[transfer.id]
+        for transfer in expired:
+            log.debug("Transfer %s expired", transfer.id)
+            transfer.close()
+
+    def _materialize(self, content):
+        """
+        Returns the path of a file with the content of a source and whether
+        it is a temporary file.
+        """
+        if isinstance(content, str):
+            if not os.path.isfile(content):
+                raise TransferError("File '%s' not found" % content)
+            return content, False
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            content = (content,)
+        descriptor, path = tempfile.mkstemp(prefix="sci_transfer_", dir=self._spool_dir)
+        try:
+            with os.fdopen(descriptor, "wb") as spool:
+                for block in content:
+                    spool.write(block.encode() if isinstance(block, str) else block)
+        except Exception:
+            os.remove(path)
+            raise
+        return path, True
+
+    @staticmethod
+    def _info(transfer):
+        """
+        Returns the information of a transfer.
+        """
+        return {"id": transfer.id, "name": transfer.name, "size": transfer.size,
+                "chunk_size": transfer.chunk_size, "chunks": transfer.chunks,
+                "sha256": transfer.sha256}
@@ -0,0 +1,454 @@
+# Copyright (c) 2026, Digi International, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Typed parsers of the output of device `show` CLI commands, with a shared
+cache of the parsed results.
+
+The output of `show` commands is made of blocks of `Key : Value` lines and
+tables with a header underlined by dashes. Both are parsed in a single pass
+into dictionaries with normalized keys (`Firmware Version` becomes
+`firmware_version`) and typed values.
+"""
+
+import copy
+import re
+import time
+from threading import Lock
+
+from digidevice import cli
+
+CMD_SHOW_SYSTEM = "show system"
+CMD_SHOW_VERSION = "show version"
+CMD_SHOW_NETWORK = "show network"
+CMD_SHOW_MODEM = "show modem"
+CMD_SHOW_XBEE = "show xbee"
+
+_KEY_VALUE_PATTERN = re.compile(r"^\s*([^:]*?[^:\s])\s*:\s?(.*?)\s*$")
+_SEPARATOR_PATTERN = re.compile(r"^[\s\-=]+$")
+_DASHES_PATTERN = re.compile(r"-+")
+_KEY_PATTERN = re.compile(r"[^0-9a-z]+")
+_INT_PATTERN = re.compile(r"^-?\d+$")
+_FLOAT_PATTERN = re.compile(r"^-?\d+\.\d+$")
+_PERCENT_PATTERN = re.compile(r"^(-?\d+(?:\.\d+)?)\s*%$")
+_UNIT_PATTERN = re.compile(r"^(-?\d+(?:\.\d+)?)\s*(dBm|dB|MB|KB|kB|B|s|ms|C|V)$")
+_SECONDS_PATTERN = re.compile(r"\((\d+)s\)\s*$")
+
+# Values that mean that a field has no value.
+_EMPTY_VALUES = frozenset(("", "Not Available", "N/A", "n/a", "-", "None"))
+
+# Fields whose values are always kept as strings.
+_STRING_FIELDS = frozenset(("serial_number", "sku", "hostname", "mac", "imei", "imsi",
+                            "iccid", "phone_number", "firmware_version",
+                            "alt_firmware_version", "bootloader_version",
+                            "hardware_version", "version", "ext_addr", "extended_address",
+                            "pan_id", "node_id", "name"))
+
+
+def normalize_key(text):
+    """
+    Returns the normalized key of a field name, in lowercase with words
+    separated by underscores.
+
+    Args:
+        text (String): The field name, for example 'Alt. Firmware Version'.
+
+    Returns:
+        String: The normalized key, for example 'alt_firmware_version'.
+    """
+    return _KEY_PATTERN.sub("_", text.lower()).strip("_")
+
+
+def convert_value(value, key=None):
+    """
+    Returns the typed value of a field.
+
+    Integers and decimals are converted to numbers, percentages and values
+    with units to numbers without the unit, durations ending with the seconds
+    in parentheses (`53 minutes, 27 seconds (3207s)`) to the number of
+    seconds, and empty or 'Not Available' values to `None`. Other values are
+    returned as strings.
+
+    Args:
+        value (String): The value.
+        key (String, optional, default=`None`): Normalized key of the field.
+            Values of identifier fields (serial number, MAC, versions...) are
+            not converted.
+
+    Returns:
+        The typed value.
+    """
+    value = value.strip()
+    if value in _EMPTY_VALUES:
+        return None
+    if key in _STRING_FIELDS:
+        return value
+    if _INT_PATTERN.match(value):
+        return int(value)
+    if _FLOAT_PATTERN.match(value):
+        return float(value)
+    match = _PERCENT_PATTERN.match(value) or _UNIT_PATTERN.match(value)
+    if match:
+        return float(match.group(1))
+    match = _SECONDS_PATTERN.search(value)
+    if match:
+        return int(match.group(1))
+    return value
+
+
+def parse_key_values(output):
+    """
+    Parses the `Key : Value` lines of a command output in a single pass.
+
+    Lines followed by a dashed underline, or ending with a colon, start a
+    section whose fields are stored in a nested dictionary under the
+    normalized section title. Fields before any section title are stored at
+    the top level.
+
+    Args:
+        output (String): The command output.
+
+    Returns:
+        Dictionary: Normalized key of every field as key and its typed value
+            as value.
+    """
+    result = {}
+    section = result
+    previous = None
+    for line in output.splitlines():
+        match = _KEY_VALUE_PATTERN.match(line)
+        if match:
+            key = normalize_key(match.group(1))
+            section[key] = convert_value(match.group(2), key)
+            previous = None
+            continue
+        stripped = line.strip()
+        if not stripped:
+            previous = None
+        elif _SEPARATOR_PATTERN.match(stripped):
+            if previous:
+                section = result.setdefault(normalize_key(previous), {})
+            previous = None
+        elif stripped.endswith(":"):
+            section = result.setdefault(normalize_key(stripped[:-1]), {})
+            previous = None
+        else:
+            previous = stripped
+    return result
+
+
+def parse_table(output):
+    """
+    Parses the first table of a command output in a single pass. The table
+    must have a header line underlined by groups of dashes, one per column,
+    and at least two columns.
+
+    Args:
+        output (String): The command output.
+
+    Returns:
+        List: A dictionary per row with the normalized column names as keys
+            and the typed values as values. Empty if there is no table.
+    """
+    rows = []
+    columns = None
+    header = None
+    for line in output.splitlines():
+        if columns is None:
+            if header is not None and line.strip() and set(line.strip()) <= {"-", " "}:
+                spans = [match.span() for match in _DASHES_PATTERN.finditer(line)]
+                if len(spans) < 2:
+                    # Underlined title of a section, not a table.
+                    header = None
+                    continue
+                columns = []
+                for index, (start, end) in enumerate(spans):
+                    stop = spans[index + 1][0] if index + 1 < len(spans) else None
+                    columns.append((normalize_key(header[start:stop] or header[start:end]),
+                                    start, stop))
+                continue
+            header = line if line.strip() else None
+            continue
+        if not line.strip():
+            if rows:
+                break
+            continue
+        row = {}
+        for key, start, stop in columns:
+            row[key] = convert_value(line[start:stop], key)
+        rows.append(row)
+    return rows
+
+
+def parse_system(output):
+    """
+    Parses the output of `show system`.
+
+    Returns:
+        Dictionary: The fields, for example `model`, `hostname`, `mac`,
+            `firmware_version`, `cpu` (percentage as Float) and `uptime`
+            (seconds as Integer).
+    """
+    return parse_key_values(output)
+
+
+def parse_version(output):
+    """
+    Parses the output of `show version`.
+
+    Returns:
+        Dictionary: The fields, for example `firmware_version`.
+    """
+    return parse_key_values(output)
+
+
+def parse_network(output):
+    """
+    Parses the output of `show network`.
+
+    Returns:
+        List: A dictionary per interface, for example with `interface`,
+            `proto`, `status` and `address` keys.
+    """
+    return parse_table(output)
+
+
+def parse_modem(output):
+    """
+    Parses the output of `show modem`. The summary table of all the modems
+    is returned as a list, and the detailed output of a single modem
+    (`show modem name <modem>`) as a dictionary.
+
+    Returns:
+        List or Dictionary: The modem records.
+    """
+    rows = parse_table(output)
+    if rows:
+        return rows
+    return parse_key_values(output)
+
+
+def parse_xbee(output):
+    """
+    Parses the output of `show xbee`.
+
+    Returns:
+        Dictionary: The fields of the XBee gateway, and a `nodes` list with a
+            dictionary per remote node if the output includes a node table.
+    """
+    result = parse_key_values(output)
+    nodes = parse_table(output)
+    if nodes:
+        result["nodes"] = nodes
+    return result
+
+
+# Parser of every command, by longest matching command prefix.
+_PARSERS = {
+    CMD_SHOW_SYSTEM: parse_system,
+    CMD_SHOW_VERSION: parse_version,
+    CMD_SHOW_NETWORK: parse_network,
+    CMD_SHOW_MODEM: parse_modem,
+    CMD_SHOW_XBEE: parse_xbee,
+}
+
+
+def register_parser(command, parser):
+    """
+    Registers the parser of a command.
+
+    Args:
+        command (String): The command, or the beginning of the commands, that
+            the parser handles.
+        parser (Function): Function that receives the output and returns the
+            parsed record.
+    """
+    _PARSERS[command] = parser
+
+
+def get_parser(command):
+    """
+    Returns the parser of a command.
+
+    Args:
+        command (String): The command.
+
+    Returns:
+        Function: The parser of the longest registered prefix of the command,
+            `parse_key_values` if none matches.
+    """
+    command = " ".join(command.split())
+    best = None
+    for prefix in _PARSERS:
+        if (command == prefix or command.startswith(prefix + " ")) \
+                and (best is None or len(prefix) > len(best)):
+            best = prefix
+    return _PARSERS[best] if best is not None else parse_key_values
+
+
+class _Entry:
+    """
+    Cached result of a command.
+    """
+
+    __slots__ = ("lock", "time", "output", "record")
+
+    def __init__(self):
+        self.lock = Lock()
+        self.time = None
+        self.output = None
+        self.record = None
+
+
+class CLICache:
+    """
+    Class that caches the parsed output of CLI commands, so several consumers
+    in the same process share a single execution of every command.
+
+    If a command is requested while it is being executed, the caller waits
+    for that execution instead of running the command again.
+    """
+
+    def __init__(self, ttl=5.0, timeout=5, execute_function=None):
+        """
+        Class constructor. Instantiates a new :class:`.CLICache`.
+
+        Args:
+            ttl (Float, optional, default=5.0): Seconds a result is reused.
+            timeout (Integer, optional, default=5): Timeout in seconds of the
+                commands.
+            execute_function (Function, optional, default=`None`): Function
+                that receives a command and a `timeout` keyword argument and
+                returns its output. Defaults to `cli.execute`.
+        """
+        self._ttl = ttl
+        self._timeout = timeout
+        self._execute_function = execute_function or cli.execute
+        self._entries = {}
+        self._lock = Lock()
+        self._executions = 0
+
+    @property
+    def executions(self):
+        """
+        Returns the number of commands executed.
+
+        Returns:
+            Integer: Number of executions.
+        """
+        return self._executions
+
+    def show(self, command, max_age=None):
+        """
+        Returns the parsed output of a command, executing it only if the
+        cached result is older than the TTL.
+
+        Args:
+            command (String): The command, for example 'show system'.
+            max_age (Float, optional, default=`None`): Maximum seconds since
+                the command was executed. `None` for the TTL of the cache.
+
+        Returns:
+            Dictionary or List: A copy of the parsed record, that can be
+                modified without changing the cached one.
+
+        Raises:
+            CommandFailedException: If the command fails.
+            TimeoutError: If the command times out.
+        """
+        return copy.deepcopy(self._get(command, max_age).record)
+
+    def execute(self, command, max_age=None):
+        """
+        Returns the raw output of a command, executing it only if the cached
+        result is older than the TTL.
+
+        Args:
+            command (String): The command.
+            max_age (Float, optional, default=`None`): Maximum seconds since
+                the command was executed. `None` for the TTL of the cache.
+
+        Returns:
+            String: The output of the command.
+
+        Raises:
+            CommandFailedException: If the command fails.
+            TimeoutError: If the command times out.
+        """
+        return self._get(command, max_age).output
+
+    def invalidate(self, command=None):
+        """
+        Removes cached results.
+
+        Args:
+            command (String, optional, default=`None`): Command to remove.
+                `None` to remove all of them.
+        """
+        with self._lock:
+            if command is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(" ".join(command.split()), None)
+
+    def _get(self, command, max_age):
+        """
+        Returns the cache entry of a command, executing and parsing the
+        command if the entry is expired.
+        """
+        command = " ".join(command.split())
+        ttl = self._ttl if max_age is None else max_age
+        with self._lock:
+            entry = self._entries.get(command)
+            if entry is None:
+                entry = _Entry()
+                self._entries[command] = entry
+        with entry.lock:
+            if entry.time is not None and time.monotonic() - entry.time < ttl:
+                return entry
+            output = self._execute_function(command, timeout=self._timeout)
+            self._executions += 1
+            entry.record = get_parser(command)(output)
+            entry.output = output
+            entry.time = time.monotonic()
+            return entry
+
+
+_cache = CLICache()
+
+
+def show(command, max_age=None):
+    """
+    Returns the parsed output of a command using a cache shared by the whole
+    application.
+
+    Args:
+        command (String): The command, for example 'show system'.
+        max_age (Float, optional, default=`None`): Maximum seconds since the
+            command was executed. `None` for the default TTL (5 seconds).
+
+    Returns:
+        Dictionary or List: The parsed record.
+
+    Raises:
+        CommandFailedException: If the command fails.
+        TimeoutError: If the command times out.
+    """
+    return _cache.show(command, max_age)
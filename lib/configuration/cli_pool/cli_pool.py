@@ -0,0 +1,251 @@
+# Copyright (c) 2026, Digi International, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Concurrent execution of device CLI commands.
+
+Commands are run by a pool of persistent worker threads, so a batch of
+commands runs with bounded concurrency instead of one after another, and the
+same command is only executed once per batch.
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+from digidevice import cli
+
+log = logging.getLogger(__name__)
+
+
+class CLIResult:
+    """
+    Class that represents the result of a CLI command.
+    """
+
+    __slots__ = ("command", "output", "error", "elapsed")
+
+    def __init__(self, command, output=None, error=None, elapsed=0.0):
+        """
+        Class constructor. Instantiates a new :class:`.CLIResult`.
+
+        Args:
+            command (String): The executed command.
+            output (String, optional, default=`None`): Output of the command.
+            error (Exception, optional, default=`None`): Exception raised by
+                the command, `None` if it succeeded.
+            elapsed (Float, optional, default=0.0): Seconds the command took.
+        """
+        self.command = command
+        self.output = output
+        self.error = error
+        self.elapsed = elapsed
+
+    def __repr__(self):
+        return "CLIResult(%r, ok=%s, elapsed=%.3f)" % (self.command, self.ok, self.elapsed)
+
+    @property
+    def ok(self):
+        """
+        Returns whether the command succeeded.
+
+        Returns:
+            Boolean: `True` if the command succeeded, `False` otherwise.
+        """
+        return self.error is None
+
+
+class CLIPool:
+    """
+    Class that executes CLI commands in a pool of worker threads.
+
+    The worker threads are created once and reused by every call, and at most
+    `workers` commands run at the same time.
+    """
+
+    def __init__(self, workers=4, timeout=5, execute_function=None):
+        """
+        Class constructor. Instantiates a new :class:`.CLIPool`.
+
+        Args:
+            workers (Integer, optional, default=4): Maximum number of commands
+                executed at the same time.
+            timeout (Integer, optional, default=5): Default timeout in seconds
+                of every command.
+            execute_function (Function, optional, default=`None`): Function
+                that receives a command and a `timeout` keyword argument and
+                returns its output. Defaults to `cli.execute`.
+
+        Raises:
+            ValueError: If the number of workers is not positive.
+        """
+        if workers < 1:
+            raise ValueError("At least one worker is required")
+        self._workers = workers
+        self._timeout = timeout
+        self._execute_function = execute_function or cli.execute
+        self._executor = None
+        self._stopped = False
+        self._lock = Lock()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def start(self):
+        """
+        Starts the worker threads. It is called automatically by the first
+        execution, and must be called to use the pool again after stopping it.
+        """
+        with self._lock:
+            self._stopped = False
+            self._start()
+
+    def stop(self, wait=True):
+        """
+        Stops the worker threads. Commands submitted after stopping the pool
+        are rejected until it is started again.
+
+        Args:
+            wait (Boolean, optional, default=`True`): `True` to wait for the
+                running commands to finish.
+        """
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+            self._stopped = True
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def submit(self, command, timeout=None):
+        """
+        Queues a command for execution.
+
+        Args:
+            command (String): The command.
+            timeout (Integer, optional, default=`None`): Timeout in seconds of
+                the command. `None` for the default timeout of the pool.
+
+        Returns:
+            :class:`concurrent.futures.Future`: Future whose result is a
+                :class:`.CLIResult`.
+
+        Raises:
+            RuntimeError: If the pool is stopped.
+        """
+        with self._lock:
+            if self._stopped:
+                raise RuntimeError("CLI pool is stopped")
+            return self._start().submit(self._run, command,
+                                        self._timeout if timeout is None else timeout)
+
+    def execute(self, command, timeout=None):
+        """
+        Executes a command in the pool and waits for its output.
+
+        Args:
+            command (String): The command.
+            timeout (Integer, optional, default=`None`): Timeout in seconds of
+                the command. `None` for the default timeout of the pool.
+
+        Returns:
+            String: The output of the command.
+
+        Raises:
+            CommandFailedException: If the command fails.
+            TimeoutError: If the timeout elapses before the command finishes.
+        """
+        result = self.submit(command, timeout).result()
+        if result.error is not None:
+            raise result.error
+        return result.output
+
+    def execute_many(self, commands, timeout=None, raise_errors=False, unique=True):
+        """
+        Executes several commands concurrently, at most as many at the same
+        time as workers in the pool.
+
+        Args:
+            commands (Iterable): The commands.
+            timeout (Integer, optional, default=`None`): Timeout in seconds of
+                every command. `None` for the default timeout of the pool.
+            raise_errors (Boolean, optional, default=`False`): `True` to raise
+                the exception of the first failed command (in input order)
+                after all the commands finish.
+            unique (Boolean, optional, default=`True`): `True` to execute a
+                repeated command once and return the same result at every
+                position it appears, `False` to execute it every time.
+
+        Returns:
+            List: The :class:`.CLIResult` of every command, one per command
+                and in the same order as the commands.
+
+        Raises:
+            CommandFailedException: If a command fails and `raise_errors` is
+                `True`.
+            TimeoutError: If a command times out and `raise_errors` is `True`.
+        """
+        commands = list(commands)
+        if unique:
+            futures = {}
+            for command in commands:
+                if command not in futures:
+                    futures[command] = self.submit(command, timeout)
+            results = [futures[command].result() for command in commands]
+        else:
+            results = [future.result() for future in
+                       [self.submit(command, timeout) for command in commands]]
+        if raise_errors:
+            for result in results:
+                if result.error is not None:
+                    raise result.error
+        return results
+
+    def _start(self):
+        """
+        Creates the executor if it does not exist. Must be called with the
+        lock held.
+
+        Returns:
+            :class:`concurrent.futures.ThreadPoolExecutor`: The executor.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._workers,
+                                                thread_name_prefix="CLIPool")
+        return self._executor
+
+    def _run(self, command, timeout):
+        """
+        Executes a command in a worker thread.
+
+        Returns:
+            :class:`.CLIResult`: The result of the command.
+        """
+        start = time.monotonic()
+        try:
+            output = self._execute_function(command, timeout=timeout)
+            return CLIResult(command, output, elapsed=time.monotonic() - start)
+        except Exception as exc:
+            log.debug("Command '%s' failed: %s", command, exc)
+            return CLIResult(command, error=exc, elapsed=time.monotonic() - start)
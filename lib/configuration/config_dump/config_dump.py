@@ -0,0 +1,497 @@
+# Copyright (c) 2026, Digi International, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Parser, cache and comparison of configuration dumps.
+
+The output of `ConfigNode.dump()` and `ConfigNode.changes()` is parsed into a
+flat dictionary of typed values keyed by their dotted path, from which the
+nested structure is built on demand. Parsed dumps are cached by the hash of
+their content, and two dumps are compared in linear time.
+"""
+
+import hashlib
+import json
+import re
+import shlex
+from collections import OrderedDict
+from threading import Lock
+
+# Regular expression of integer values.
+_INT_PATTERN = re.compile(r"^-?\d+$")
+
+# Marker of missing settings.
+_MISSING = object()
+
+
+class ConfigDump:
+    """
+    Class that represents a parsed configuration.
+    """
+
+    def __init__(self, values, digest=None):
+        """
+        Class constructor. Instantiates a new :class:`.ConfigDump`.
+
+        Args:
+            values (Dictionary): Dotted path of every setting as key and its
+                value as value.
+            digest (String, optional, default=`None`): Hash of the content the
+                values were parsed from.
+        """
+        self._values = values
+        self._digest = digest
+        self._tree = None
+
+    def __len__(self):
+        return len(self._values)
+
+    def __contains__(self, path):
+        return path in self._values
+
+    def __getitem__(self, path):
+        return self._values[path]
+
+    def __eq__(self, other):
+        return isinstance(other, ConfigDump) and self._values == other._values
+
+    @property
+    def values(self):
+        """
+        Returns the settings of the configuration. The dictionary is shared
+        with the cache and must not be modified.
+
+        Returns:
+            Dictionary: Dotted path of every setting as key and its value as
+                value.
+        """
+        return self._values
+
+    @property
+    def digest(self):
+        """
+        Returns the hash of the parsed content.
+
+        Returns:
+            String: SHA-1 hexadecimal digest, `None` if unknown.
+        """
+        return self._digest
+
+    @property
+    def tree(self):
+        """
+        Returns the configuration as a nested structure. Objects are
+        dictionaries and arrays (objects whose keys are consecutive indexes
+        starting at 0) are lists. It is built the first time it is requested.
+
+        Returns:
+            Dictionary: The nested configuration.
+        """
+        if self._tree is None:
+            self._tree = _build_tree(self._values)
+        return self._tree
+
+    def get(self, path, default=None):
+        """
+        Returns the value of a setting.
+
+        Args:
+            path (String): Dotted path of the setting.
+            default (optional, default=`None`): Value to return if the setting
+                does not exist.
+
+        Returns:
+            The value of the setting.
+        """
+        return self._values.get(path, default)
+
+    def items(self, prefix=""):
+        """
+        Returns the settings under a path.
+
+        Args:
+            prefix (String, optional, default=""): Dotted path. Empty for all
+                the settings.
+
+        Returns:
+            Dictionary: Dotted path of every setting as key and its value as
+                value.
+        """
+        if not prefix:
+            return dict(self._values)
+        start = prefix + "."
+        return {path: value for path, value in self._values.items()
+                if path.startswith(start)}
+
+
+class ConfigDiff:
+    """
+    Class that represents the differences between two configurations.
+    """
+
+    def __init__(self, added, removed, changed):
+        """
+        Class constructor. Instantiates a new :class:`.ConfigDiff`.
+
+        Args:
+            added (Dictionary): Settings only in the new configuration.
+            removed (Dictionary): Settings only in the old configuration.
+            changed (Dictionary): Settings with different values, with a tuple
+                of the old and new values as value.
+        """
+        self.added = added
+        self.removed = removed
+        self.changed = changed
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+    def __len__(self):
+        return len(self.added) + len(self.removed) + len(self.changed)
+
+    def __str__(self):
+        lines = []
+        lines.extend("+ %s %s" % (path, value) for path, value in self.added.items())
+        lines.extend("- %s %s" % (path, value) for path, value in self.removed.items())
+        lines.extend("~ %s %s -> %s" % (path, old, new)
+                     for path, (old, new) in self.changed.items())
+        return "\n".join(lines)
+
+
+class DumpParser:
+    """
+    Class that parses the output of `ConfigNode.dump()` incrementally.
+
+    Content can be fed in chunks of any size as it is read. Each line is a
+    path followed by its value, with the path segments separated by spaces
+    or dots and values with spaces in double quotes. Quotes inside unquoted
+    values, as in `O'Brien`, are kept as part of the value. `add` lines, which
+    create objects and array elements, are skipped because the settings under
+    them already imply them.
+    """
+
+    def __init__(self):
+        """
+        Class constructor. Instantiates a new :class:`.DumpParser`.
+        """
+        self._values = OrderedDict()
+        self._partial = ""
+        self._hash = hashlib.sha1()
+
+    def feed(self, data):
+        """
+        Parses a chunk of the dump. Incomplete lines are kept until the next
+        chunk.
+
+        Args:
+            data (String): The chunk.
+        """
+        self._hash.update(data.encode())
+        lines = (self._partial + data).split("\n")
+        self._partial = lines.pop()
+        parse_line = self._parse_line
+        for line in lines:
+            parse_line(line)
+
+    def close(self):
+        """
+        Parses the last incomplete line and returns the parsed configuration.
+
+        Returns:
+            :class:`.ConfigDump`: The parsed configuration.
+        """
+        if self._partial:
+            self._parse_line(self._partial)
+            self._partial = ""
+        return ConfigDump(dict(self._values), self._hash.hexdigest())
+
+    def _parse_line(self, line):
+        """
+        Parses a line of the dump.
+        """
+        line = line.strip()
+        if not line or line[0] == "#":
+            return
+        # Only quoted values need shell-like splitting. Apostrophes inside
+        # unquoted values, like `O'Brien`, are part of the value.
+        quoted = line.endswith(('"', "'"))
+        tokens = None
+        if quoted:
+            try:
+                tokens = shlex.split(line)
+            except ValueError:
+                quoted = False
+        if tokens is None:
+            tokens = line.split()
+        if len(tokens) < 2 or tokens[0] == "add":
+            return
+        if len(tokens) == 2:
+            path = tokens[0]
+        else:
+            path = ".".join(tokens[:-1])
+        value = tokens[-1]
+        if not quoted:
+            value = _convert(value)
+        self._values[path] = value
+
+
+def _convert(value):
+    """
+    Returns the Python value of an unquoted dump value.
+    """
+    if value == "true":
+        return True
+    if value == "false":
+        return False
+    if _INT_PATTERN.match(value):
+        return int(value)
+    return value
+
+
+def _flatten(node, path, values):
+    """
+    Adds the settings of a nested structure to a flat dictionary.
+    """
+    pending = [(path, node)]
+    while pending:
+        node_path, node = pending.pop()
+        if isinstance(node, dict):
+            items = node.items()
+        elif isinstance(node, list):
+            items = enumerate(node)
+        else:
+            values[node_path] = node
+            continue
+        base = node_path + "." if node_path else ""
+        pending.extend((base + str(key), child) for key, child in reversed(list(items)))
+
+
+def _build_tree(values):
+    """
+    Returns the nested structure of a flat dictionary of settings.
+    """
+    root = {}
+    for path, value in values.items():
+        node = root
+        parts = path.split(".")
+        for part in parts[:-1]:
+            child = node.get(part)
+            if not isinstance(child, dict):
+                child = {}
+                node[part] = child
+            node = child
+        node[parts[-1]] = value
+    return _to_lists(root)
+
+
+def _to_lists(node):
+    """
+    Converts the dictionaries whose keys are consecutive indexes into lists.
+    """
+    if not isinstance(node, dict):
+        return node
+    for key, child in node.items():
+        node[key] = _to_lists(child)
+    if node and all(key.isdigit() for key in node) \
+            and sorted(int(key) for key in node) == list(range(len(node))):
+        return [node[str(index)] for index in range(len(node))]
+    return node
+
+
+def parse_dump(text):
+    """
+    Parses the output of `ConfigNode.dump()`.
+
+    Args:
+        text (String): The dump.
+
+    Returns:
+        :class:`.ConfigDump`: The parsed configuration.
+    """
+    parser = DumpParser()
+    parser.feed(text)
+    return parser.close()
+
+
+def parse_changes(text):
+    """
+    Parses the output of `ConfigNode.changes()`.
+
+    Args:
+        text (String or Dictionary): The JSON changes, or the already decoded
+            dictionary.
+
+    Returns:
+        :class:`.ConfigDump`: The parsed changes.
+
+    Raises:
+        ValueError: If the text is not valid JSON.
+    """
+    digest = None
+    if isinstance(text, str):
+        digest = hashlib.sha1(text.encode()).hexdigest()
+        text = json.loads(text)
+    values = {}
+    _flatten(text, "", values)
+    return ConfigDump(values, digest)
+
+
+def diff(old, new):
+    """
+    Compares two configurations in linear time.
+
+    Args:
+        old (:class:`.ConfigDump` or Dictionary): The old configuration.
+        new (:class:`.ConfigDump` or Dictionary): The new configuration.
+
+    Returns:
+        :class:`.ConfigDiff`: The differences.
+    """
+    if isinstance(old, ConfigDump) and isinstance(new, ConfigDump) \
+            and old.digest is not None and old.digest == new.digest:
+        return ConfigDiff({}, {}, {})
+    old_values = old.values if isinstance(old, ConfigDump) else old
+    new_values = new.values if isinstance(new, ConfigDump) else new
+    added = {}
+    changed = {}
+    for path, value in new_values.items():
+        old_value = old_values.get(path, _MISSING)
+        if old_value is _MISSING:
+            added[path] = value
+        elif old_value != value:
+            changed[path] = (old_value, value)
+    removed = {path: value for path, value in old_values.items()
+               if path not in new_values}
+    return ConfigDiff(added, removed, changed)
+
+
+class DumpCache:
+    """
+    Class that caches parsed dumps by the hash of their content, so the same
+    configuration is only parsed once.
+    """
+
+    def __init__(self, max_entries=32):
+        """
+        Class constructor. Instantiates a new :class:`.DumpCache`.
+
+        Args:
+            max_entries (Integer, optional, default=32): Maximum number of
+                parsed configurations kept. The least recently used ones are
+                removed first.
+        """
+        self._max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def stats(self):
+        """
+        Returns the counters of the cache.
+
+        Returns:
+            Dictionary: Number of cache `hits`, `misses` and `entries`.
+        """
+        with self._lock:
+            return {"hits": self._hits, "misses": self._misses,
+                    "entries": len(self._entries)}
+
+    def parse_dump(self, text):
+        """
+        Returns the parsed configuration of a `ConfigNode.dump()` output.
+
+        Args:
+            text (String): The dump.
+
+        Returns:
+            :class:`.ConfigDump`: The parsed configuration.
+        """
+        return self._get("dump", text, parse_dump)
+
+    def parse_changes(self, text):
+        """
+        Returns the parsed configuration of a `ConfigNode.changes()` output.
+
+        Args:
+            text (String): The JSON changes.
+
+        Returns:
+            :class:`.ConfigDump`: The parsed changes.
+
+        Raises:
+            ValueError: If the text is not valid JSON.
+        """
+        return self._get("changes", text, parse_changes)
+
+    def dump(self, node, hide_private=False):
+        """
+        Dumps a configuration node and returns it parsed.
+
+        Args:
+            node (:class:`digidevice.config.ConfigNode`): The node.
+            hide_private (Boolean, optional, default=`False`): `True` to hide
+                private settings.
+
+        Returns:
+            :class:`.ConfigDump`: The parsed configuration.
+        """
+        return self.parse_dump(node.dump(hide_private=hide_private))
+
+    def changes(self, node):
+        """
+        Gets the changes of a configuration node from the default
+        configuration and returns them parsed.
+
+        Args:
+            node (:class:`digidevice.config.ConfigNode`): The node.
+
+        Returns:
+            :class:`.ConfigDump`: The parsed changes.
+        """
+        return self.parse_changes(node.changes())
+
+    def clear(self):
+        """
+        Removes all the cached configurations.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def _get(self, kind, text, parse):
+        """
+        Returns a cached parsed configuration, parsing it if not cached.
+        """
+        key = (kind, hashlib.sha1(text.encode()).hexdigest())
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return result
+            self._misses += 1
+        result = parse(text)
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return result
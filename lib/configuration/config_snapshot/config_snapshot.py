@@ -0,0 +1,260 @@
+# Copyright (c) 2026, Digi International, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Read-only snapshot of the device configuration.
+
+The configuration tree is loaded once into a flat dictionary keyed by the
+full dotted path of every setting, so reads are dictionary lookups instead of
+libconfig accesses. The snapshot is loaded again when the configuration file
+changes.
+"""
+
+import logging
+import os
+import time
+from threading import RLock
+
+from digidevice import config
+
+log = logging.getLogger(__name__)
+
+# File where the device stores its configuration.
+DEFAULT_CONFIG_FILE = "/etc/config/accns.json"
+
+# Marker of a missing default value.
+_MISSING = object()
+
+_snapshot = None
+_snapshot_lock = RLock()
+
+
+class ConfigSnapshot:
+    """
+    Class that keeps a read-only copy of the device configuration.
+
+    Values are stored by their full dotted path (for example
+    `network.interface.lan.ipv4.address`), and the keys of every object and
+    array are precomputed, so `get()` and `keys()` do not access libconfig.
+    Array elements are addressed by their index (`firewall.filter.0.action`).
+    """
+
+    def __init__(self, config_file=DEFAULT_CONFIG_FILE, check_interval=1.0):
+        """
+        Class constructor. Instantiates a new :class:`.ConfigSnapshot`. The
+        configuration is loaded on the first access.
+
+        Args:
+            config_file (String, optional): Configuration file whose
+                modification time is checked to detect changes. `None` to
+                only reload when :meth:`.invalidate` is called.
+            check_interval (Float, optional, default=1.0): Minimum seconds
+                between checks of the configuration file.
+        """
+        self._config_file = config_file
+        self._check_interval = check_interval
+        self._lock = RLock()
+        self._values = None
+        self._children = None
+        self._mtime = None
+        self._next_check = 0
+        self._loads = 0
+
+    def __getitem__(self, path):
+        return self.get(path)
+
+    def __contains__(self, path):
+        values, children = self._get_tables()
+        return path in values or path in children
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    @property
+    def loads(self):
+        """
+        Returns the number of times the configuration has been loaded.
+
+        Returns:
+            Integer: Number of loads.
+        """
+        return self._loads
+
+    def get(self, path, default=_MISSING):
+        """
+        Returns the value of a setting.
+
+        Args:
+            path (String): Dotted path of the setting.
+            default (optional): Value to return if the setting does not
+                exist.
+
+        Returns:
+            The value of the setting with its Python type.
+
+        Raises:
+            KeyError: If the setting does not exist, or is an object or array,
+                and no default value is provided.
+        """
+        values, _children = self._get_tables()
+        value = values.get(path, _MISSING)
+        if value is _MISSING:
+            if default is _MISSING:
+                raise KeyError(path)
+            return default
+        return value
+
+    def keys(self, path=""):
+        """
+        Returns the keys of the immediate children of an object or array.
+
+        Args:
+            path (String, optional, default=""): Dotted path of the object or
+                array. Empty for the root of the configuration.
+
+        Returns:
+            List: The keys. Array keys are the indexes as strings.
+
+        Raises:
+            KeyError: If the path is not an object or array.
+        """
+        _values, children = self._get_tables()
+        try:
+            return list(children[path])
+        except KeyError:
+            raise KeyError(path) from None
+
+    def items(self, prefix=""):
+        """
+        Returns the settings under a path.
+
+        Args:
+            prefix (String, optional, default=""): Dotted path of an object or
+                array. Empty for the whole configuration.
+
+        Returns:
+            Dictionary: Full dotted path of every setting as key and its value
+                as value.
+        """
+        values, _children = self._get_tables()
+        if not prefix:
+            return dict(values)
+        start = prefix + "."
+        return {path: value for path, value in values.items()
+                if path.startswith(start)}
+
+    def invalidate(self):
+        """
+        Discards the snapshot, so the configuration is loaded again on the
+        next access.
+        """
+        with self._lock:
+            self._values = None
+            self._children = None
+
+    def refresh(self):
+        """
+        Loads the configuration again.
+
+        Raises:
+            Exception: If the configuration cannot be loaded.
+        """
+        with self._lock:
+            self._load()
+
+    def _get_tables(self):
+        """
+        Returns the values and children tables, loading the configuration if
+        needed.
+        """
+        values, children = self._values, self._children
+        stale = values is None or self._is_stale()
+        if not stale:
+            return values, children
+        with self._lock:
+            if self._values is None or self._values is values:
+                self._load()
+            return self._values, self._children
+
+    def _is_stale(self):
+        """
+        Returns whether the configuration file changed since the snapshot was
+        loaded. The file is checked at most once per check interval.
+        """
+        if self._config_file is None:
+            return False
+        now = time.monotonic()
+        if now < self._next_check:
+            return False
+        self._next_check = now + self._check_interval
+        return self._get_mtime() != self._mtime
+
+    def _get_mtime(self):
+        """
+        Returns the modification time of the configuration file, `None` if
+        it cannot be read.
+        """
+        try:
+            return os.stat(self._config_file).st_mtime_ns
+        except (OSError, TypeError):
+            return None
+
+    def _load(self):
+        """
+        Loads the whole configuration tree into the tables. Must be called
+        with the lock held.
+        """
+        mtime = self._get_mtime() if self._config_file is not None else None
+        values = {}
+        children = {}
+        pending = [("", config.load())]
+        while pending:
+            path, node = pending.pop()
+            keys = [str(key) for key in node.keys()]
+            children[path] = keys
+            base = path + "." if path else ""
+            for key in keys:
+                value = node.get(key)
+                if isinstance(value, config.ConfigNode):
+                    pending.append((base + key, value))
+                else:
+                    values[base + key] = value
+        self._values = values
+        self._children = children
+        self._mtime = mtime
+        self._next_check = time.monotonic() + self._check_interval
+        self._loads += 1
+        log.debug("Configuration snapshot loaded: %d settings", len(values))
+
+
+def get_snapshot():
+    """
+    Returns a snapshot shared by the whole application, created with the
+    default settings the first time.
+
+    Returns:
+        :class:`.ConfigSnapshot`: The shared snapshot.
+    """
+    global _snapshot
+
+    with _snapshot_lock:
+        if _snapshot is None:
+            _snapshot = ConfigSnapshot()
+        return _snapshot
@@ -0,0 +1,252 @@
+# Copyright (c) 2026, Digi International, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Batched changes of the device configuration.
+
+Settings are collected in a transaction and applied with a single writable
+load of the configuration and a single commit. Settings that already have the
+requested value are not written, and the previous values are restored if the
+transaction cannot be applied.
+"""
+
+import logging
+from collections import OrderedDict
+
+from digidevice import config
+
+log = logging.getLogger(__name__)
+
+
+class ConfigTransactionError(Exception):
+    """
+    Exception raised when a configuration transaction cannot be applied.
+    """
+
+
+class ConfigTransaction:
+    """
+    Class that collects configuration changes and applies them at once.
+
+    It can be used as a context manager, committing the changes when the
+    block ends without errors and discarding them otherwise::
+
+        with ConfigTransaction() as transaction:
+            transaction.set("system.description", "Gateway 1")
+            transaction.set("system.location", "Building A")
+    """
+
+    def __init__(self, snapshot=None):
+        """
+        Class constructor. Instantiates a new :class:`.ConfigTransaction`.
+
+        Args:
+            snapshot (Object, optional, default=`None`): Object with an
+                `invalidate()` method, for example a
+                :class:`config_snapshot.ConfigSnapshot`, to invalidate after
+                the configuration changes.
+        """
+        self._snapshot = snapshot
+        self._pending = OrderedDict()
+        self._applied = OrderedDict()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+
+    def __len__(self):
+        return len(self._pending)
+
+    @property
+    def pending(self):
+        """
+        Returns the changes not committed yet.
+
+        Returns:
+            Dictionary: Dotted path of every setting as key and its new value
+                as value.
+        """
+        return dict(self._pending)
+
+    @property
+    def applied(self):
+        """
+        Returns the changes written by the last commit.
+
+        Returns:
+            Dictionary: Dotted path of every changed setting as key and a
+                tuple with its previous and new values as value.
+        """
+        return dict(self._applied)
+
+    def set(self, path, value):
+        """
+        Adds a change to the transaction. If the same setting is set several
+        times, only the last value is written.
+
+        Args:
+            path (String): Dotted path of the setting.
+            value: The new value.
+        """
+        self._pending.pop(path, None)
+        self._pending[path] = value
+
+    def update(self, values):
+        """
+        Adds several changes to the transaction.
+
+        Args:
+            values (Dictionary): Dotted path of every setting as key and its
+                new value as value.
+        """
+        for path, value in values.items():
+            self.set(path, value)
+
+    def discard(self):
+        """
+        Removes the changes not committed yet.
+        """
+        self._pending.clear()
+
+    def commit(self):
+        """
+        Applies the pending changes with a single writable load and a single
+        commit of the configuration. Settings that already have the new value
+        are not written.
+
+        If any setting cannot be written or the commit fails, the previous
+        values of the changed settings are restored and the pending changes
+        are kept.
+
+        Returns:
+            Dictionary: Dotted path of every changed setting as key and a
+                tuple with its previous and new values as value. Empty if
+                there was nothing to change.
+
+        Raises:
+            ConfigTransactionError: If the changes cannot be applied.
+        """
+        self._applied = OrderedDict()
+        if not self._pending:
+            return {}
+
+        try:
+            cfg = config.load(writable=True)
+        except Exception as exc:
+            raise ConfigTransactionError("Could not load configuration: %s" % exc) from exc
+
+        changes = OrderedDict()
+        try:
+            for path, value in self._pending.items():
+                old_value = cfg.get(path)
+                if self._is_same(old_value, value):
+                    continue
+                cfg.set(path, value)
+                changes[path] = (old_value, value)
+        except Exception as exc:
+            # Nothing was committed, the loaded configuration is just dropped.
+            raise ConfigTransactionError("Could not set '%s': %s" % (path, exc)) from exc
+
+        if not changes:
+            self._pending.clear()
+            return {}
+
+        try:
+            committed = cfg.commit()
+        except Exception as exc:
+            committed = False
+            log.error("Configuration commit failed: %s", exc)
+        if not committed:
+            # Release the failed writable configuration before loading another
+            # one, so two writable handles are never open at the same time.
+            del cfg
+            self._restore(changes)
+            raise ConfigTransactionError("Could not commit %d configuration changes"
+                                         % len(changes))
+
+        log.debug("Committed %d configuration changes (%d unchanged)",
+                  len(changes), len(self._pending) - len(changes))
+        self._pending.clear()
+        self._applied = changes
+        self._invalidate_snapshot()
+        return dict(changes)
+
+    def revert(self):
+        """
+        Restores the previous values of the settings changed by the last
+        commit, with a single commit.
+
+        Returns:
+            Dictionary: Dotted path of every restored setting as key and a
+                tuple with its previous and new values as value.
+
+        Raises:
+            ConfigTransactionError: If the values cannot be restored.
+        """
+        if not self._applied:
+            return {}
+        transaction = ConfigTransaction(self._snapshot)
+        transaction.update({path: old_value for path, (old_value, _new_value)
+                            in self._applied.items()})
+        restored = transaction.commit()
+        self._applied = OrderedDict()
+        return restored
+
+    def _restore(self, changes):
+        """
+        Writes back the previous values of a failed commit, in case it was
+        partially saved.
+        """
+        try:
+            cfg = config.load(writable=True)
+            for path, (old_value, _new_value) in changes.items():
+                cfg.set(path, old_value)
+            if not cfg.commit():
+                raise ConfigTransactionError("commit failed")
+        except Exception as exc:
+            log.error("Could not restore previous configuration values: %s", exc)
+        self._invalidate_snapshot()
+
+    def _invalidate_snapshot(self):
+        """
+        Invalidates the configured snapshot, if any.
+        """
+        if self._snapshot is not None:
+            self._snapshot.invalidate()
+
+    @staticmethod
+    def _is_same(old_value, new_value):
+        """
+        Returns whether a new value is equal to the current value of a
+        setting, also when it is given as a string (for example `"true"` for
+        a boolean setting).
+        """
+        if old_value == new_value:
+            return True
+        if isinstance(old_value, bool):
+            old_value = str(old_value).lower()
+        if isinstance(new_value, bool):
+            new_value = str(new_value).lower()
+        return str(old_value) == str(new_value)
@@ -0,0 +1,349 @@
+# Copyright (c) 2026, Digi International, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Thread-safe access to the runtime database through a single persistent
+connection with runtd, with a time-to-live cache of the values read.
+"""
+
+import logging
+import time
+from threading import RLock
+
+from digidevice import runt
+
+log = logging.getLogger(__name__)
+
+# Exception raised by the runt module when an operation fails.
+RuntException = getattr(runt, "RuntException", Exception)
+
+# Marker of values not found in the cache.
+_MISSING = object()
+
+_client = None
+_client_lock = RLock()
+
+
+class RuntClient:
+    """
+    Class that keeps a connection with runtd open and caches the values read
+    from the runtime database.
+
+    The `digidevice.runt` module handles a single connection per process, so
+    all the operations are serialized with a lock and the connection is
+    shared by every thread using this client.
+    """
+
+    def __init__(self, default_ttl=1.0, ttls=None, max_retries=1):
+        """
+        Class constructor. Instantiates a new :class:`.RuntClient`.
+
+        Args:
+            default_ttl (Float, optional, default=1.0): Seconds a value read
+                is cached. 0 to disable the cache.
+            ttls (Dictionary, optional, default=`None`): Cache time in seconds
+                of the values under a path prefix, for example
+                `{"firmware": 3600, "system.cpu_usage": 0}`. The longest
+                matching prefix applies.
+            max_retries (Integer, optional, default=1): Number of times an
+                operation is retried after reconnecting with runtd.
+        """
+        self._default_ttl = default_ttl
+        self._prefix_ttls = sorted((ttls or {}).items(), key=lambda item: len(item[0]),
+                                   reverse=True)
+        self._max_retries = max_retries
+        self._lock = RLock()
+        self._connected = False
+        self._cache = {}
+        self._ttl_by_path = {}
+        self._stats = {"hits": 0, "misses": 0, "reconnections": 0}
+
+    def __enter__(self):
+        self.connect()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def stats(self):
+        """
+        Returns the counters of the client.
+
+        Returns:
+            Dictionary: Number of cache `hits` and `misses` and of
+                `reconnections` with runtd.
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def connect(self):
+        """
+        Opens the connection with runtd if it is not open.
+
+        Raises:
+            RuntException: If the connection fails.
+        """
+        with self._lock:
+            if not self._connected:
+                runt.start()
+                self._connected = True
+
+    def close(self):
+        """
+        Closes the connection with runtd and clears the cache.
+        """
+        with self._lock:
+            if self._connected:
+                try:
+                    runt.stop()
+                except RuntException as exc:
+                    log.debug("Error closing runt connection: %s", exc)
+                self._connected = False
+            self._cache.clear()
+
+    def get(self, path, max_age=None):
+        """
+        Returns a value of the runtime database, from the cache if it was read
+        recently.
+
+        Args:
+            path (String): Path of the value.
+            max_age (Float, optional, default=`None`): Maximum seconds since
+                the value was read to use the cached value. `None` to use the
+                configured TTL of the path.
+
+        Returns:
+            String: The value, `None` if the path is not populated.
+
+        Raises:
+            RuntException: If the operation fails after reconnecting.
+        """
+        now = time.monotonic()
+        with self._lock:
+            value = self._get_cached(path, now, max_age)
+            if value is not _MISSING:
+                return value
+            value = self._call(runt.get, path)
+            self._store(path, value, now)
+            return value
+
+    def get_many(self, paths, max_age=None):
+        """
+        Returns several values of the runtime database. Cached values are not
+        read again, and the rest are read in a single locked pass.
+
+        Args:
+            paths (Iterable): Paths of the values.
+            max_age (Float, optional, default=`None`): Maximum seconds since
+                the values were read to use the cached values. `None` to use
+                the configured TTL of every path.
+
+        Returns:
+            Dictionary: Path as key and its value (`None` if not populated) as
+                value.
+
+        Raises:
+            RuntException: If any read fails after reconnecting.
+        """
+        now = time.monotonic()
+        result = {}
+        with self._lock:
+            for path in paths:
+                value = self._get_cached(path, now, max_age)
+                if value is _MISSING:
+                    value = self._call(runt.get, path)
+                    self._store(path, value, now)
+                result[path] = value
+        return result
+
+    def keys(self, path, max_age=None):
+        """
+        Returns the keys under a path of the runtime database. The result is
+        cached with the TTL of the path.
+
+        Args:
+            path (String): The path.
+            max_age (Float, optional, default=`None`): Maximum seconds since
+                the keys were read to use the cached keys. `None` to use the
+                configured TTL of the path.
+
+        Returns:
+            List: The keys under the path.
+
+        Raises:
+            RuntException: If the operation fails after reconnecting.
+        """
+        cache_key = (path,)
+        now = time.monotonic()
+        with self._lock:
+            value = self._get_cached(cache_key, now, max_age, ttl_path=path)
+            if value is not _MISSING:
+                return list(value)
+            value = self._call(runt.keys, path)
+            self._store(cache_key, list(value), now, ttl_path=path)
+            return list(value)
+
+    def set(self, path, value):
+        """
+        Sets a value in the runtime database and updates the cache.
+
+        Args:
+            path (String): Path of the value.
+            value (String): The value.
+
+        Raises:
+            RuntException: If the operation fails after reconnecting.
+            ValueError: If any argument is not a string.
+        """
+        with self._lock:
+            self._call(runt.set, path, value)
+            self._store(path, value, time.monotonic())
+            self._invalidate_keys(path)
+
+    def delete(self, path):
+        """
+        Deletes a value from the runtime database and from the cache.
+
+        Args:
+            path (String): Path of the value.
+
+        Raises:
+            RuntException: If the operation fails after reconnecting.
+        """
+        with self._lock:
+            self._call(runt.delete, path)
+            self._cache.pop(path, None)
+            self._invalidate_keys(path)
+
+    def invalidate(self, prefix=None):
+        """
+        Removes cached values so they are read again from runtd.
+
+        Args:
+            prefix (String, optional, default=`None`): Only remove the values
+                under this path prefix. `None` to remove all of them.
+        """
+        with self._lock:
+            if prefix is None:
+                self._cache.clear()
+                return
+            for key in list(self._cache):
+                path = key[0] if isinstance(key, tuple) else key
+                if path == prefix or path.startswith(prefix + ".") or not prefix:
+                    del self._cache[key]
+
+    def get_ttl(self, path):
+        """
+        Returns the cache time of a path.
+
+        Args:
+            path (String): The path.
+
+        Returns:
+            Float: Seconds values of the path are cached.
+        """
+        ttl = self._ttl_by_path.get(path)
+        if ttl is None:
+            ttl = self._default_ttl
+            for prefix, prefix_ttl in self._prefix_ttls:
+                if path == prefix or path.startswith(prefix + ".") or not prefix:
+                    ttl = prefix_ttl
+                    break
+            self._ttl_by_path[path] = ttl
+        return ttl
+
+    def _get_cached(self, key, now, max_age, ttl_path=None):
+        """
+        Returns a cached value if it is still valid. Must be called with the
+        lock held.
+
+        Returns:
+            The cached value, `_MISSING` if there is no valid cached value.
+        """
+        entry = self._cache.get(key)
+        if entry is not None:
+            ttl = max_age if max_age is not None else self.get_ttl(
+                ttl_path if ttl_path is not None else key)
+            if now - entry[1] < ttl:
+                self._stats["hits"] += 1
+                return entry[0]
+        self._stats["misses"] += 1
+        return _MISSING
+
+    def _store(self, key, value, now, ttl_path=None):
+        """
+        Stores a value in the cache if its path is cacheable. Must be called
+        with the lock held.
+        """
+        if self.get_ttl(ttl_path if ttl_path is not None else key) > 0:
+            self._cache[key] = (value, now)
+
+    def _invalidate_keys(self, path):
+        """
+        Removes the cached key lists of the parents of a path. Must be called
+        with the lock held.
+        """
+        parts = path.split(".")
+        for index in range(len(parts)):
+            self._cache.pop((".".join(parts[:index]),), None)
+
+    def _call(self, function, *args):
+        """
+        Calls a runt function, connecting with runtd if needed and
+        reconnecting if the call fails. Must be called with the lock held.
+
+        Raises:
+            RuntException: If the call fails after all the retries.
+        """
+        attempt = 0
+        while True:
+            if not self._connected:
+                runt.start()
+                self._connected = True
+            try:
+                return function(*args)
+            except RuntException as exc:
+                if attempt >= self._max_retries:
+                    raise
+                attempt += 1
+                log.warning("runt operation failed, reconnecting: %s", exc)
+                try:
+                    runt.stop()
+                except RuntException:
+                    pass
+                self._connected = False
+                self._stats["reconnections"] += 1
+
+
+def get_client():
+    """
+    Returns a client shared by the whole application, created with the default
+    settings the first time.
+
+    Returns:
+        :class:`.RuntClient`: The shared client.
+    """
+    global _client
+
+    with _client_lock:
+        if _client is None:
+            _client = RuntClient()
+        return _client
@@ -0,0 +1,344 @@
+# Copyright (c) 2026, Digi International, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+In-memory index of the keys of the runtime database.
+
+The runtime database namespace is enumerated once into a prefix tree, so
+listing, prefix and glob queries are answered without accessing runtd.
+Subtrees are enumerated again only when refreshed explicitly or when their
+refresh interval expires.
+"""
+
+import fnmatch
+import logging
+import re
+import time
+from threading import Lock
+
+from runt_client import RuntClient
+
+log = logging.getLogger(__name__)
+
+
+class _Node:
+    """
+    Node of the key tree. Nodes without children are values.
+    """
+
+    __slots__ = ("children", "scanned")
+
+    def __init__(self, scanned):
+        self.children = {}
+        self.scanned = scanned
+
+
+class RuntIndex:
+    """
+    Class that keeps a prefix tree of the keys of the runtime database.
+
+    Paths are dotted, as in the runtime database (for example
+    `interface.eth1.rx_bytes`). Glob patterns are matched segment by segment:
+    `*`, `?` and `[...]` match within a segment, and a `**` segment matches
+    any number of segments.
+    """
+
+    def __init__(self, client=None, intervals=None, default_interval=None):
+        """
+        Class constructor. Instantiates a new :class:`.RuntIndex`. The
+        namespace is not enumerated until :meth:`.refresh` is called.
+
+        Args:
+            client (:class:`runt_client.RuntClient`, optional, default=`None`):
+                Client used to read the runtime database. A new one is
+                created if not provided.
+            intervals (Dictionary, optional, default=`None`): Seconds after
+                which the subtree under a path prefix is enumerated again by
+                :meth:`.refresh_stale`, for example `{"interface": 60}`. The
+                longest matching prefix applies.
+            default_interval (Float, optional, default=`None`): Refresh
+                interval of the paths not matching any prefix of `intervals`.
+                `None` to never refresh them automatically.
+        """
+        self._client = client or RuntClient()
+        self._intervals = sorted((intervals or {}).items(), key=lambda item: len(item[0]),
+                                 reverse=True)
+        self._default_interval = default_interval
+        self._root = _Node(None)
+        self._lock = Lock()
+        self._ipc_calls = 0
+
+    def __contains__(self, path):
+        with self._lock:
+            return self._find(path) is not None
+
+    def __len__(self):
+        return len(self.paths())
+
+    @property
+    def ipc_calls(self):
+        """
+        Returns the number of `keys()` calls done to runtd to build and
+        refresh the index.
+
+        Returns:
+            Integer: Number of calls.
+        """
+        return self._ipc_calls
+
+    def refresh(self, path=""):
+        """
+        Enumerates again the keys under a path and replaces its subtree.
+
+        Args:
+            path (String, optional, default=""): Path of the subtree. Empty to
+                enumerate the whole runtime database.
+
+        Raises:
+            RuntException: If the runtime database cannot be read.
+        """
+        node = self._scan(path, time.monotonic())
+        exists = bool(node.children) or bool(path) and self._is_value(path)
+        with self._lock:
+            if not path:
+                self._root = node
+                return
+            parts = path.split(".")
+            ancestors = [self._root]
+            for part in parts[:-1]:
+                child = ancestors[-1].children.get(part)
+                if child is None:
+                    child = _Node(node.scanned)
+                    ancestors[-1].children[part] = child
+                ancestors.append(child)
+            if exists:
+                ancestors[-1].children[parts[-1]] = node
+                return
+            # Remove the path and the ancestors left without children.
+            ancestors[-1].children.pop(parts[-1], None)
+            for index in range(len(ancestors) - 1, 0, -1):
+                if ancestors[index].children:
+                    break
+                del ancestors[index - 1].children[parts[index - 1]]
+
+    def refresh_stale(self):
+        """
+        Enumerates again the subtrees whose refresh interval expired. A
+        subtree is refreshed as a whole, and subtrees not expired are not
+        accessed.
+
+        Returns:
+            List: The paths of the refreshed subtrees.
+
+        Raises:
+            RuntException: If the runtime database cannot be read.
+        """
+        now = time.monotonic()
+        stale = []
+        with self._lock:
+            pending = [("", self._root)]
+            while pending:
+                path, node = pending.pop()
+                interval = self.get_interval(path)
+                if node.scanned is None or interval is not None \
+                        and now - node.scanned >= interval:
+                    stale.append(path)
+                    continue
+                base = path + "." if path else ""
+                pending.extend((base + name, child) for name, child in node.children.items()
+                               if child.children)
+        for path in stale:
+            self.refresh(path)
+        return stale
+
+    def get_interval(self, path):
+        """
+        Returns the refresh interval of a path.
+
+        Args:
+            path (String): The path.
+
+        Returns:
+            Float: Seconds between refreshes, `None` if it is not refreshed
+                automatically.
+        """
+        for prefix, interval in self._intervals:
+            if path == prefix or path.startswith(prefix + ".") or not prefix:
+                return interval
+        return self._default_interval
+
+    def keys(self, path=""):
+        """
+        Returns the keys directly under a path, like `runt.keys()`.
+
+        Args:
+            path (String, optional, default=""): The path.
+
+        Returns:
+            List: The keys, empty if the path is not indexed.
+        """
+        with self._lock:
+            node = self._find(path)
+            return list(node.children) if node is not None else []
+
+    def paths(self, prefix=""):
+        """
+        Returns the paths of all the values under a prefix.
+
+        Args:
+            prefix (String, optional, default=""): The prefix. Empty for all
+                the values.
+
+        Returns:
+            List: The paths, in depth-first order.
+        """
+        with self._lock:
+            node = self._find(prefix)
+            if node is None:
+                return []
+            result = []
+            self._collect(node, prefix, result)
+            return result
+
+    def glob(self, pattern):
+        """
+        Returns the paths of the values matching a glob pattern, for example
+        `interface.*.rx_bytes` or `system.**`.
+
+        Args:
+            pattern (String): The pattern.
+
+        Returns:
+            List: The matching paths.
+        """
+        parts = [None if part == "**" else self._compile(part)
+                 for part in pattern.split(".")]
+        result = []
+        with self._lock:
+            self._match(self._root, "", parts, 0, result, set())
+        return result
+
+    def get_values(self, pattern, max_age=None):
+        """
+        Reads the values of the paths matching a glob pattern.
+
+        Args:
+            pattern (String): The pattern.
+            max_age (Float, optional, default=`None`): Maximum age of the
+                cached values, as in :meth:`runt_client.RuntClient.get_many`.
+
+        Returns:
+            Dictionary: Path as key and its value as value.
+
+        Raises:
+            RuntException: If the runtime database cannot be read.
+        """
+        return self._client.get_many(self.glob(pattern), max_age=max_age)
+
+    def _scan(self, path, now):
+        """
+        Enumerates the subtree under a path without holding the lock.
+
+        Returns:
+            :class:`._Node`: Root node of the subtree.
+        """
+        root = _Node(now)
+        pending = [(path, root)]
+        while pending:
+            node_path, node = pending.pop()
+            self._ipc_calls += 1
+            children = self._client.keys(node_path, max_age=0)
+            base = node_path + "." if node_path else ""
+            for name in children:
+                child = _Node(now)
+                node.children[name] = child
+                pending.append((base + name, child))
+        return root
+
+    def _is_value(self, path):
+        """
+        Returns whether a path without children holds a value.
+        """
+        return self._client.get(path, max_age=0) is not None
+
+    def _find(self, path):
+        """
+        Returns the node of a path, `None` if it is not indexed. Must be
+        called with the lock held.
+        """
+        node = self._root
+        if path:
+            for part in path.split("."):
+                node = node.children.get(part)
+                if node is None:
+                    return None
+        return node
+
+    def _collect(self, node, path, result):
+        """
+        Adds the paths of the values under a node to a list.
+        """
+        pending = [(path, node)]
+        while pending:
+            node_path, node = pending.pop()
+            if not node.children:
+                if node_path:
+                    result.append(node_path)
+                continue
+            base = node_path + "." if node_path else ""
+            pending.extend((base + name, child)
+                           for name, child in reversed(list(node.children.items())))
+
+    def _match(self, node, path, parts, index, result, seen):
+        """
+        Adds the paths under a node matching the pattern segments from the
+        given index to a list.
+        """
+        if index == len(parts):
+            if not node.children and path and path not in seen:
+                seen.add(path)
+                result.append(path)
+            return
+        part = parts[index]
+        base = path + "." if path else ""
+        if part is None:
+            # '**' matches zero segments or one more segment.
+            self._match(node, path, parts, index + 1, result, seen)
+            for name, child in node.children.items():
+                self._match(child, base + name, parts, index, result, seen)
+            return
+        if isinstance(part, str):
+            child = node.children.get(part)
+            if child is not None:
+                self._match(child, base + part, parts, index + 1, result, seen)
+            return
+        for name, child in node.children.items():
+            if part.match(name):
+                self._match(child, base + name, parts, index + 1, result, seen)
+
+    @staticmethod
+    def _compile(part):
+        """
+        Returns a pattern segment as a string if it has no wildcards, or as a
+        compiled regular expression otherwise.
+        """
+        if not any(char in part for char in "*?["):
+            return part
+        return re.compile(fnmatch.translate(part))
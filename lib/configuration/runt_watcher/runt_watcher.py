@@ -0,0 +1,271 @@
+# Copyright (c) 2026, Digi International, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Notification of changes in the runtime database.
+
+A single background thread reads all the watched paths in one batched pass
+per polling interval and calls the registered callbacks only for the values
+that changed since the previous pass.
+"""
+
+import itertools
+import logging
+import time
+from threading import Event, Lock, Thread
+
+from runt_client import RuntClient
+
+log = logging.getLogger(__name__)
+
+
+class _Watch:
+    """
+    Registration of a callback on a path or path prefix.
+    """
+
+    __slots__ = ("path", "callback", "prefix", "initial", "notified")
+
+    def __init__(self, path, callback, prefix, initial):
+        self.path = path
+        self.callback = callback
+        self.prefix = prefix
+        self.initial = initial
+        self.notified = False
+
+    def matches(self, path):
+        if not self.prefix:
+            return path == self.path
+        return not self.path or path == self.path or path.startswith(self.path + ".")
+
+
+class RuntWatcher:
+    """
+    Class that polls paths of the runtime database and notifies their
+    changes.
+
+    Callbacks receive the path, its previous value and its new value
+    (`None` if the path is not populated). They are called from the polling
+    thread, so they should return quickly.
+    """
+
+    def __init__(self, client=None, interval=1.0, rescan_interval=30.0):
+        """
+        Class constructor. Instantiates a new :class:`.RuntWatcher`.
+
+        Args:
+            client (:class:`runt_client.RuntClient`, optional, default=`None`):
+                Client used to read the runtime database. A new one is
+                created if not provided.
+            interval (Float, optional, default=1.0): Seconds between polling
+                passes.
+            rescan_interval (Float, optional, default=30.0): Seconds between
+                enumerations of the keys under the watched prefixes, to find
+                keys added or removed.
+        """
+        self._client = client or RuntClient()
+        self._interval = interval
+        self._rescan_interval = rescan_interval
+        self._watches = {}
+        self._ids = itertools.count(1)
+        self._lock = Lock()
+        self._paths = None
+        self._next_rescan = 0
+        self._snapshot = {}
+        self._stop_event = Event()
+        self._thread = None
+
+    def watch(self, path, callback, prefix=False, initial=False):
+        """
+        Registers a callback to be called when a value changes.
+
+        Args:
+            path (String): Path of the value, or prefix of the values if
+                `prefix` is `True`.
+            callback (Function): Function called with the path, the old value
+                and the new value of every change.
+            prefix (Boolean, optional, default=`False`): `True` to watch all
+                the values under the path.
+            initial (Boolean, optional, default=`False`): `True` to also call
+                the callback with the values read in the first pass after the
+                registration, with `None` as old value.
+
+        Returns:
+            Integer: Identifier of the registration, to be used with
+                :meth:`.unwatch`.
+        """
+        with self._lock:
+            watch_id = next(self._ids)
+            self._watches[watch_id] = _Watch(path, callback, prefix, initial)
+            self._paths = None
+        return watch_id
+
+    def unwatch(self, watch_id):
+        """
+        Removes a callback registration.
+
+        Args:
+            watch_id (Integer): Identifier returned by :meth:`.watch`.
+
+        Returns:
+            Boolean: `True` if the registration existed, `False` otherwise.
+        """
+        with self._lock:
+            if self._watches.pop(watch_id, None) is None:
+                return False
+            self._paths = None
+            return True
+
+    def get(self, path):
+        """
+        Returns the value of a watched path read in the last pass.
+
+        Args:
+            path (String): The path.
+
+        Returns:
+            String: The value, `None` if the path is not populated or not
+                watched.
+        """
+        with self._lock:
+            return self._snapshot.get(path)
+
+    def start(self):
+        """
+        Starts the polling thread.
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = Thread(target=self._run, name="RuntWatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """
+        Stops the polling thread.
+
+        Args:
+            timeout (Float, optional, default=`None`): Maximum seconds to wait
+                for the thread to finish.
+        """
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def poll(self):
+        """
+        Reads all the watched paths and calls the callbacks of the values that
+        changed. It is called periodically by the polling thread, but can be
+        called directly to drive the watcher without the thread.
+
+        Raises:
+            RuntException: If the runtime database cannot be read.
+        """
+        with self._lock:
+            watches = list(self._watches.values())
+            paths = self._paths
+            rescan = paths is None or time.monotonic() >= self._next_rescan
+        if rescan:
+            paths = self._expand(watches)
+
+        values = self._client.get_many(paths, max_age=0)
+
+        with self._lock:
+            if rescan:
+                self._paths = paths
+                self._next_rescan = time.monotonic() + self._rescan_interval
+            old_snapshot = self._snapshot
+            self._snapshot = values
+            changes = [(path, old_snapshot.get(path), value)
+                       for path, value in values.items()
+                       if old_snapshot.get(path) != value]
+            # Values that were removed under a watched prefix.
+            changes.extend((path, old_value, None)
+                           for path, old_value in old_snapshot.items()
+                           if path not in values and old_value is not None)
+
+        for watch in watches:
+            if not watch.notified:
+                watch.notified = True
+                if watch.initial:
+                    for path, value in values.items():
+                        if watch.matches(path) and value is not None:
+                            self._notify(watch, path, None, value)
+                continue
+            for path, old_value, new_value in changes:
+                if watch.matches(path):
+                    self._notify(watch, path, old_value, new_value)
+
+    def _expand(self, watches):
+        """
+        Returns the list of paths to read for the given registrations,
+        enumerating the keys under the watched prefixes.
+        """
+        paths = []
+        seen = set()
+        for watch in watches:
+            if watch.prefix:
+                found = self._leaves(watch.path)
+            else:
+                found = [watch.path]
+            for path in found:
+                if path not in seen:
+                    seen.add(path)
+                    paths.append(path)
+        return paths
+
+    def _leaves(self, prefix):
+        """
+        Returns the paths of the values under a prefix.
+        """
+        leaves = []
+        pending = [prefix]
+        while pending:
+            path = pending.pop()
+            children = self._client.keys(path, max_age=0)
+            if not children:
+                if path:
+                    leaves.append(path)
+                continue
+            base = path + "." if path else ""
+            pending.extend(base + child for child in reversed(children))
+        return leaves
+
+    def _notify(self, watch, path, old_value, new_value):
+        """
+        Calls the callback of a registration, logging its errors.
+        """
+        try:
+            watch.callback(path, old_value, new_value)
+        except Exception as exc:
+            log.error("Error in runt watch callback for '%s': %s", path, exc)
+
+    def _run(self):
+        """
+        Main loop of the polling thread.
+        """
+        while not self._stop_event.is_set():
+            try:
+                self.poll()
+            except Exception as exc:
+                log.error("Could not poll runtime database: %s", exc)
+            if self._stop_event.wait(self._interval):
+                return
@@ -0,0 +1,353 @@
+# Copyright (c) 2026, Digi International, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Persistent mailbox of messages for sleeping XBee nodes.
+
+Messages for a node are stored in a file per node until the node notifies
+that it is awake, and then all of them are sent back-to-back. Messages can
+expire, and a new message can replace a pending one of the same kind for the
+same node.
+"""
+
+import base64
+import json
+import logging
+import os
+import re
+import time
+from threading import Lock
+
+log = logging.getLogger(__name__)
+
+DEFAULT_AWAKE_MESSAGE = b"AWAKE"
+
+_FILE_SUFFIX = ".mbx"
+_INVALID_CHARS = re.compile(r"[^0-9A-Za-z_.-]")
+
+
+class _Message:
+    """
+    Message waiting in a mailbox.
+    """
+
+    __slots__ = ("data", "key", "expires", "created")
+
+    def __init__(self, data, key=None, expires=None, created=None):
+        self.data = data
+        self.key = key
+        self.expires = expires
+        self.created = time.time() if created is None else created
+
+    def to_dict(self):
+        return {"data": base64.b64encode(self.data).decode(), "key": self.key,
+                "expires": self.expires, "created": self.created}
+
+    @classmethod
+    def from_dict(cls, values):
+        return cls(base64.b64decode(values["data"]), values.get("key"),
+                   values.get("expires"), values.get("created"))
+
+
+class XBeeMailbox:
+    """
+    Class that keeps per-node queues of messages on disk and delivers them
+    when the nodes wake up.
+
+    Messages are kept in memory and written to a file per node every time a
+    queue changes, so they survive restarts of the application.
+    """
+
+    def __init__(self, path, default_ttl=None, max_messages=64,
+                 awake_message=DEFAULT_AWAKE_MESSAGE):
+        """
+        Class constructor. Instantiates a new :class:`.XBeeMailbox` and loads
+        the messages stored in its directory.
+
+        Args:
+            path (String): Directory of the mailbox files. It is created if it
+                does not exist.
+            default_ttl (Float, optional, default=`None`): Seconds a message
+                waits before expiring. `None` for no expiration.
+            max_messages (Integer, optional, default=64): Maximum number of
+                pending messages per node. The oldest ones are discarded
+                first.
+            awake_message (Bytes, optional, default=b"AWAKE"): Data sent by
+                the nodes when they wake up.
+        """
+        self._path = path
+        self._default_ttl = default_ttl
+        self._max_messages = max_messages
+        self._awake_message = awake_message
+        self._queues = {}
+        self._flushing = set()
+        self._lock = Lock()
+        self._device = None
+        self._stats = {"queued": 0, "coalesced": 0, "expired": 0, "sent": 0, "failed": 0}
+        os.makedirs(path, exist_ok=True)
+        self._load()
+
+    @property
+    def stats(self):
+        """
+        Returns the counters of the mailbox.
+
+        Returns:
+            Dictionary: Number of messages `queued`, replaced by a newer one
+                (`coalesced`), `expired`, `sent` and whose sending `failed`.
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def nodes(self):
+        """
+        Returns the nodes with pending messages.
+
+        Returns:
+            List: 64-bit addresses of the nodes.
+        """
+        with self._lock:
+            return [address for address, messages in self._queues.items() if messages]
+
+    def pending(self, address):
+        """
+        Returns the pending messages of a node, excluding the expired ones.
+
+        Args:
+            address (String): 64-bit address of the node.
+
+        Returns:
+            List: Data of the pending messages, oldest first.
+        """
+        now = time.time()
+        with self._lock:
+            return [message.data for message in self._queues.get(self._normalize(address), ())
+                    if message.expires is None or message.expires > now]
+
+    def put(self, address, data, key=None, ttl=None):
+        """
+        Queues a message for a node.
+
+        Args:
+            address (String): 64-bit address of the node.
+            data (String or Bytes): Data of the message.
+            key (String, optional, default=`None`): Kind of the message. A
+                pending message of the node with the same key is replaced by
+                this one, so only the last command of a kind is delivered.
+            ttl (Float, optional, default=`None`): Seconds the message waits
+                before expiring. `None` for the default of the mailbox.
+        """
+        if isinstance(data, str):
+            data = data.encode()
+        ttl = self._default_ttl if ttl is None else ttl
+        message = _Message(bytes(data), key, time.time() + ttl if ttl is not None else None)
+        address = self._normalize(address)
+        with self._lock:
+            messages = self._queues.setdefault(address, [])
+            if key is not None:
+                remaining = [old for old in messages if old.key != key]
+                self._stats["coalesced"] += len(messages) - len(remaining)
+                messages[:] = remaining
+            messages.append(message)
+            if len(messages) > self._max_messages:
+                log.warning("Mailbox of %s full, discarding oldest message", address)
+                del messages[:len(messages) - self._max_messages]
+            self._stats["queued"] += 1
+            self._save(address)
+
+    def discard(self, address):
+        """
+        Removes all the pending messages of a node.
+
+        Args:
+            address (String): 64-bit address of the node.
+        """
+        address = self._normalize(address)
+        with self._lock:
+            if self._queues.pop(address, None) is not None:
+                self._save(address)
+
+    def purge_expired(self):
+        """
+        Removes the expired messages of all the nodes.
+
+        Returns:
+            Integer: Number of removed messages.
+        """
+        now = time.time()
+        removed = 0
+        with self._lock:
+            for address, messages in list(self._queues.items()):
+                valid = [message for message in messages
+                         if message.expires is None or message.expires > now]
+                if len(valid) != len(messages):
+                    removed += len(messages) - len(valid)
+                    messages[:] = valid
+                    self._save(address)
+            self._stats["expired"] += removed
+        return removed
+
+    def flush(self, remote_device, send_function=None):
+        """
+        Sends all the pending messages of a node back-to-back without waiting
+        for acknowledgements, and removes them from the mailbox. Expired
+        messages are discarded. Messages stay in the mailbox, and in the file
+        of the node, until they are sent, so messages queued during the flush
+        are saved with them and can still replace them.
+
+        Args:
+            remote_device (:class:`digi.xbee.devices.RemoteXBeeDevice`): The
+                node.
+            send_function (Function, optional, default=`None`): Function that
+                receives the remote device and the data and sends it. Defaults
+                to the `send_data_async` method of the attached device.
+
+        Returns:
+            Integer: Number of messages sent.
+
+        Raises:
+            ValueError: If there is no send function nor attached device.
+        """
+        if send_function is None:
+            if self._device is None:
+                raise ValueError("No device attached to send the messages")
+            send_function = self._device.send_data_async
+        address = self._normalize(str(remote_device.get_64bit_addr()))
+
+        with self._lock:
+            if address in self._flushing:
+                return 0
+            messages = list(self._queues.get(address, ()))
+            if not messages:
+                return 0
+            self._flushing.add(address)
+
+        now = time.time()
+        sent = 0
+        expired = 0
+        failed = False
+        done = set()
+        try:
+            for message in messages:
+                with self._lock:
+                    # Skip the messages replaced or discarded during the flush.
+                    queued = any(old is message for old in self._queues.get(address, ()))
+                if not queued:
+                    continue
+                if message.expires is not None and message.expires <= now:
+                    expired += 1
+                else:
+                    try:
+                        send_function(remote_device, message.data)
+                    except Exception as exc:
+                        log.error("Could not send message to %s: %s", address, exc)
+                        # Keep this and the following messages for the next
+                        # wake up.
+                        failed = True
+                        break
+                    sent += 1
+                done.add(id(message))
+        finally:
+            with self._lock:
+                self._flushing.discard(address)
+                # Messages replaced or queued during the flush are already in
+                # the queue, so only the sent and expired ones are removed.
+                queue = self._queues.get(address)
+                if queue is not None:
+                    queue[:] = [message for message in queue if id(message) not in done]
+                self._stats["sent"] += sent
+                self._stats["expired"] += expired
+                self._stats["failed"] += 1 if failed else 0
+                self._save(address)
+        return sent
+
+    def attach(self, device):
+        """
+        Registers a data received callback in the local XBee device that
+        flushes the mailbox of a node when it sends the awake message.
+
+        Args:
+            device (:class:`digi.xbee.devices.XBeeDevice`): The local XBee
+                device.
+        """
+        self._device = device
+        device.add_data_received_callback(self._data_received)
+
+    def detach(self):
+        """
+        Removes the data received callback from the attached XBee device.
+        """
+        if self._device is not None:
+            self._device.del_data_received_callback(self._data_received)
+            self._device = None
+
+    def _data_received(self, message):
+        """
+        Data received callback that flushes the mailbox of awake nodes.
+        """
+        if bytes(message.data) == self._awake_message:
+            self.flush(message.remote_device)
+
+    def _load(self):
+        """
+        Loads the messages stored in the mailbox directory.
+        """
+        for name in os.listdir(self._path):
+            if not name.endswith(_FILE_SUFFIX):
+                continue
+            try:
+                with open(os.path.join(self._path, name)) as mailbox_file:
+                    content = json.load(mailbox_file)
+                self._queues[content["address"]] = [_Message.from_dict(values)
+                                                    for values in content["messages"]]
+            except (OSError, ValueError, KeyError) as exc:
+                log.error("Could not load mailbox file '%s': %s", name, exc)
+
+    def _save(self, address):
+        """
+        Writes the messages of a node to its file, or removes the file if
+        there are no messages. Must be called with the lock held.
+        """
+        file_path = os.path.join(self._path,
+                                 _INVALID_CHARS.sub("_", address) + _FILE_SUFFIX)
+        messages = self._queues.get(address)
+        try:
+            if not messages:
+                self._queues.pop(address, None)
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+                return
+            tmp_path = file_path + ".tmp"
+            with open(tmp_path, "w") as mailbox_file:
+                json.dump({"address": address,
+                           "messages": [message.to_dict() for message in messages]},
+                          mailbox_file)
+                mailbox_file.flush()
+                os.fsync(mailbox_file.fileno())
+            os.replace(tmp_path, file_path)
+        except OSError as exc:
+            log.error("Could not save mailbox of %s: %s", address, exc)
+
+    @staticmethod
+    def _normalize(address):
+        """
+        Returns the normalized form of a 64-bit address.
+        """
+        return str(address).upper()
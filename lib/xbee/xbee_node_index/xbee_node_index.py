@@ -0,0 +1,428 @@
+# Copyright (c) 2026, Digi International, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Persistent index of the nodes of an XBee network.
+
+The nodes found in the network are stored on disk and loaded in the network
+of the local XBee device at startup, so remote devices can be obtained
+without discovering the network again. Nodes are indexed by 64-bit address,
+16-bit address, node identifier and role.
+"""
+
+import json
+import logging
+import os
+import time
+from threading import Event, RLock, Thread
+
+from digi.xbee.devices import NetworkEventType, RemoteXBeeDevice
+from digi.xbee.models.address import XBee16BitAddress, XBee64BitAddress
+from digi.xbee.models.protocol import Role
+
+log = logging.getLogger(__name__)
+
+# 16-bit address of the nodes whose network address is unknown.
+_UNKNOWN_16BIT_ADDR = "FFFE"
+
+_FILE_VERSION = 1
+
+
+class NodeEntry:
+    """
+    Class that represents a node of the index.
+    """
+
+    __slots__ = ("x64bit_addr", "x16bit_addr", "node_id", "role", "last_seen", "device")
+
+    def __init__(self, x64bit_addr, x16bit_addr=None, node_id=None, role=None,
+                 last_seen=None, device=None):
+        """
+        Class constructor. Instantiates a new :class:`.NodeEntry`.
+
+        Args:
+            x64bit_addr (String): 64-bit address of the node.
+            x16bit_addr (String, optional, default=`None`): 16-bit address.
+            node_id (String, optional, default=`None`): Node identifier.
+            role (:class:`digi.xbee.models.protocol.Role`, optional,
+                default=`None`): Role of the node in the network.
+            last_seen (Float, optional, default=`None`): Time the node was
+                last added or updated in the network.
+            device (:class:`digi.xbee.devices.RemoteXBeeDevice`, optional,
+                default=`None`): Remote device of the node.
+        """
+        self.x64bit_addr = x64bit_addr
+        self.x16bit_addr = x16bit_addr
+        self.node_id = node_id
+        self.role = role if role is not None else Role.UNKNOWN
+        self.last_seen = last_seen
+        self.device = device
+
+    def __repr__(self):
+        return "NodeEntry(%s, %s, %r, %s)" % (self.x64bit_addr, self.x16bit_addr,
+                                              self.node_id, self.role.description)
+
+    def to_dict(self):
+        return {"x64": self.x64bit_addr, "x16": self.x16bit_addr, "node_id": self.node_id,
+                "role": self.role.code, "last_seen": self.last_seen}
+
+    @classmethod
+    def from_dict(cls, values):
+        return cls(values["x64"], values.get("x16"), values.get("node_id"),
+                   Role.get(values.get("role", Role.UNKNOWN.code)), values.get("last_seen"))
+
+
+class XBeeNodeIndex:
+    """
+    Class that keeps an index of the nodes of an XBee network, persisted in a
+    JSON file.
+
+    Once attached to the local XBee device, the index is updated with every
+    network modified event, so there is no need to scan the network to keep
+    it up to date. Changes are written to disk after a short delay, so a
+    discovery of many nodes results in a single write.
+    """
+
+    def __init__(self, file_path, save_delay=5.0):
+        """
+        Class constructor. Instantiates a new :class:`.XBeeNodeIndex` and loads
+        the nodes stored in the file, if it exists.
+
+        Args:
+            file_path (String): Path of the file of the index.
+            save_delay (Float, optional, default=5.0): Seconds to wait after a
+                change before writing the file. 0 to write it immediately.
+        """
+        self._file_path = file_path
+        self._save_delay = save_delay
+        self._lock = RLock()
+        self._by_64bit = {}
+        self._by_16bit = {}
+        self._by_node_id = {}
+        self._by_role = {}
+        self._network = None
+        self._dirty = False
+        self._save_event = Event()
+        self._save_thread = None
+        self.load()
+
+    def __len__(self):
+        return len(self._by_64bit)
+
+    def __contains__(self, x64bit_addr):
+        return self._normalize(x64bit_addr) in self._by_64bit
+
+    def nodes(self):
+        """
+        Returns all the nodes of the index.
+
+        Returns:
+            List: The :class:`.NodeEntry` objects.
+        """
+        with self._lock:
+            return list(self._by_64bit.values())
+
+    def get_by_64bit_addr(self, x64bit_addr):
+        """
+        Returns the node with a 64-bit address.
+
+        Args:
+            x64bit_addr (String or :class:`XBee64BitAddress`): The address.
+
+        Returns:
+            :class:`.NodeEntry`: The node, `None` if it is not in the index.
+        """
+        return self._by_64bit.get(self._normalize(x64bit_addr))
+
+    def get_by_16bit_addr(self, x16bit_addr):
+        """
+        Returns the node with a 16-bit address.
+
+        Args:
+            x16bit_addr (String or :class:`XBee16BitAddress`): The address.
+
+        Returns:
+            :class:`.NodeEntry`: The node, `None` if it is not in the index.
+        """
+        return self._by_16bit.get(self._normalize(x16bit_addr))
+
+    def get_by_node_id(self, node_id):
+        """
+        Returns the node with a node identifier.
+
+        Args:
+            node_id (String): The node identifier.
+
+        Returns:
+            :class:`.NodeEntry`: The node, `None` if it is not in the index.
+        """
+        return self._by_node_id.get(node_id)
+
+    def get_by_role(self, role):
+        """
+        Returns the nodes with a role.
+
+        Args:
+            role (:class:`digi.xbee.models.protocol.Role`): The role.
+
+        Returns:
+            List: The :class:`.NodeEntry` objects.
+        """
+        with self._lock:
+            return list(self._by_role.get(role, {}).values())
+
+    def get_device(self, node_id):
+        """
+        Returns the remote device of a node identifier, without discovering
+        it in the network.
+
+        Args:
+            node_id (String): The node identifier.
+
+        Returns:
+            :class:`digi.xbee.devices.RemoteXBeeDevice`: The remote device,
+                `None` if the node is unknown or the index is not attached.
+        """
+        entry = self._by_node_id.get(node_id)
+        return entry.device if entry is not None else None
+
+    def attach(self, device):
+        """
+        Adds the nodes of the index to the network of the local XBee device
+        and starts updating the index with the network modified events.
+
+        Args:
+            device (:class:`digi.xbee.devices.XBeeDevice`): The local XBee
+                device. It must be open.
+        """
+        network = device.get_network()
+        with self._lock:
+            self._network = network
+            for entry in self._by_64bit.values():
+                remote = RemoteXBeeDevice(
+                    device,
+                    x64bit_addr=XBee64BitAddress.from_hex_string(entry.x64bit_addr),
+                    x16bit_addr=XBee16BitAddress.from_hex_string(entry.x16bit_addr)
+                    if entry.x16bit_addr else None,
+                    node_id=entry.node_id)
+                entry.device = network.add_remote(remote) or remote
+        network.add_network_modified_callback(self._network_modified)
+
+    def detach(self):
+        """
+        Stops updating the index and writes pending changes to disk.
+        """
+        with self._lock:
+            network = self._network
+            self._network = None
+            thread = self._save_thread
+        if network is not None:
+            network.del_network_modified_callback(self._network_modified)
+        self._save_event.set()
+        if thread is not None:
+            thread.join()
+        self.save()
+
+    def update(self, remote):
+        """
+        Adds or updates a node of the index from its remote device.
+
+        Args:
+            remote (:class:`digi.xbee.devices.RemoteXBeeDevice`): The remote
+                device of the node.
+        """
+        x64bit_addr = self._normalize(remote.get_64bit_addr())
+        x16bit_addr = remote.get_16bit_addr()
+        x16bit_addr = self._normalize(x16bit_addr) if x16bit_addr is not None else None
+        node_id = remote.get_node_id()
+        role = remote.get_role()
+        with self._lock:
+            entry = self._by_64bit.get(x64bit_addr)
+            if entry is None:
+                entry = NodeEntry(x64bit_addr)
+            else:
+                self._unindex(entry)
+            # Keep the known values if the event does not include them.
+            if x16bit_addr and x16bit_addr != _UNKNOWN_16BIT_ADDR:
+                entry.x16bit_addr = x16bit_addr
+            if node_id:
+                entry.node_id = node_id
+            if role is not None and role != Role.UNKNOWN:
+                entry.role = role
+            entry.last_seen = time.time()
+            entry.device = remote
+            self._index(entry)
+            self._changed()
+
+    def remove(self, x64bit_addr):
+        """
+        Removes a node from the index.
+
+        Args:
+            x64bit_addr (String or :class:`XBee64BitAddress`): 64-bit address
+                of the node.
+
+        Returns:
+            Boolean: `True` if the node was removed, `False` if it was not in
+                the index.
+        """
+        with self._lock:
+            entry = self._by_64bit.get(self._normalize(x64bit_addr))
+            if entry is None:
+                return False
+            self._unindex(entry)
+            self._changed()
+            return True
+
+    def clear(self):
+        """
+        Removes all the nodes from the index.
+        """
+        with self._lock:
+            self._by_64bit.clear()
+            self._by_16bit.clear()
+            self._by_node_id.clear()
+            self._by_role.clear()
+            self._changed()
+
+    def load(self):
+        """
+        Replaces the nodes of the index with the ones stored in the file.
+
+        Returns:
+            Integer: Number of nodes loaded.
+        """
+        try:
+            with open(self._file_path) as index_file:
+                content = json.load(index_file)
+            entries = [NodeEntry.from_dict(values) for values in content["nodes"]]
+        except FileNotFoundError:
+            return 0
+        except (OSError, ValueError, KeyError) as exc:
+            log.error("Could not load node index '%s': %s", self._file_path, exc)
+            return 0
+
+        with self._lock:
+            self._by_64bit.clear()
+            self._by_16bit.clear()
+            self._by_node_id.clear()
+            self._by_role.clear()
+            for entry in entries:
+                self._index(entry)
+            self._dirty = False
+        return len(entries)
+
+    def save(self):
+        """
+        Writes the nodes of the index to the file if they changed.
+
+        Returns:
+            Boolean: `True` if the file was written or there were no changes,
+                `False` if writing failed.
+        """
+        with self._lock:
+            if not self._dirty:
+                return True
+            content = {"version": _FILE_VERSION,
+                       "nodes": [entry.to_dict() for entry in self._by_64bit.values()]}
+            self._dirty = False
+
+        tmp_path = self._file_path + ".tmp"
+        try:
+            with open(tmp_path, "w") as index_file:
+                json.dump(content, index_file)
+            os.replace(tmp_path, self._file_path)
+            return True
+        except OSError as exc:
+            log.error("Could not save node index '%s': %s", self._file_path, exc)
+            with self._lock:
+                self._dirty = True
+            return False
+
+    def _network_modified(self, event_type, reason, node):
+        """
+        Network modified callback that updates the index.
+        """
+        if event_type == NetworkEventType.CLEAR:
+            # The network is cleared to start from scratch, keep the nodes
+            # of the index until they are found again.
+            return
+        if node is None:
+            return
+        if event_type == NetworkEventType.DEL:
+            self.remove(node.get_64bit_addr())
+        else:
+            self.update(node)
+
+    def _index(self, entry):
+        """
+        Adds a node to the indexes. Must be called with the lock held.
+        """
+        self._by_64bit[entry.x64bit_addr] = entry
+        if entry.x16bit_addr and entry.x16bit_addr != _UNKNOWN_16BIT_ADDR:
+            self._by_16bit[entry.x16bit_addr] = entry
+        if entry.node_id:
+            self._by_node_id[entry.node_id] = entry
+        self._by_role.setdefault(entry.role, {})[entry.x64bit_addr] = entry
+
+    def _unindex(self, entry):
+        """
+        Removes a node from the indexes. Must be called with the lock held.
+        """
+        self._by_64bit.pop(entry.x64bit_addr, None)
+        if self._by_16bit.get(entry.x16bit_addr) is entry:
+            del self._by_16bit[entry.x16bit_addr]
+        if self._by_node_id.get(entry.node_id) is entry:
+            del self._by_node_id[entry.node_id]
+        self._by_role.get(entry.role, {}).pop(entry.x64bit_addr, None)
+
+    def _changed(self):
+        """
+        Marks the index as modified and schedules writing it. Must be called
+        with the lock held.
+        """
+        self._dirty = True
+        if self._save_delay <= 0:
+            self.save()
+        elif self._save_thread is None:
+            self._save_event.clear()
+            self._save_thread = Thread(target=self._delayed_save, name="XBeeNodeIndex",
+                                       daemon=True)
+            self._save_thread.start()
+
+    def _delayed_save(self):
+        """
+        Writes the index after the save delay, until there are no more
+        changes.
+        """
+        while True:
+            self._save_event.wait(self._save_delay)
+            self.save()
+            with self._lock:
+                if not self._dirty or self._save_event.is_set():
+                    self._save_thread = None
+                    return
+
+    @staticmethod
+    def _normalize(address):
+        """
+        Returns the normalized form of an address.
+        """
+        return str(address).upper()
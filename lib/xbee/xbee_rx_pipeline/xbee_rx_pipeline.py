@@ -0,0 +1,442 @@
+# Copyright (c) 2026, Digi International, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Receive pipeline that decouples the XBee data callback from the processing
+of the received messages.
+
+The callback only copies the message into a bounded queue. Worker threads
+run the processing stages (parsing, enrichment...) and the resulting data
+points are uploaded in batches by a separate thread, so slow processing or
+uploads never block the reception of XBee frames.
+"""
+
+import logging
+import queue
+import time
+from enum import Enum
+from threading import Condition, Lock, Thread
+
+from digidevice import datapoint
+
+log = logging.getLogger(__name__)
+
+
+class OverflowPolicy(Enum):
+    """
+    This class lists the policies applied when the receive queue is full.
+    """
+    DROP_NEWEST = (0, "Drop the received message")
+    DROP_OLDEST = (1, "Drop the oldest queued message")
+    BLOCK = (2, "Block the callback until there is space or the timeout expires")
+
+    def __init__(self, code, desc):
+        self._code = code
+        self._desc = desc
+
+    @property
+    def code(self):
+        """
+        Returns the code of the `OverflowPolicy` element.
+
+        Returns:
+            Integer: Code of the `OverflowPolicy` element.
+        """
+        return self._code
+
+    @property
+    def desc(self):
+        """
+        Returns the description of the `OverflowPolicy` element.
+
+        Returns:
+            String: Description of the `OverflowPolicy` element.
+        """
+        return self._desc
+
+    @classmethod
+    def get(cls, code):
+        """
+        Returns the overflow policy for the given code.
+
+        Args:
+            code (Integer): Code of the overflow policy to get.
+
+        Returns:
+            :class:`.OverflowPolicy`: Overflow policy with the given code,
+                `None` if not found.
+        """
+        for policy in cls:
+            if code == policy.code:
+                return policy
+        return None
+
+
+class RxMessage:
+    """
+    Class that holds a copy of the fields of a received XBee message, so it
+    does not keep references to the objects of the XBee library.
+    """
+
+    __slots__ = ("address", "data", "is_broadcast", "timestamp")
+
+    def __init__(self, address, data, is_broadcast=False, timestamp=None):
+        """
+        Class constructor. Instantiates a new :class:`.RxMessage`.
+
+        Args:
+            address (String): 64-bit address of the sender.
+            data (Bytes): Received data.
+            is_broadcast (Boolean, optional, default=`False`): `True` if the
+                message was broadcast.
+            timestamp (Float, optional, default=`None`): Reception time.
+                Current time if not provided.
+        """
+        self.address = address
+        self.data = data
+        self.is_broadcast = is_broadcast
+        self.timestamp = time.time() if timestamp is None else timestamp
+
+    @classmethod
+    def from_xbee_message(cls, message):
+        """
+        Returns the copy of an XBee message.
+
+        Args:
+            message (:class:`digi.xbee.models.message.XBeeMessage`): The
+                received message.
+
+        Returns:
+            :class:`.RxMessage`: The copy.
+        """
+        return cls(str(message.remote_device.get_64bit_addr()), bytes(message.data),
+                   message.is_broadcast, getattr(message, "timestamp", None))
+
+
+class XBeeRxPipeline:
+    """
+    Class that receives XBee messages into a bounded queue and processes them
+    in worker threads.
+
+    Every message goes through the stages in order. A stage receives the
+    output of the previous one (the first one receives the
+    :class:`.RxMessage`), and returning `None` stops the processing of the
+    message. The last stage returns the data points to upload, which are
+    uploaded in batches.
+    """
+
+    def __init__(self, stages, workers=1, max_queue=1000,
+                 policy=OverflowPolicy.DROP_OLDEST, block_timeout=0.1,
+                 batch_size=100, max_delay=5.0, max_pending=5000, upload_timeout=None,
+                 upload_function=None):
+        """
+        Class constructor. Instantiates a new :class:`.XBeeRxPipeline`.
+
+        Args:
+            stages (List): Functions that process the messages.
+            workers (Integer, optional, default=1): Number of worker threads
+                running the stages.
+            max_queue (Integer, optional, default=1000): Maximum number of
+                received messages waiting to be processed.
+            policy (:class:`.OverflowPolicy`, optional, default=`DROP_OLDEST`):
+                What to do when the queue is full.
+            block_timeout (Float, optional, default=0.1): Maximum seconds the
+                callback waits for space with the `BLOCK` policy before
+                dropping the message.
+            batch_size (Integer, optional, default=100): Maximum number of
+                data points per upload.
+            max_delay (Float, optional, default=5.0): Maximum seconds a data
+                point waits to be uploaded.
+            max_pending (Integer, optional, default=5000): Maximum number of
+                data points waiting to be uploaded, including the ones of
+                failed uploads. The oldest ones are dropped first.
+            upload_timeout (Float, optional, default=`None`): Timeout in
+                seconds of each upload request.
+            upload_function (Function, optional, default=`None`): Function
+                that receives a list of data points and a `timeout` keyword
+                argument and uploads them. Defaults to
+                `datapoint.upload_multiple`.
+
+        Raises:
+            ValueError: If there are no stages or workers.
+        """
+        if not stages or workers < 1:
+            raise ValueError("At least one stage and one worker are required")
+        self._stages = tuple(stages)
+        self._num_workers = workers
+        self._policy = policy
+        self._block_timeout = block_timeout
+        self._batch_size = batch_size
+        self._max_delay = max_delay
+        self._max_pending = max_pending
+        self._upload_timeout = upload_timeout
+        self._upload_function = upload_function or datapoint.upload_multiple
+
+        self._queue = queue.Queue(max_queue)
+        self._pending = []
+        self._oldest_pending = None
+        self._retry_time = 0
+        self._upload_cond = Condition()
+        self._metrics_lock = Lock()
+        self._metrics = {"received": 0, "dropped": 0, "processed": 0, "failed": 0,
+                         "uploaded": 0, "upload_errors": 0, "discarded_points": 0,
+                         "max_queue_depth": 0}
+        self._threads = []
+        self._running = False
+        # The upload thread stops after the workers, to upload their results.
+        self._uploading = False
+        self._device = None
+
+    @property
+    def queue_depth(self):
+        """
+        Returns the number of messages waiting to be processed.
+
+        Returns:
+            Integer: Number of queued messages.
+        """
+        return self._queue.qsize()
+
+    @property
+    def metrics(self):
+        """
+        Returns the counters of the pipeline.
+
+        Returns:
+            Dictionary: Number of messages `received`, `dropped` because the
+                queue was full, `processed` and `failed` (a stage raised an
+                exception), data points `uploaded`, failed uploads
+                (`upload_errors`), data points discarded because too many
+                were pending (`discarded_points`), the current `queue_depth`,
+                the `max_queue_depth` and the data points `pending_upload`.
+        """
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+        metrics["queue_depth"] = self._queue.qsize()
+        with self._upload_cond:
+            metrics["pending_upload"] = len(self._pending)
+        return metrics
+
+    def attach(self, device):
+        """
+        Starts the pipeline and registers it as data received callback of an
+        XBee device.
+
+        Args:
+            device (:class:`digi.xbee.devices.XBeeDevice`): The local XBee
+                device.
+        """
+        self.start()
+        self._device = device
+        device.add_data_received_callback(self.on_message)
+
+    def detach(self):
+        """
+        Removes the data received callback from the attached XBee device.
+        """
+        if self._device is not None:
+            self._device.del_data_received_callback(self.on_message)
+            self._device = None
+
+    def start(self):
+        """
+        Starts the worker and upload threads.
+        """
+        if self._running:
+            return
+        self._running = True
+        self._uploading = True
+        self._threads = [Thread(target=self._work, name="XBeeRxWorker-%d" % index, daemon=True)
+                         for index in range(self._num_workers)]
+        self._threads.append(Thread(target=self._upload, name="XBeeRxUpload", daemon=True))
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout=None):
+        """
+        Detaches the pipeline, processes the queued messages, uploads the
+        pending data points and stops the threads.
+
+        Args:
+            timeout (Float, optional, default=`None`): Maximum seconds to wait
+                for every thread to finish.
+        """
+        self.detach()
+        if not self._running:
+            return
+        self._running = False
+        workers, uploader = self._threads[:-1], self._threads[-1]
+        for _worker in workers:
+            self._queue.put(None)
+        for worker in workers:
+            worker.join(timeout)
+        with self._upload_cond:
+            self._uploading = False
+            self._upload_cond.notify_all()
+        uploader.join(timeout)
+        self._threads = []
+
+    def on_message(self, message):
+        """
+        Data received callback. Copies the message into the queue applying
+        the overflow policy.
+
+        Args:
+            message (:class:`digi.xbee.models.message.XBeeMessage`): The
+                received message.
+        """
+        self.put(RxMessage.from_xbee_message(message))
+
+    def put(self, message):
+        """
+        Adds a message to the queue applying the overflow policy.
+
+        Args:
+            message (:class:`.RxMessage`): The message.
+
+        Returns:
+            Boolean: `True` if the message was queued, `False` if it was
+                dropped.
+        """
+        queued = True
+        dropped = 0
+        try:
+            if self._policy == OverflowPolicy.BLOCK:
+                self._queue.put(message, timeout=self._block_timeout)
+            else:
+                self._queue.put_nowait(message)
+        except queue.Full:
+            if self._policy == OverflowPolicy.DROP_OLDEST:
+                while True:
+                    try:
+                        self._queue.get_nowait()
+                        dropped += 1
+                    except queue.Empty:
+                        pass
+                    try:
+                        self._queue.put_nowait(message)
+                        break
+                    except queue.Full:
+                        continue
+            else:
+                queued = False
+                dropped = 1
+        depth = self._queue.qsize()
+        with self._metrics_lock:
+            self._metrics["received"] += 1
+            self._metrics["dropped"] += dropped
+            if depth > self._metrics["max_queue_depth"]:
+                self._metrics["max_queue_depth"] = depth
+        return queued
+
+    def _work(self):
+        """
+        Main loop of the worker threads.
+        """
+        while True:
+            message = self._queue.get()
+            if message is None:
+                return
+            item = message
+            data_points = None
+            failed = False
+            try:
+                for stage in self._stages:
+                    item = stage(item)
+                    if item is None:
+                        break
+                # Stages may return any iterable, including generators that
+                # fail while they are consumed.
+                if item:
+                    data_points = list(item)
+            except Exception as exc:
+                log.error("Error processing message from %s: %s", message.address, exc)
+                failed = True
+                data_points = None
+            with self._metrics_lock:
+                self._metrics["failed" if failed else "processed"] += 1
+            if data_points:
+                self._add_pending(data_points)
+
+    def _add_pending(self, data_points):
+        """
+        Adds data points to the upload batch.
+        """
+        with self._upload_cond:
+            if not self._pending:
+                self._oldest_pending = time.monotonic()
+            self._pending.extend(data_points)
+            overflow = len(self._pending) - self._max_pending
+            if overflow > 0:
+                del self._pending[:overflow]
+                with self._metrics_lock:
+                    self._metrics["discarded_points"] += overflow
+            if len(self._pending) >= self._batch_size:
+                self._upload_cond.notify()
+
+    def _upload(self):
+        """
+        Main loop of the upload thread.
+        """
+        while True:
+            with self._upload_cond:
+                while self._uploading:
+                    # Wait before retrying after a failed upload.
+                    backoff = self._retry_time - time.monotonic()
+                    if backoff > 0:
+                        self._upload_cond.wait(backoff)
+                        continue
+                    if len(self._pending) >= self._batch_size:
+                        break
+                    if self._pending:
+                        remaining = self._oldest_pending + self._max_delay - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._upload_cond.wait(remaining)
+                    else:
+                        self._upload_cond.wait()
+                if not self._pending:
+                    if not self._uploading:
+                        return
+                    continue
+                batch = self._pending[:self._batch_size]
+                del self._pending[:self._batch_size]
+                self._oldest_pending = time.monotonic() if self._pending else None
+
+            try:
+                self._upload_function(batch, timeout=self._upload_timeout)
+                with self._metrics_lock:
+                    self._metrics["uploaded"] += len(batch)
+            except Exception as exc:
+                log.error("Could not upload %d data points: %s", len(batch), exc)
+                with self._metrics_lock:
+                    self._metrics["upload_errors"] += 1
+                if not self._uploading:
+                    return
+                # Put them back to retry with the next batch.
+                with self._upload_cond:
+                    self._pending[:0] = batch
+                    self._oldest_pending = time.monotonic()
+                    self._retry_time = self._oldest_pending + self._max_delay
+                    overflow = len(self._pending) - self._max_pending
+                    if overflow > 0:
+                        del self._pending[:overflow]
+                        with self._metrics_lock:
+                            self._metrics["discarded_points"] += overflow
@@ -36,6 +36,8 @@ from digi.xbee.util import utils
 from digidevice import config, datapoint, device_request, runt, xbee
 from digidevice.datapoint import DataType
 
+import firmware_caps
+
 # Constants.
 DRM_TARGET_SET_AUTO_IRRIGATION = "set_auto_irrigation"
 DRM_TARGET_SET_TANK_VALVE = "set_tank_valve"
@@ -159,11 +161,6 @@ XBEE_TEXT_PROPERTIES = [
 
 DATA_SEPARATOR = "@@"
 
-PROP_FW_VERSION = "firmware.version"
-
-OLD_FW_YEAR = 21
-OLD_FW_MONTH = 8
-
 # Variables.
 device = None
 
@@ -833,7 +830,7 @@ def upload_configurations_drm(configurations, sender=None):
             from the solar controller.
     """
     # Check if multiple data point upload can be used
-    if is_old_firmware():
+    if not firmware_caps.supports_upload_multiple():
         for config in configurations:
             conf_id = config[0]
             conf_value = config[1]
@@ -858,12 +855,12 @@ def upload_configurations_drm(configurations, sender=None):
             # Create and store the data point.
             data_points.append(DataPoint(data_stream, conf_value, data_type=DataType.DOUBLE))
 
-            # Upload the data points all at once.
-            try:
-                with datapoint_lock:
-                    datapoint.upload_multiple(data_points)
-            except Exception as e:
-                print_error("Could not upload datapoints: {}".format(str(e)))
+        # Upload the data points all at once.
+        try:
+            with datapoint_lock:
+                datapoint.upload_multiple(data_points)
+        except Exception as e:
+            print_error("Could not upload datapoints: {}".format(str(e)))
 
 
 def get_next_random(value, max_value, min_value, max_delta):
@@ -1131,29 +1128,6 @@ def time_task():
         time.sleep(1.0 - (time.time() - start_time))
 
 
-def is_old_firmware():
-    """
-    Returns whether the firmware running is an old version or not in
-    terms of data point upload capabilities.
-
-    Returns:
-        Boolean: ``True`` if the device firmware is old, ``False`` otherwise.
-    """
-    # Read firmware version from runt.
-    fw_version = get_runt(PROP_FW_VERSION)
-
-    # Compare firmware year and month with old versions.
-    year = int(fw_version.split(".")[0])
-    month = int(fw_version.split(".")[1])
-    if year < OLD_FW_YEAR:
-        return True
-    if year == OLD_FW_YEAR:
-        if month < OLD_FW_MONTH:
-            return True
-
-    return False
-
-
 def main():
     """
     Main execution of the application.
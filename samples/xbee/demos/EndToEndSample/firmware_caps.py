@@ -0,0 +1,251 @@
+# Copyright (c) 2026, Digi International, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Cached detection of the capabilities of the device firmware.
+
+The firmware version is read from the runtime database once per process, and
+the availability of features is answered from it without accessing runtd
+again.
+"""
+
+import logging
+import time
+from threading import Lock
+
+from digidevice import runt
+
+log = logging.getLogger(__name__)
+
+PROP_FW_VERSION = "firmware.version"
+
+FEATURE_UPLOAD_MULTIPLE = "upload_multiple"
+
+# Minimum firmware version (year, month) of every feature.
+_FEATURES = {
+    FEATURE_UPLOAD_MULTIPLE: (21, 8),
+}
+
+# Seconds to wait before reading the version again after a failure.
+_RETRY_INTERVAL = 60
+
+_lock = Lock()
+_capabilities = None
+_last_failure = None
+
+
+class FirmwareCapabilities:
+    """
+    Class that represents the firmware version of the device and the
+    features it supports.
+    """
+
+    def __init__(self, version):
+        """
+        Class constructor. Instantiates a new :class:`.FirmwareCapabilities`.
+
+        Args:
+            version (String): Firmware version, for example '22.5.50.62'.
+                `None` if unknown.
+        """
+        self._version = version
+        self._version_tuple = self._parse(version)
+        self._features = {name: self.is_at_least(*min_version)
+                          for name, min_version in _FEATURES.items()}
+
+    def __str__(self):
+        return str(self._version)
+
+    @property
+    def version(self):
+        """
+        Returns the firmware version.
+
+        Returns:
+            String: The firmware version, `None` if unknown.
+        """
+        return self._version
+
+    @property
+    def version_tuple(self):
+        """
+        Returns the numeric components of the firmware version.
+
+        Returns:
+            Tuple: The version numbers, empty if the version is unknown.
+        """
+        return self._version_tuple
+
+    @property
+    def supports_upload_multiple(self):
+        """
+        Returns whether `datapoint.upload_multiple()` is available.
+
+        Returns:
+            Boolean: `True` if it is available, `False` otherwise.
+        """
+        return self._features[FEATURE_UPLOAD_MULTIPLE]
+
+    def supports(self, feature):
+        """
+        Returns whether the firmware supports a feature.
+
+        Args:
+            feature (String): Name of the feature.
+
+        Returns:
+            Boolean: `True` if the feature is supported, `False` if it is not
+                or the feature is unknown.
+        """
+        supported = self._features.get(feature)
+        if supported is None and feature in _FEATURES:
+            supported = self.is_at_least(*_FEATURES[feature])
+            self._features[feature] = supported
+        return bool(supported)
+
+    def is_at_least(self, *version):
+        """
+        Returns whether the firmware version is equal or newer than the given
+        one.
+
+        Args:
+            *version (Integer): Components of the version to compare with,
+                for example `21, 8`.
+
+        Returns:
+            Boolean: `True` if the firmware is the same or newer, `False` if it
+                is older or its version is unknown.
+        """
+        if not self._version_tuple:
+            return False
+        return self._version_tuple[:len(version)] >= tuple(version)
+
+    @staticmethod
+    def _parse(version):
+        """
+        Returns the numeric components of a version string.
+
+        Args:
+            version (String): The version string.
+
+        Returns:
+            Tuple: The version numbers, empty if it cannot be parsed.
+        """
+        if not version:
+            return ()
+        numbers = []
+        for part in str(version).strip().split("."):
+            digits = ""
+            for char in part:
+                if not char.isdigit():
+                    break
+                digits += char
+            if not digits:
+                break
+            numbers.append(int(digits))
+        return tuple(numbers)
+
+
+def register_feature(name, *min_version):
+    """
+    Registers a feature and the minimum firmware version that supports it.
+
+    Args:
+        name (String): Name of the feature.
+        *min_version (Integer): Components of the minimum firmware version,
+            for example `22, 2`.
+
+    Raises:
+        ValueError: If no version is provided.
+    """
+    if not min_version:
+        raise ValueError("Minimum version is required")
+    _FEATURES[name] = tuple(min_version)
+
+
+def get_capabilities(refresh=False):
+    """
+    Returns the capabilities of the device firmware. The runtime database is
+    only accessed the first time or when a refresh is requested.
+
+    If the version cannot be read, capabilities with an unknown version (no
+    feature supported) are returned and the read is retried after a minute.
+
+    Args:
+        refresh (Boolean, optional, default=`False`): `True` to read the
+            firmware version again.
+
+    Returns:
+        :class:`.FirmwareCapabilities`: The firmware capabilities.
+    """
+    global _capabilities, _last_failure
+
+    caps = _capabilities
+    if caps is not None and not refresh:
+        return caps
+
+    with _lock:
+        if _capabilities is not None and not refresh:
+            return _capabilities
+        if not refresh and _last_failure is not None \
+                and time.monotonic() - _last_failure < _RETRY_INTERVAL:
+            return FirmwareCapabilities(None)
+
+        try:
+            runt.start()
+            try:
+                version = runt.get(PROP_FW_VERSION)
+            finally:
+                runt.stop()
+        except Exception as exc:
+            log.error("Could not read firmware version: %s", exc)
+            version = None
+
+        caps = FirmwareCapabilities(version)
+        if caps.version_tuple:
+            _capabilities = caps
+            _last_failure = None
+        else:
+            _last_failure = time.monotonic()
+        return caps
+
+
+def supports(feature):
+    """
+    Returns whether the device firmware supports a feature.
+
+    Args:
+        feature (String): Name of the feature.
+
+    Returns:
+        Boolean: `True` if the feature is supported, `False` otherwise.
+    """
+    return get_capabilities().supports(feature)
+
+
+def supports_upload_multiple():
+    """
+    Returns whether `datapoint.upload_multiple()` is available in the device
+    firmware.
+
+    Returns:
+        Boolean: `True` if it is available, `False` otherwise.
+    """
+    return get_capabilities().supports_upload_multiple
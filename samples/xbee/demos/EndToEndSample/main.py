@@ -19,9 +19,11 @@
 # SOFTWARE.
 
 from collections import defaultdict
-from digidevice import datapoint, device_request, runt, xbee
+from digidevice import datapoint, device_request, xbee
 from digidevice.datapoint import DataType
 
+import firmware_caps
+
 MSG_SEPARATOR = "@@@"
 MSG_AWAKE = "AWAKE"
 
@@ -29,11 +31,6 @@ DEVICE_REQUEST_TARGET = "tempHum"
 DATA_STREAM_TEMP = "%s/temperature"
 DATA_STREAM_HUM = "%s/humidity"
 
-PROP_FW_VERSION = "firmware.version"
-
-OLD_FW_YEAR = 21
-OLD_FW_MONTH = 8
-
 
 def main():
     print(" +--------------------------------+")
@@ -64,7 +61,7 @@ def main():
 
         # Upload the temperature and humidity values to Digi Remote Manager.
         try:
-            if is_old_firmware():
+            if not firmware_caps.supports_upload_multiple():
                 datapoint.upload(DATA_STREAM_TEMP % src_addr, data_split[0],
                                  units="C", data_type=DataType.DOUBLE)
                 datapoint.upload(DATA_STREAM_HUM % src_addr, data_split[1],
@@ -114,30 +111,5 @@ def main():
             device.close()
 
 
-def is_old_firmware():
-    """
-    Returns whether the firmware running is an old version or not in
-    terms of data point upload capabilities.
-
-    Returns:
-        Boolean: ``True`` if the device firmware is old, ``False`` otherwise.
-    """
-    # Read firmware version from runt.
-    runt.start()
-    fw_version = runt.get(PROP_FW_VERSION)
-    runt.stop()
-
-    # Compare firmware year and month with old versions.
-    year = int(fw_version.split(".")[0])
-    month = int(fw_version.split(".")[1])
-    if year < OLD_FW_YEAR:
-        return True
-    if year == OLD_FW_YEAR:
-        if month < OLD_FW_MONTH:
-            return True
-
-    return False
-
-
 if __name__ == '__main__':
     main()
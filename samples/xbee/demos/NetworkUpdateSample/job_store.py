@@ -0,0 +1,348 @@
+# Copyright (c) 2026, Digi International, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+Persistent store of the network update requests and the state of the update
+of every node, so an interrupted update can be resumed after a restart.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+from enum import Enum
+from threading import RLock
+
+log = logging.getLogger(__name__)
+
+
+class TaskState(Enum):
+    """
+    This class lists the states of the update task of a node.
+    """
+    PENDING = (0, "pending")
+    IN_PROGRESS = (1, "in progress")
+    DONE = (2, "done")
+    FAILED = (3, "failed")
+
+    def __init__(self, code, desc):
+        self._code = code
+        self._desc = desc
+
+    @property
+    def code(self):
+        """
+        Returns the code of the `TaskState` element.
+
+        Returns:
+            Integer: Code of the `TaskState` element.
+        """
+        return self._code
+
+    @property
+    def desc(self):
+        """
+        Returns the description of the `TaskState` element.
+
+        Returns:
+            String: Description of the `TaskState` element.
+        """
+        return self._desc
+
+    @classmethod
+    def get(cls, code):
+        """
+        Returns the task state for the given code.
+
+        Args:
+            code (Integer): Code of the task state to get.
+
+        Returns:
+            :class:`.TaskState`: Task state with the given code, `None` if not found.
+        """
+        for state in cls:
+            if code == state.code:
+                return state
+        return None
+
+
+class UpdateJob:
+    """
+    Class that represents a stored update request and the state of the update
+    of its nodes.
+    """
+
+    def __init__(self, request_str, job_id=None, created=None, nodes=None, resumed=False):
+        """
+        Class constructor. Instantiates a new :class:`.UpdateJob`.
+
+        Args:
+            request_str (String): The update request as it was received.
+            job_id (String, optional, default=`None`): Identifier of the job.
+                A new one is generated if not provided.
+            created (Float, optional, default=`None`): Time the job was
+                created. Current time if not provided.
+            nodes (Dictionary, optional, default=`None`): 64-bit address of
+                the nodes as key and a dictionary with the `state` code, the
+                `profile` and the `error` of the last failure as value.
+            resumed (Boolean, optional, default=`False`): `True` if the job
+                was loaded from the store after a restart.
+        """
+        self.request_str = request_str
+        self.id = job_id or uuid.uuid4().hex
+        self.created = created if created is not None else time.time()
+        self.nodes = nodes if nodes is not None else {}
+        self.resumed = resumed
+
+    def get_state(self, x64_addr):
+        """
+        Returns the state of the update of a node.
+
+        Args:
+            x64_addr (String): 64-bit address of the node.
+
+        Returns:
+            :class:`.TaskState`: The state, `None` if the node is not in the
+                job.
+        """
+        node = self.nodes.get(x64_addr)
+        return TaskState.get(node["state"]) if node else None
+
+    def count(self, state):
+        """
+        Returns the number of nodes of the job in a state.
+
+        Args:
+            state (:class:`.TaskState`): The state.
+
+        Returns:
+            Integer: Number of nodes.
+        """
+        return sum(1 for node in self.nodes.values() if node["state"] == state.code)
+
+    def to_dict(self):
+        return {"id": self.id, "request": self.request_str, "created": self.created,
+                "nodes": self.nodes}
+
+    @classmethod
+    def from_dict(cls, values):
+        return cls(values["request"], values["id"], values.get("created"),
+                   values.get("nodes"), resumed=True)
+
+
+class JobStore:
+    """
+    Class that stores the pending update jobs and the profiles applied to the
+    nodes in a JSON file.
+
+    Every change of the state of a node is a checkpoint written to the file,
+    replacing it atomically. Applied profiles are only kept while there are
+    stored jobs created before they were applied, the only ones they are
+    checked for.
+    """
+
+    def __init__(self, file_path):
+        """
+        Class constructor. Instantiates a new :class:`.JobStore` and loads the
+        jobs stored in the file, if it exists.
+
+        Args:
+            file_path (String): Path of the file of the store.
+        """
+        self._file_path = file_path
+        self._lock = RLock()
+        self._jobs = []
+        self._applied = {}
+        self._digests = {}
+        self._load()
+
+    def jobs(self):
+        """
+        Returns the stored jobs that are not finished, oldest first.
+
+        Returns:
+            List: The :class:`.UpdateJob` objects.
+        """
+        with self._lock:
+            return list(self._jobs)
+
+    def add(self, request_str):
+        """
+        Stores a new update job.
+
+        Args:
+            request_str (String): The update request as it was received.
+
+        Returns:
+            :class:`.UpdateJob`: The new job.
+        """
+        job = UpdateJob(request_str)
+        with self._lock:
+            self._jobs.append(job)
+            self._save()
+        return job
+
+    def remove(self, job):
+        """
+        Removes a job from the store, when it is finished or discarded.
+
+        Args:
+            job (:class:`.UpdateJob`): The job.
+        """
+        with self._lock:
+            if job in self._jobs:
+                self._jobs.remove(job)
+                self._prune_applied()
+                self._save()
+
+    def set_nodes(self, job, profiles):
+        """
+        Adds the nodes to update to a job. Nodes already in the job keep their
+        state, except the ones in progress that are pending again because
+        their update was interrupted.
+
+        Args:
+            job (:class:`.UpdateJob`): The job.
+            profiles (Dictionary): 64-bit address of the nodes as key and the
+                path of the profile to apply as value.
+        """
+        with self._lock:
+            for x64_addr, profile in profiles.items():
+                node = job.nodes.get(x64_addr)
+                if node is None:
+                    job.nodes[x64_addr] = {"state": TaskState.PENDING.code,
+                                           "profile": profile, "error": None}
+                elif node["state"] == TaskState.IN_PROGRESS.code:
+                    node["state"] = TaskState.PENDING.code
+            self._save()
+
+    def set_state(self, job, x64_addr, state, error=None):
+        """
+        Changes the state of the update of a node and writes a checkpoint.
+        When a node is done, its profile is recorded as applied.
+
+        Args:
+            job (:class:`.UpdateJob`): The job.
+            x64_addr (String): 64-bit address of the node.
+            state (:class:`.TaskState`): The new state.
+            error (Exception or String, optional, default=`None`): Error of a
+                failed update.
+        """
+        with self._lock:
+            node = job.nodes.setdefault(x64_addr, {"profile": None})
+            node["state"] = state.code
+            node["error"] = str(error) if error is not None else None
+            if state == TaskState.DONE and node.get("profile"):
+                self._applied[x64_addr] = {"profile": node["profile"],
+                                           "digest": self.get_digest(node["profile"]),
+                                           "time": time.time()}
+            self._save()
+
+    def is_applied(self, x64_addr, profile, since=0):
+        """
+        Returns whether a profile, with its current contents, was applied to a
+        node by this application.
+
+        The node may have been changed by other means afterwards, so this is
+        only reliable for recent updates, such as the ones performed while a
+        job was pending.
+
+        Args:
+            x64_addr (String): 64-bit address of the node.
+            profile (String): Path of the profile.
+            since (Float, optional, default=0): Ignore the profiles applied
+                before this time.
+
+        Returns:
+            Boolean: `True` if the profile was applied, `False` otherwise.
+        """
+        with self._lock:
+            applied = self._applied.get(x64_addr)
+        if not applied or applied["profile"] != profile or applied["time"] < since:
+            return False
+        digest = self.get_digest(profile)
+        return digest is not None and applied["digest"] == digest
+
+    def get_digest(self, profile):
+        """
+        Returns the SHA-256 digest of a profile file. Digests are cached
+        until the file is modified.
+
+        Args:
+            profile (String): Path of the profile.
+
+        Returns:
+            String: The hexadecimal digest, `None` if the file cannot be read.
+        """
+        try:
+            stat = os.stat(profile)
+            cached = self._digests.get(profile)
+            if cached and cached[0] == (stat.st_mtime, stat.st_size):
+                return cached[1]
+            sha = hashlib.sha256()
+            with open(profile, "rb") as xpro_file:
+                for block in iter(lambda: xpro_file.read(65536), b""):
+                    sha.update(block)
+        except OSError as exc:
+            log.warning("Unable to read profile '%s': %s", profile, exc)
+            return None
+        digest = sha.hexdigest()
+        self._digests[profile] = ((stat.st_mtime, stat.st_size), digest)
+        return digest
+
+    def _load(self):
+        """
+        Loads the jobs and applied profiles stored in the file.
+        """
+        try:
+            with open(self._file_path) as store_file:
+                content = json.load(store_file)
+            self._jobs = [UpdateJob.from_dict(values) for values in content.get("jobs", [])]
+            self._applied = content.get("applied", {})
+            self._prune_applied()
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError) as exc:
+            log.error("Unable to load update jobs from '%s': %s", self._file_path, exc)
+
+    def _prune_applied(self):
+        """
+        Removes the applied profiles older than every stored job. Must be
+        called with the lock held.
+        """
+        oldest = min((job.created for job in self._jobs), default=None)
+        self._applied = {x64_addr: applied for x64_addr, applied in self._applied.items()
+                         if oldest is not None and applied.get("time", 0) >= oldest}
+
+    def _save(self):
+        """
+        Writes the store to the file. Must be called with the lock held.
+        """
+        tmp_path = self._file_path + ".tmp"
+        try:
+            with open(tmp_path, "w") as store_file:
+                json.dump({"jobs": [job.to_dict() for job in self._jobs],
+                           "applied": self._applied}, store_file)
+                store_file.flush()
+                os.fsync(store_file.fileno())
+            os.replace(tmp_path, self._file_path)
+        except OSError as exc:
+            log.error("Unable to save update jobs to '%s': %s", self._file_path, exc)
@@ -26,6 +26,7 @@ import sys
 import time
 from enum import Enum
 from logging.handlers import SysLogHandler
+from queue import Empty, Full, Queue
 from threading import Thread, Event
 
 from digidevice import device_request, xbee
@@ -36,6 +37,13 @@ from digi.xbee.models.address import XBee64BitAddress
 from digi.xbee.models.protocol import Role
 from digi.xbee.profile import ProfileUpdateTask
 
+import job_store
+import progress_reporter
+import update_scheduler
+from job_store import JobStore, TaskState
+from progress_reporter import ProgressReporter
+from update_scheduler import UpdateScheduler
+
 
 APP_NAME = "DRM XBee Network Update"
 
@@ -127,6 +135,7 @@ class UpdateRequest:
 
         self._ignore_invalid_tasks = ignore_invalid_tasks
         self._update_tasks = {}
+        self._force = False
         self._parse_request()
 
         if not self._update_tasks:
@@ -144,6 +153,18 @@ class UpdateRequest:
         """
         return self._update_tasks
 
+    @property
+    def force(self):
+        """
+        Returns whether the profiles must be applied even to the nodes that
+        were already updated with them.
+
+        Returns:
+             Boolean: `True` to apply the profiles to every node, `False`
+                otherwise.
+        """
+        return self._force
+
     @property
     def request_str(self):
         """
@@ -179,6 +200,8 @@ class UpdateRequest:
         if not task_list:
             raise ValueError(f"{self._INVALID_REQUEST_ERROR} '{self._request}'")
 
+        self._force = request.get("force", False) is True
+
         for task in task_list:
             target_obj = task.get("target", None)
             if not target_obj:
@@ -330,7 +353,9 @@ class NetworkUpdater(Thread):
 
     _XBEE_NET_UPDATE_TARGET = "xbee_network_update"
 
-    def __init__(self, discover_network=False, ignore_invalid_tasks=False):
+    def __init__(self, discover_network=False, ignore_invalid_tasks=False,
+                 max_queued_requests=10,
+                 job_file="/etc/config/xbee-update-jobs.json", progress_interval=10):
         """
         Class constructor. Instantiates a new :class:`.NetworkUpdater`.
 
@@ -340,6 +365,12 @@ class NetworkUpdater(Thread):
                 otherwise.
             ignore_invalid_tasks (Boolean, optional, default=`False`): `True`
                 to process update requests with invalid tasks, `False` otherwise.
+            max_queued_requests (Integer, optional, default=10): Maximum
+                number of requests waiting for the one in progress to finish.
+            job_file (String, optional): Path of the file to store the update
+                requests and the state of their nodes.
+            progress_interval (Float, optional, default=10): Minimum seconds
+                between uploads of the update progress to Digi Remote Manager.
 
         Raises:
             XBeeException: if the local XBee is not ready.
@@ -348,8 +379,12 @@ class NetworkUpdater(Thread):
         self._discover_network = discover_network
         self._ignore_invalid_tasks = ignore_invalid_tasks
         self._local_xb = xbee.get_device()
+        self._scheduler = UpdateScheduler(self._local_xb)
+        self._job_store = JobStore(job_file)
+        self._progress = ProgressReporter(interval=progress_interval)
         self._request = None
-        self._new_request_event = Event()
+        self._job = None
+        self._requests = Queue(maxsize=max_queued_requests)
         self._stop = False
         self._xbee_status = None
 
@@ -374,12 +409,16 @@ class NetworkUpdater(Thread):
         self._local_xb.get_network().add_update_progress_callback(
             self._update_progress_cb)
 
+        self._resume_jobs()
+
     def run(self):
         xnet = self._local_xb.get_network()
+        self._progress.start()
 
         while not self._stop and self._local_xb.is_open():
-            self._new_request_event.clear()
-            while not self._new_request_event.wait(timeout=1):
+            try:
+                self._request, self._job = self._requests.get(timeout=1)
+            except Empty:
                 continue
 
             if self._discover_network:
@@ -397,6 +436,7 @@ class NetworkUpdater(Thread):
             self._local_xb.close()
 
         xbee.del_status_changed_callback(self._xbee_status_cb)
+        self._progress.stop()
 
         if not device_request.unregister(self._XBEE_NET_UPDATE_TARGET):
             log.error("Unable to unregister device request for target '%s'",
@@ -407,6 +447,7 @@ class NetworkUpdater(Thread):
         Stops the network updater if it is running.
         """
         self._stop = True
+        self._scheduler.stop()
 
     def is_ready(self):
         """
@@ -447,9 +488,10 @@ class NetworkUpdater(Thread):
         Returns whether this instance is processing an update request.
 
         Returns:
-            Boolean: `True` if a request is in progress, `False` otherwise.
+            Boolean: `True` if a request is in progress or queued, `False`
+                otherwise.
         """
-        return self._new_request_event.is_set()
+        return self._request is not None or not self._requests.empty()
 
     def _drm_request_cb(self, target, request):
         """
@@ -494,12 +536,13 @@ class NetworkUpdater(Thread):
         log.debug("Received status for request target '%s': %s (%d)",
                   self._XBEE_NET_UPDATE_TARGET, desc, error)
 
-    @staticmethod
-    def _update_progress_cb(node, progress_status):
+    def _update_progress_cb(self, node, progress_status):
         log.debug("%s - [%s] %s: %d%%", progress_status.type, node,
                   progress_status.task, progress_status.percent)
         if progress_status.finished:
             log.info("'%s' updated: %s", node, progress_status.task)
+        self._progress.node_progress(str(node.get_64bit_addr()), progress_status.task,
+                                     progress_status.percent)
 
     def _xbee_status_cb(self, code, desc, available):
         """
@@ -535,9 +578,29 @@ class NetworkUpdater(Thread):
             update_tasks (Dict): Dictionary with the 64-bit address as key and
                 the corresponding :class::`.ProfileUpdateTask` as value.
         """
+        job = self._job
+        self._job_store.set_nodes(
+            job, {addr: task.profile_path for addr, task in update_tasks.items()})
+        # Skip the nodes updated before an interruption. When resuming, also
+        # skip the nodes that got the profile from other requests processed
+        # since this one was received. Older updates are not trusted, as the
+        # nodes may have been changed by other means.
+        check_applied = job.resumed and not self._request.force
+        for addr, task in list(update_tasks.items()):
+            if job.get_state(addr) == TaskState.DONE:
+                log.info("Skipping '%s', already updated", task.xbee)
+            elif check_applied and self._job_store.is_applied(addr, task.profile_path,
+                                                              since=job.created):
+                log.info("Skipping '%s', profile '%s' already applied",
+                         task.xbee, task.profile_path)
+                self._job_store.set_state(job, addr, TaskState.DONE)
+            else:
+                continue
+            del update_tasks[addr]
+
         if not update_tasks:
             log.error("No update tasks to perform")
-            self._request = None
+            self._finish_job()
             return
 
         if log.isEnabledFor(logging.INFO):
@@ -546,26 +609,93 @@ class NetworkUpdater(Thread):
                 log.info("  * '%s' to '%s'", task.xbee, task.profile_path)
 
         xnet = self._local_xb.get_network()
-        result = xnet.update_nodes(update_tasks.values())
+        result = self._scheduler.run(update_tasks, xnet.update_nodes,
+                                     start_callback=self._task_started_cb,
+                                     finish_callback=self._task_finished_cb)
         if log.isEnabledFor(logging.INFO):
             self._show_result(result, update_tasks)
 
         # Clear the update tasks after finishing
         update_tasks.clear()
+        if self._stop:
+            # Keep the job to resume it when the application starts again.
+            self._request = None
+            self._job = None
+        else:
+            self._finish_job()
+
+    def _task_started_cb(self, task):
+        """
+        Callback called before updating a node. Checkpoints its state.
+
+        Params:
+            task (:class::`.ProfileUpdateTask`): The update task.
+        """
+        addr = str(task.xbee.get_64bit_addr())
+        self._job_store.set_state(self._job, addr, TaskState.IN_PROGRESS)
+        self._progress.node_state(addr, TaskState.IN_PROGRESS.desc)
+
+    def _task_finished_cb(self, task, exc):
+        """
+        Callback called after updating a node. Checkpoints its state.
+
+        Params:
+            task (:class::`.ProfileUpdateTask`): The update task.
+            exc (:class::`.XBeeException`): The error of the update, `None`
+                if it succeeded.
+        """
+        addr = str(task.xbee.get_64bit_addr())
+        state = TaskState.FAILED if exc else TaskState.DONE
+        self._job_store.set_state(self._job, addr, state, error=exc)
+        self._progress.node_state(addr, state.desc)
+        self._progress.job_progress(
+            self._job.count(TaskState.DONE) + self._job.count(TaskState.FAILED),
+            len(self._job.nodes))
+
+    def _finish_job(self):
+        """
+        Removes the request being processed from the job store.
+        """
+        if self._job is not None:
+            self._job_store.remove(self._job)
         self._request = None
+        self._job = None
+
+    def _resume_jobs(self):
+        """
+        Queues the update requests stored in the job store, that were not
+        finished when the application stopped.
+        """
+        for job in self._job_store.jobs():
+            try:
+                request = UpdateRequest(job.request_str,
+                                        ignore_invalid_tasks=self._ignore_invalid_tasks)
+                self._requests.put_nowait((request, job))
+            except ValueError as exc:
+                log.error("Discarding stored update request: %s", exc)
+                self._job_store.remove(job)
+            except Full:
+                log.warning("Discarding stored update request, too many requests queued")
+                self._job_store.remove(job)
+            else:
+                log.info("Resuming update request received at %s",
+                         time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(job.created)))
 
     def _set_request(self, request):
         """
-        Establishes the received request to be processed.
+        Queues the received request to be processed after the previous ones.
 
         Params:
             request (:class::`.UpdateRequest`): The update request.
         """
-        if not self._request and not self.is_processing_request():
-            self._request = request
-            self._new_request_event.set()
-        else:
-            log.warning("Ignoring update task request, there is an update in progress")
+        if self.is_processing_request():
+            log.info("Update in progress, queuing update task request")
+        job = self._job_store.add(request.request_str)
+        try:
+            self._requests.put_nowait((request, job))
+        except Full:
+            log.warning("Ignoring update task request, too many requests queued")
+            self._job_store.remove(job)
 
     def _get_update_tasks(self):
         """
@@ -723,7 +853,7 @@ def init_log(log_level, log_console):
     configure_handler(SysLogHandler(address='/dev/log'), "%s syslog handler",
                       log_format, handlers)
 
-    loggers = [log]
+    loggers = [log, job_store.log, progress_reporter.log, update_scheduler.log]
     for logger in loggers:
         logger.disabled = False
         logger.setLevel(level)
@@ -755,6 +885,15 @@ def main():
     parser.add_argument("-i", "--ignore-invalid-tasks", action='store_true',
                         dest="ignore_invalid_tasks",
                         help="Ignore invalid tasks in received requests")
+    parser.add_argument("-q", "--max-queued", type=int, default=10,
+                        dest="max_queued",
+                        help="Maximum number of requests waiting to be processed")
+    parser.add_argument("-j", "--job-file", default="/etc/config/xbee-update-jobs.json",
+                        dest="job_file",
+                        help="File to store the update requests to resume them")
+    parser.add_argument("-p", "--progress-interval", type=float, default=10,
+                        dest="progress_interval",
+                        help="Minimum seconds between uploads of the update progress")
     parser.add_argument("--log-console", action='store_true',
                         dest="log_console",
                         help="Enable log to standard output")
@@ -778,12 +917,18 @@ def main():
     log.info("Configuration:")
     log.info(" * Discover XBee network:  %s", "Enabled" if args.discover else "Disabled")
     log.info(" * Ignore invalid tasks:   %s", "Yes" if args.ignore_invalid_tasks else "No")
+    log.info(" * Queued requests:        %d", args.max_queued)
+    log.info(" * Job file:               %s", args.job_file)
+    log.info(" * Progress interval:      %ss", args.progress_interval)
     log.info(" * Log level:              %s", logging.getLevelName(log.getEffectiveLevel()))
     log.info(" * Log to console:         %s\n", "Enabled" if args.log_console else "Disabled")
 
     try:
         updater = NetworkUpdater(discover_network=args.discover,
-                                 ignore_invalid_tasks=args.ignore_invalid_tasks)
+                                 ignore_invalid_tasks=args.ignore_invalid_tasks,
+                                 max_queued_requests=args.max_queued,
+                                 job_file=args.job_file,
+                                 progress_interval=args.progress_interval)
         updater.connect()
     except XBeeException as exc:
         log.error("Unable to establish connection with local XBee: %s", exc)
@@ -0,0 +1,165 @@
+# Copyright (c) 2026, Digi International, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+Upload of the progress of the network updates to Digi Remote Manager data
+streams at a bounded rate.
+"""
+
+import logging
+import time
+from threading import Event, Lock, Thread
+
+from digidevice import datapoint
+from digidevice.datapoint import DataPoint, DataType
+
+log = logging.getLogger(__name__)
+
+
+class ProgressReporter:
+    """
+    Class that uploads the progress of the node updates as data points.
+
+    Progress notifications are coalesced per node, so at most one value of
+    every stream is uploaded per interval, whatever the rate of the
+    notifications.
+    """
+
+    def __init__(self, interval=10, stream_prefix="xbee_update", upload_timeout=None,
+                 upload_function=None):
+        """
+        Class constructor. Instantiates a new :class:`.ProgressReporter`.
+
+        Args:
+            interval (Float, optional, default=10): Minimum seconds between
+                uploads.
+            stream_prefix (String, optional, default="xbee_update"): Prefix of
+                the data streams.
+            upload_timeout (Float, optional, default=`None`): Timeout in
+                seconds of each upload request.
+            upload_function (Function, optional, default=`None`): Function
+                that receives a list of data points and a `timeout` keyword
+                argument and uploads them. Defaults to
+                `datapoint.upload_multiple`.
+        """
+        self._interval = interval
+        self._prefix = stream_prefix
+        self._upload_timeout = upload_timeout
+        self._upload_function = upload_function or datapoint.upload_multiple
+        self._values = {}
+        self._lock = Lock()
+        self._stop_event = Event()
+        self._thread = None
+
+    def start(self):
+        """
+        Starts the background thread that uploads the progress.
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = Thread(target=self._run, name="ProgressReporter", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """
+        Stops the background thread after uploading the pending values.
+
+        Args:
+            timeout (Float, optional, default=`None`): Maximum seconds to wait
+                for the thread to finish.
+        """
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def node_progress(self, x64_addr, task, percent):
+        """
+        Reports the progress of the update of a node.
+
+        Args:
+            x64_addr (String): 64-bit address of the node.
+            task (String): Description of the current update step.
+            percent (Integer): Percentage of the current step.
+        """
+        self._set("%s/progress" % x64_addr, int(percent), DataType.INT)
+        self._set("%s/task" % x64_addr, str(task), DataType.STRING)
+
+    def node_state(self, x64_addr, state):
+        """
+        Reports the state of the update of a node.
+
+        Args:
+            x64_addr (String): 64-bit address of the node.
+            state (String): Description of the state.
+        """
+        self._set("%s/state" % x64_addr, state, DataType.STRING)
+
+    def job_progress(self, finished, total):
+        """
+        Reports the progress of the update job in progress.
+
+        Args:
+            finished (Integer): Number of nodes whose update finished.
+            total (Integer): Number of nodes to update.
+        """
+        self._set("progress", int(finished * 100 / total) if total else 100, DataType.INT)
+
+    def flush(self):
+        """
+        Uploads the values reported since the last upload.
+
+        Returns:
+            Integer: Number of uploaded data points.
+        """
+        with self._lock:
+            values = self._values
+            self._values = {}
+        if not values:
+            return 0
+
+        data_points = [DataPoint("%s/%s" % (self._prefix, stream), value,
+                                 timestamp=timestamp, data_type=data_type)
+                       for stream, (value, data_type, timestamp) in values.items()]
+        try:
+            self._upload_function(data_points, timeout=self._upload_timeout)
+        except Exception as exc:
+            log.error("Unable to upload update progress: %s", exc)
+            with self._lock:
+                # Keep the values not reported again for the next upload.
+                for stream, value in values.items():
+                    self._values.setdefault(stream, value)
+            return 0
+        return len(data_points)
+
+    def _set(self, stream, value, data_type):
+        """
+        Stores the last value of a stream to upload.
+        """
+        with self._lock:
+            self._values[stream] = (value, data_type, time.time())
+
+    def _run(self):
+        """
+        Main loop of the upload thread.
+        """
+        while not self._stop_event.wait(self._interval):
+            self.flush()
+        self.flush()
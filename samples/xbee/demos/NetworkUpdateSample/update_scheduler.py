@@ -0,0 +1,214 @@
+# Copyright (c) 2026, Digi International, Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+Scheduler of the profile updates of the nodes of an XBee network.
+
+Nodes are updated from the deepest to the closest one, by the number of hops
+of their route from the local XBee, so a router is updated after the nodes
+that depend on it. The local XBee is updated the last one.
+
+Nodes are updated one at a time: the XBee library changes and restores the
+settings of the local XBee to perform every remote firmware or file system
+update, so concurrent updates would interfere with each other.
+"""
+
+import logging
+from collections import deque
+
+from digi.xbee.exception import XBeeException
+
+log = logging.getLogger(__name__)
+
+
+class UpdateScheduler:
+    """
+    Class that performs the profile update tasks of a request, from the
+    deepest node to the closest one.
+    """
+
+    def __init__(self, local_xbee):
+        """
+        Class constructor. Instantiates a new :class:`.UpdateScheduler`.
+
+        Args:
+            local_xbee (:class:`.XBeeDevice`): The local XBee.
+        """
+        self._local_xb = local_xbee
+        self._stopped = False
+
+    def stop(self):
+        """
+        Stops the update in progress after the node being updated finishes.
+        Pending nodes are not updated.
+        """
+        self._stopped = True
+
+    def get_depths(self):
+        """
+        Returns the hop depth of every known node of the network.
+
+        The route of the nodes is obtained from the connections found by a
+        deep discovery of the network and, for nodes without connections, from
+        their parent if it is known.
+
+        Returns:
+            Dictionary: 64-bit address of the nodes as key and their hop depth
+                (Integer) as value.
+        """
+        xnet = self._local_xb.get_network()
+        local_addr = str(self._local_xb.get_64bit_addr())
+
+        neighbors = {}
+        for connection in xnet.get_connections():
+            addr_a = str(connection.node_a.get_64bit_addr())
+            addr_b = str(connection.node_b.get_64bit_addr())
+            neighbors.setdefault(addr_a, set()).add(addr_b)
+            neighbors.setdefault(addr_b, set()).add(addr_a)
+
+        # Breadth-first search from the local XBee gives the minimum depth.
+        depths = {local_addr: 0}
+        pending = deque([local_addr])
+        while pending:
+            addr = pending.popleft()
+            for neighbor in neighbors.get(addr, ()):
+                if neighbor not in depths:
+                    depths[neighbor] = depths[addr] + 1
+                    pending.append(neighbor)
+
+        for node in xnet.get_devices():
+            addr = str(node.get_64bit_addr())
+            if addr not in depths:
+                depth = self._get_parent_depth(node, depths)
+                if depth is not None:
+                    depths[addr] = depth
+        return depths
+
+    def plan(self, update_tasks):
+        """
+        Sorts the update tasks from the deepest node to the closest one. Nodes
+        whose route is unknown are updated after the rest.
+
+        Args:
+            update_tasks (Dictionary): 64-bit address as key and the
+                corresponding :class:`.ProfileUpdateTask` as value.
+
+        Returns:
+            Tuple (List, :class:`.ProfileUpdateTask`):
+                List: The tasks of the remote nodes, in update order.
+                :class:`.ProfileUpdateTask`: Task of the local XBee, `None` if
+                    it is not updated.
+        """
+        depths = self.get_depths()
+        local_addr = str(self._local_xb.get_64bit_addr())
+
+        local_task = update_tasks.get(local_addr)
+        remote_tasks = sorted(((depths.get(addr, 0), addr, task)
+                               for addr, task in update_tasks.items() if addr != local_addr),
+                              key=lambda item: (-item[0], item[1]))
+        return [task for _depth, _addr, task in remote_tasks], local_task
+
+    def run(self, update_tasks, update_function, start_callback=None,
+            finish_callback=None):
+        """
+        Performs the update tasks, one node at a time, in the order of
+        :meth:`.plan`. The local XBee is updated the last one.
+
+        Args:
+            update_tasks (Dictionary): 64-bit address as key and the
+                corresponding :class:`.ProfileUpdateTask` as value.
+            update_function (Function): Function that receives a list of
+                tasks, performs them and returns their result as
+                `XBeeNetwork.update_nodes()`.
+            start_callback (Function, optional, default=`None`): Function
+                called with the task before updating a node.
+            finish_callback (Function, optional, default=`None`): Function
+                called with the task and the :class:`.XBeeException` of the
+                update (`None` if it succeeded) after updating a node.
+
+        Returns:
+            Dictionary: 64-bit address of the nodes as key and a tuple with
+                the XBee and an :class:`.XBeeException` if its update failed
+                (`None` if it succeeded) as value. Nodes not updated because
+                the scheduler was stopped are not included.
+        """
+        self._stopped = False
+        tasks, local_task = self.plan(update_tasks)
+        if local_task is not None:
+            tasks.append(local_task)
+        log.info("Updating %d nodes", len(tasks))
+
+        result = {}
+        for task in tasks:
+            if self._stopped:
+                break
+            result.update(self._update(task, update_function, start_callback,
+                                       finish_callback))
+        return result
+
+    @staticmethod
+    def _get_parent_depth(node, depths):
+        """
+        Returns the depth of a node following its parent.
+
+        Returns:
+            Integer: Depth of the node, `None` if its parent is unknown.
+        """
+        depth = 1
+        parent = getattr(node, "parent", None)
+        visited = set()
+        while parent is not None:
+            parent_addr = str(parent.get_64bit_addr())
+            if parent_addr in visited:
+                return None
+            visited.add(parent_addr)
+            parent_depth = depths.get(parent_addr)
+            if parent_depth is not None:
+                return parent_depth + depth
+            depth += 1
+            parent = getattr(parent, "parent", None)
+        return None
+
+    @staticmethod
+    def _update(task, update_function, start_callback=None, finish_callback=None):
+        """
+        Performs an update task.
+
+        Returns:
+            Dictionary: Result of the update, as `XBeeNetwork.update_nodes()`.
+        """
+        addr = str(task.xbee.get_64bit_addr())
+        if start_callback:
+            start_callback(task)
+        try:
+            result = update_function([task])
+        except XBeeException as exc:
+            log.error("Error updating '%s': %s", task.xbee, exc)
+            result = {addr: (task.xbee, exc)}
+        node_result = result.get(addr) if result else None
+        if node_result is None:
+            # An update without a result for the node is not a success.
+            exc = XBeeException("No update result for '%s'" % task.xbee)
+            log.error("Error updating '%s': %s", task.xbee, exc)
+            node_result = (task.xbee, exc)
+            result = dict(result or {})
+            result[addr] = node_result
+        if finish_callback:
+            finish_callback(task, node_result[1])
+        return result